@@ -1,6 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import yfinance as yf
+from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -8,6 +7,20 @@ from matplotlib.figure import Figure
 import numpy as np
 from datetime import datetime, timedelta
 import threading
+import queue
+from stock_cache import PriceCache
+from stock_scanner import WatchlistScanner
+from stock_indicators import IndicatorEngine
+from stock_streaming import StreamingIndicators
+from stock_chart import PriceChart
+from stock_analysis import build_report, fetch_history
+from stock_portfolio import PortfolioRisk
+from stock_store import WorkspaceStore
+
+LIVE_POLL_SECONDS = 15
+# Live mode refreshes daily bars, the interval the analysis and chart use: each
+# poll revises today's in-progress bar, and a new bar starts each trading day
+LIVE_INTERVAL = "1d"
 
 class AIStockAnalyzer:
     def __init__(self, root):
@@ -20,12 +33,79 @@ class AIStockAnalyzer:
         self.watchlist = []
         self.current_stock = None
         self.stock_data = None
+        self.price_cache = PriceCache()
+        self.indicator_engine = IndicatorEngine()
+        self.indicators = None
+        self.store = WorkspaceStore(self.price_cache.path)
+        
+        # Live mode state
+        self.live_mode = False
+        self.live_stream = None
+        self.live_last_ts = None
+        
+        # Watchlist risk model, updated incrementally as symbols come and go
+        self.portfolio = PortfolioRisk()
+        self.risk_window = None
         
         # Create UI
         self.create_header()
         self.create_main_layout()
         self.create_status_bar()
         
+        # Show what was on screen last time straight from disk, then refresh in the background
+        self.restore_session()
+        
+    def restore_session(self):
+        """Reload the saved watchlist and last analysis - no network on this path"""
+        self.watchlist = self.store.load_watchlist()
+        for symbol in self.watchlist:
+            self.watchlist_box.insert(tk.END, symbol)
+            
+        last_symbol = self.store.get_state("last_symbol")
+        snapshot = self.store.get_snapshot(last_symbol) if last_symbol else None
+        if snapshot:
+            self.show_snapshot(snapshot)
+            
+        symbols = list(self.watchlist)
+        if last_symbol and last_symbol not in symbols:
+            symbols.insert(0, last_symbol)
+        stale = self.store.stale_symbols(symbols)
+        if stale:
+            thread = threading.Thread(target=self.refresh_stale, args=(stale,))
+            thread.daemon = True
+            thread.start()
+            
+    def show_snapshot(self, snapshot):
+        """Render a stored analysis exactly like a fresh one"""
+        symbol = snapshot['symbol']
+        self.current_stock = symbol
+        self.symbol_entry.delete(0, tk.END)
+        self.symbol_entry.insert(0, symbol)
+        self.stock_data = snapshot['data']
+        self.indicators = snapshot['indicators']
+        
+        self.update_stock_info(snapshot['info'], self.stock_data)
+        self.plot_chart(self.indicators, symbol)
+        self.perform_technical_analysis(self.indicators, snapshot['info'])
+        saved = datetime.fromtimestamp(snapshot['analyzed_at']).strftime('%Y-%m-%d %H:%M')
+        self.update_status(f"Showing {symbol} as of {saved}")
+        
+    def refresh_stale(self, symbols):
+        """Re-analyze symbols whose snapshot is out of date (background thread)"""
+        for symbol in symbols:
+            if symbol == self.current_stock:
+                # On screen: the normal path updates the UI and saves the snapshot
+                self.fetch_and_analyze(symbol)
+                continue
+            try:
+                data = fetch_history(self.price_cache, symbol)
+                if data.empty:
+                    continue
+                indicators = self.indicator_engine.compute_frame(data, symbol)
+                self.store.save_snapshot(symbol, indicators, data, self.price_cache.get_info(symbol))
+            except Exception as e:
+                print(f"Could not refresh {symbol}: {e}")
+        
     def create_header(self):
         """Create the header section"""
         header_frame = tk.Frame(self.root, bg="#1a1f3a", height=80)
@@ -81,6 +161,21 @@ class AIStockAnalyzer:
         )
         analyze_btn.pack(side=tk.LEFT)
         
+        self.live_btn = tk.Button(
+            search_frame,
+            text="● Live",
+            font=("Segoe UI", 11, "bold"),
+            bg="#8892b0",
+            fg="#0a0e27",
+            activebackground="#7882a0",
+            bd=0,
+            cursor="hand2",
+            command=self.toggle_live_mode,
+            padx=15,
+            pady=8
+        )
+        self.live_btn.pack(side=tk.LEFT, padx=(10, 0))
+        
     def create_main_layout(self):
         """Create main content area"""
         main_frame = tk.Frame(self.root, bg="#0a0e27")
@@ -216,6 +311,36 @@ class AIStockAnalyzer:
         )
         remove_btn.pack(side=tk.LEFT)
         
+        scan_btn = tk.Button(
+            btn_frame,
+            text="⚡ Scan",
+            font=("Segoe UI", 9, "bold"),
+            bg="#ffa500",
+            fg="#0a0e27",
+            activebackground="#ffb520",
+            bd=0,
+            cursor="hand2",
+            command=self.open_scan_window,
+            padx=15,
+            pady=5
+        )
+        scan_btn.pack(side=tk.RIGHT)
+        
+        risk_btn = tk.Button(
+            btn_frame,
+            text="📊 Risk",
+            font=("Segoe UI", 9, "bold"),
+            bg="#8892b0",
+            fg="#0a0e27",
+            activebackground="#7882a0",
+            bd=0,
+            cursor="hand2",
+            command=self.open_risk_window,
+            padx=15,
+            pady=5
+        )
+        risk_btn.pack(side=tk.RIGHT, padx=(0, 5))
+        
     def create_chart_panel(self, parent):
         """Create chart display panel"""
         chart_frame = tk.LabelFrame(
@@ -242,6 +367,7 @@ class AIStockAnalyzer:
         
         # Embed in tkinter
         self.canvas = FigureCanvasTkAgg(self.fig, chart_frame)
+        self.chart = PriceChart(self.fig, self.ax, self.canvas)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
@@ -302,8 +428,14 @@ class AIStockAnalyzer:
             return
             
         self.status_bar.config(text=f"Fetching data for {symbol}...")
+        self.stop_live_mode()
         self.current_stock = symbol
         
+        # A stored analysis is shown instantly while the fresh one loads
+        snapshot = self.store.get_snapshot(symbol)
+        if snapshot:
+            self.show_snapshot(snapshot)
+            
         # Run in separate thread to prevent UI freezing
         thread = threading.Thread(target=self.fetch_and_analyze, args=(symbol,))
         thread.daemon = True
@@ -313,14 +445,10 @@ class AIStockAnalyzer:
         """Fetch stock data and perform analysis"""
         try:
             print(f"Fetching data for {symbol}...")  # Debug
-            # Fetch stock data
-            stock = yf.Ticker(symbol)
             
-            # Get historical data (6 months)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=180)
-            print(f"Fetching history from {start_date} to {end_date}...")  # Debug
-            self.stock_data = stock.history(start=start_date, end=end_date)
+            # Get historical data (6 months) - served from the local cache,
+            # only bars newer than the last cached one hit the network
+            self.stock_data = fetch_history(self.price_cache, symbol)
             
             if self.stock_data.empty:
                 print(f"No data found for {symbol}")  # Debug
@@ -330,18 +458,19 @@ class AIStockAnalyzer:
                 
             print(f"Got {len(self.stock_data)} days of data")  # Debug
             
-            # Get current info
-            try:
-                info = stock.info
-                print(f"Got stock info: {list(info.keys())[:5]}...")  # Debug
-            except Exception as info_error:
-                print(f"Warning: Could not fetch full info: {info_error}")
-                info = {}
+            # Get current info (cached for a day)
+            info = self.price_cache.get_info(symbol)
+            
+            # Compute every indicator once - the chart and the report both read from this
+            self.indicators = self.indicator_engine.compute_frame(self.stock_data, symbol)
+            indicators = self.indicators
+            self.store.save_snapshot(symbol, indicators, self.stock_data, info)
+            self.store.set_state("last_symbol", symbol)
             
             # Update UI in main thread
             self.root.after(0, lambda: self.update_stock_info(info, self.stock_data))
-            self.root.after(0, lambda: self.plot_chart(self.stock_data, symbol))
-            self.root.after(0, lambda: self.perform_technical_analysis(self.stock_data, info))
+            self.root.after(0, lambda: self.plot_chart(indicators, symbol))
+            self.root.after(0, lambda: self.perform_technical_analysis(indicators, info))
             self.root.after(0, lambda: self.update_status(f"Analysis complete for {symbol}"))
             print(f"Analysis complete for {symbol}")  # Debug
             
@@ -392,114 +521,20 @@ class AIStockAnalyzer:
         except Exception as e:
             print(f"Error updating info: {e}")
             
-    def plot_chart(self, data, symbol):
+    def plot_chart(self, indicators, symbol):
         """Plot stock price chart with technical indicators"""
-        self.ax.clear()
-        
-        # Calculate moving averages
-        data['SMA20'] = data['Close'].rolling(window=20).mean()
-        data['SMA50'] = data['Close'].rolling(window=50).mean()
-        
-        # Plot price and moving averages
-        self.ax.plot(data.index, data['Close'], label='Price', color='#00d4ff', linewidth=2)
-        self.ax.plot(data.index, data['SMA20'], label='SMA 20', color='#00ff88', linewidth=1.5, alpha=0.7)
-        self.ax.plot(data.index, data['SMA50'], label='SMA 50', color='#ffa500', linewidth=1.5, alpha=0.7)
-        
-        # Style
-        self.ax.set_title(f"{symbol} - 6 Month Price Chart", color="#ffffff", fontsize=14, pad=15)
-        self.ax.set_xlabel("Date", color="#8892b0", fontsize=10)
-        self.ax.set_ylabel("Price ($)", color="#8892b0", fontsize=10)
-        self.ax.legend(loc='upper left', framealpha=0.9, facecolor="#1a1f3a", edgecolor="#8892b0", labelcolor="#ffffff")
-        self.ax.grid(True, alpha=0.2, color="#8892b0", linestyle="--")
-        self.ax.tick_params(colors="#8892b0", labelsize=9)
+        # Lines are reused and downsampled to the chart width - no ax.clear()/replot
+        self.chart.show(indicators, symbol, title=f"{symbol} - 6 Month Price Chart")
         
-        # Rotate date labels
-        self.fig.autofmt_xdate()
-        
-        self.canvas.draw()
-        
-    def perform_technical_analysis(self, data, info):
+    def perform_technical_analysis(self, indicators, info):
         """Perform AI-powered technical analysis"""
-        analysis = []
-        
-        # Calculate technical indicators
-        current_price = data['Close'].iloc[-1]
-        sma20 = data['Close'].rolling(window=20).mean().iloc[-1]
-        sma50 = data['Close'].rolling(window=50).mean().iloc[-1]
-        
-        # RSI calculation
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current_rsi = rsi.iloc[-1]
-        
-        # Add header
-        analysis.append(f"🤖 AI TECHNICAL ANALYSIS - {self.current_stock}\n")
-        analysis.append("=" * 60 + "\n\n")
-        
-        # Price trend analysis
-        analysis.append("📊 TREND ANALYSIS:\n")
-        if current_price > sma20 > sma50:
-            analysis.append("✅ Strong Uptrend - Price above both moving averages\n")
-        elif current_price > sma20:
-            analysis.append("⚠️ Bullish - Price above 20-day MA\n")
-        elif current_price < sma20 < sma50:
-            analysis.append("❌ Downtrend - Price below both moving averages\n")
-        else:
-            analysis.append("⚠️ Bearish - Price below 20-day MA\n")
-        
-        analysis.append(f"   Current: ${current_price:.2f}\n")
-        analysis.append(f"   SMA 20: ${sma20:.2f}\n")
-        analysis.append(f"   SMA 50: ${sma50:.2f}\n\n")
-        
-        # RSI analysis
-        analysis.append("📈 RSI INDICATOR:\n")
-        analysis.append(f"   RSI (14): {current_rsi:.2f}\n")
-        if current_rsi > 70:
-            analysis.append("   ⚠️ OVERBOUGHT - Potential sell signal\n")
-        elif current_rsi < 30:
-            analysis.append("   ✅ OVERSOLD - Potential buy signal\n")
-        else:
-            analysis.append("   ➡️ NEUTRAL - No extreme signal\n")
-        analysis.append("\n")
-        
-        # Volatility analysis
-        volatility = data['Close'].pct_change().std() * np.sqrt(252) * 100
-        analysis.append("💹 VOLATILITY:\n")
-        analysis.append(f"   Annualized: {volatility:.2f}%\n")
-        if volatility > 40:
-            analysis.append("   ⚠️ HIGH - Higher risk/reward\n")
-        elif volatility < 20:
-            analysis.append("   ✅ LOW - More stable\n")
-        else:
-            analysis.append("   ➡️ MODERATE\n")
-        analysis.append("\n")
-        
-        # AI Recommendation
-        analysis.append("🎯 AI RECOMMENDATION:\n")
-        score = 0
-        if current_price > sma20:
-            score += 1
-        if current_price > sma50:
-            score += 1
-        if 30 < current_rsi < 70:
-            score += 1
-        if volatility < 30:
-            score += 1
-            
-        if score >= 3:
-            analysis.append("   💚 BULLISH - Strong buy signals\n")
-        elif score == 2:
-            analysis.append("   💛 NEUTRAL - Hold or wait for confirmation\n")
-        else:
-            analysis.append("   ❤️ BEARISH - Caution advised\n")
-            
+        # Report text is built by the headless pipeline so the CLI prints the same thing
+        report = build_report(self.current_stock, indicators)
+        
         # Update analysis text
         self.analysis_text.config(state=tk.NORMAL)
         self.analysis_text.delete(1.0, tk.END)
-        self.analysis_text.insert(1.0, "".join(analysis))
+        self.analysis_text.insert(1.0, report)
         self.analysis_text.config(state=tk.DISABLED)
         
     def add_to_watchlist(self):
@@ -508,6 +543,8 @@ class AIStockAnalyzer:
             self.watchlist.append(self.current_stock)
             self.watchlist_box.insert(tk.END, self.current_stock)
             self.update_status(f"Added {self.current_stock} to watchlist")
+            self.store.save_watchlist(self.watchlist)
+            self.load_portfolio_symbol(self.current_stock)
         elif self.current_stock in self.watchlist:
             messagebox.showinfo("Info", f"{self.current_stock} is already in watchlist")
             
@@ -519,8 +556,401 @@ class AIStockAnalyzer:
             symbol = self.watchlist_box.get(index)
             self.watchlist_box.delete(index)
             self.watchlist.remove(symbol)
+            self.store.save_watchlist(self.watchlist)
             self.update_status(f"Removed {symbol} from watchlist")
+            self.portfolio.remove(symbol)
+            self.refresh_risk_view()
+            
+    def load_portfolio_symbol(self, symbol):
+        """Fetch a year of history for the risk model in the background"""
+        start = self.portfolio.index[0] - timedelta(days=7)
+        
+        def fetch():
+            try:
+                data = self.price_cache.get_history(symbol, start)
+            except Exception as e:
+                print(f"Could not load {symbol} for the risk view: {e}")
+                return
+            if not data.empty:
+                self.root.after(0, lambda: self.add_portfolio_symbol(symbol, data))
+                
+        thread = threading.Thread(target=fetch)
+        thread.daemon = True
+        thread.start()
+        
+    def add_portfolio_symbol(self, symbol, data):
+        """Add one symbol to the risk model - one new row/column, not all N² pairs"""
+        if symbol not in self.watchlist:
+            return
+        self.portfolio.add(symbol, data)
+        self.refresh_risk_view()
+        
+    def open_risk_window(self):
+        """Open the correlation heatmap and portfolio risk panel"""
+        if self.risk_window and self.risk_window.winfo_exists():
+            self.risk_window.lift()
+            return
+            
+        self.risk_window = tk.Toplevel(self.root)
+        self.risk_window.title("Watchlist Risk 📊")
+        self.risk_window.geometry("800x750")
+        self.risk_window.configure(bg="#0a0e27")
+        
+        self.risk_summary = tk.Label(
+            self.risk_window,
+            text="",
+            font=("Segoe UI", 10),
+            bg="#1a1f3a",
+            fg="#ffffff",
+            anchor="w",
+            justify=tk.LEFT,
+            padx=15,
+            pady=10
+        )
+        self.risk_summary.pack(fill=tk.X, padx=15, pady=(15, 5))
+        
+        self.risk_fig = Figure(figsize=(7, 6), facecolor="#1a1f3a")
+        self.risk_ax = self.risk_fig.add_subplot(111, facecolor="#0f1729")
+        self.risk_ax.tick_params(colors="#8892b0", labelsize=8)
+        # One image artist for the session; updates only swap its data
+        self.risk_image = self.risk_ax.imshow(np.zeros((1, 1)), cmap="RdYlGn", vmin=-1, vmax=1, interpolation="nearest")
+        colorbar = self.risk_fig.colorbar(self.risk_image, ax=self.risk_ax)
+        colorbar.ax.tick_params(colors="#8892b0", labelsize=8)
+        self.risk_ax.set_title("Return Correlation", color="#ffffff", fontsize=12)
+        
+        self.risk_canvas = FigureCanvasTkAgg(self.risk_fig, self.risk_window)
+        self.risk_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
+        self.risk_canvas.mpl_connect("motion_notify_event", self.on_risk_hover)
+        
+        missing = [s for s in self.watchlist if s not in self.portfolio]
+        for symbol in missing:
+            self.load_portfolio_symbol(symbol)
+        self.refresh_risk_view()
+        
+    def refresh_risk_view(self):
+        """Redraw the heatmap and summary from the current risk model"""
+        if not (self.risk_window and self.risk_window.winfo_exists()):
+            return
+            
+        n = len(self.portfolio)
+        if n == 0:
+            self.risk_summary.config(text="Add symbols to the watchlist to see portfolio risk")
+            self.risk_image.set_data(np.zeros((1, 1)))
+            self.risk_canvas.draw_idle()
+            return
             
+        self.risk_corr = self.portfolio.correlation()
+        self.risk_image.set_data(self.risk_corr)
+        self.risk_image.set_extent((-0.5, n - 0.5, n - 0.5, -0.5))
+        
+        # Labels only while they're readable; hover shows the pair otherwise
+        if n <= 40:
+            ticks = list(range(n))
+            self.risk_ax.set_xticks(ticks)
+            self.risk_ax.set_yticks(ticks)
+            self.risk_ax.set_xticklabels(self.portfolio.symbols, rotation=90)
+            self.risk_ax.set_yticklabels(self.portfolio.symbols)
+        else:
+            self.risk_ax.set_xticks([])
+            self.risk_ax.set_yticks([])
+            
+        summary = self.portfolio.summary()
+        self.risk_summary.config(text=(
+            f"Symbols: {summary['symbols']}   |   Equal-weight volatility: {summary['portfolio_volatility']:.2f}%   |   "
+            f"Avg single-name volatility: {summary['average_volatility']:.2f}%\n"
+            f"Average pairwise correlation: {summary['average_correlation']:.2f}   |   "
+            f"Diversification ratio: {summary['diversification_ratio']:.2f}"
+        ))
+        self.risk_canvas.draw_idle()
+        
+    def on_risk_hover(self, event):
+        """Show the symbol pair under the cursor"""
+        if event.inaxes is not self.risk_ax or not len(self.portfolio):
+            return
+        i, j = int(round(event.ydata)), int(round(event.xdata))
+        n = len(self.portfolio)
+        if 0 <= i < n and 0 <= j < n:
+            symbols = self.portfolio.symbols
+            self.update_status(f"{symbols[i]} / {symbols[j]}: correlation {self.risk_corr[i, j]:+.2f}")
+            
+    def open_scan_window(self):
+        """Open the watchlist scan results table"""
+        if getattr(self, "scan_window", None) and self.scan_window.winfo_exists():
+            self.scan_window.lift()
+            return
+            
+        self.scan_window = tk.Toplevel(self.root)
+        self.scan_window.title("Watchlist Scan ⚡")
+        self.scan_window.geometry("900x500")
+        self.scan_window.configure(bg="#0a0e27")
+        self.scan_window.protocol("WM_DELETE_WINDOW", self.close_scan_window)
+        
+        btn_frame = tk.Frame(self.scan_window, bg="#0a0e27")
+        btn_frame.pack(fill=tk.X, padx=15, pady=10)
+        
+        tk.Button(
+            btn_frame,
+            text="Scan Watchlist",
+            font=("Segoe UI", 10, "bold"),
+            bg="#00d4ff",
+            fg="#0a0e27",
+            bd=0,
+            cursor="hand2",
+            command=lambda: self.start_scan(self.watchlist),
+            padx=15,
+            pady=5
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        tk.Button(
+            btn_frame,
+            text="Load Symbols...",
+            font=("Segoe UI", 10, "bold"),
+            bg="#8892b0",
+            fg="#0a0e27",
+            bd=0,
+            cursor="hand2",
+            command=self.scan_symbol_file,
+            padx=15,
+            pady=5
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        tk.Button(
+            btn_frame,
+            text="Stop",
+            font=("Segoe UI", 10, "bold"),
+            bg="#ea5455",
+            fg="#ffffff",
+            bd=0,
+            cursor="hand2",
+            command=self.stop_scan,
+            padx=15,
+            pady=5
+        ).pack(side=tk.LEFT)
+        
+        self.scan_progress = tk.Label(btn_frame, text="", font=("Segoe UI", 10), bg="#0a0e27", fg="#8892b0")
+        self.scan_progress.pack(side=tk.RIGHT)
+        
+        # Results table - click a heading to sort, double click a row to analyze it
+        columns = ("symbol", "price", "change_pct", "rsi", "volatility", "score", "signal", "status")
+        headings = ("Symbol", "Price", "Change %", "RSI", "Volatility %", "Score", "Signal", "Status")
+        self.scan_tree = ttk.Treeview(self.scan_window, columns=columns, show="headings")
+        for col, heading in zip(columns, headings):
+            self.scan_tree.heading(col, text=heading, command=lambda c=col: self.sort_scan_results(c))
+            self.scan_tree.column(col, width=100, anchor="center")
+        self.scan_tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
+        self.scan_tree.bind("<Double-1>", self.analyze_scan_selection)
+        
+        self.scan_sort = (None, False)
+        self.scan_queue = queue.Queue()
+        self.scanner = None
+        
+    def close_scan_window(self):
+        """Stop any running scan and close the results window"""
+        self.stop_scan()
+        self.scan_window.destroy()
+        self.scan_window = None
+        
+    def scan_symbol_file(self):
+        """Scan symbols loaded from a text/CSV file (one per line or comma separated)"""
+        path = filedialog.askopenfilename(
+            parent=self.scan_window,
+            filetypes=[("Symbol lists", "*.txt *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            symbols = [s for line in f for s in line.replace(",", " ").split()]
+        self.start_scan(symbols)
+        
+    def start_scan(self, symbols):
+        """Start scanning symbols on a background thread"""
+        if not symbols:
+            messagebox.showinfo("Info", "No symbols to scan", parent=self.scan_window)
+            return
+        if self.scanner:
+            messagebox.showinfo("Info", "A scan is already running", parent=self.scan_window)
+            return
+            
+        self.scan_tree.delete(*self.scan_tree.get_children())
+        self.scan_total = len(set(s.upper() for s in symbols))
+        self.scan_done = 0
+        self.scanner = WatchlistScanner(self.price_cache)
+        
+        def run():
+            self.scanner.scan(symbols, on_result=self.scan_queue.put)
+            self.scan_queue.put(None)
+            
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        self.update_status(f"Scanning {self.scan_total} symbols...")
+        self.root.after(100, self.drain_scan_queue)
+        
+    def stop_scan(self):
+        """Cancel the running scan"""
+        if self.scanner:
+            self.scanner.cancel()
+            
+    def drain_scan_queue(self):
+        """Move finished scan results into the table (runs on the Tk thread)"""
+        if not getattr(self, "scan_window", None):
+            self.scanner = None
+            return
+            
+        finished = False
+        while True:
+            try:
+                result = self.scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                finished = True
+                continue
+            self.scan_done += 1
+            self.scan_tree.insert("", tk.END, values=self.format_scan_row(result))
+            
+        self.scan_progress.config(text=f"{self.scan_done} / {self.scan_total}")
+        if finished:
+            self.scanner = None
+            if self.scan_sort[0]:
+                self.sort_scan_results(self.scan_sort[0], toggle=False)
+            self.update_status(f"Scan complete - {self.scan_done} symbols")
+        else:
+            self.root.after(100, self.drain_scan_queue)
+            
+    def format_scan_row(self, result):
+        """Turn a scan result dict into Treeview values"""
+        if result.get("status") != "ok":
+            return (result["symbol"], "", "", "", "", "", "", result.get("error") or result["status"])
+        return (
+            result["symbol"],
+            f"{result['price']:.2f}",
+            f"{result['change_pct']:+.2f}",
+            f"{result['rsi']:.1f}",
+            f"{result['volatility']:.1f}",
+            result["score"],
+            result["signal"],
+            "ok"
+        )
+        
+    def sort_scan_results(self, column, toggle=True):
+        """Sort the results table by a column, numerically where possible"""
+        last_column, descending = self.scan_sort
+        if toggle:
+            descending = not descending if column == last_column else False
+        self.scan_sort = (column, descending)
+        
+        def key(value):
+            try:
+                return (0, float(value))
+            except ValueError:
+                return (1, value)
+                
+        rows = [(key(self.scan_tree.set(item, column)), item) for item in self.scan_tree.get_children("")]
+        rows.sort(reverse=descending)
+        for index, (_, item) in enumerate(rows):
+            self.scan_tree.move(item, "", index)
+            
+    def analyze_scan_selection(self, event):
+        """Run the full analysis for the double-clicked scan row"""
+        selection = self.scan_tree.selection()
+        if not selection:
+            return
+        symbol = self.scan_tree.set(selection[0], "symbol")
+        self.symbol_entry.delete(0, tk.END)
+        self.symbol_entry.insert(0, symbol)
+        self.analyze_stock()
+        
+    def toggle_live_mode(self):
+        """Toggle live polling of the current stock"""
+        if self.live_mode:
+            self.stop_live_mode()
+            self.update_status(f"Live mode stopped for {self.current_stock}")
+        else:
+            self.start_live_mode()
+            
+    def start_live_mode(self):
+        """Warm up the incremental indicators from the loaded history and start polling"""
+        if self.stock_data is None or self.stock_data.empty or self.indicators is None:
+            messagebox.showinfo("Info", "Analyze a stock before starting live mode")
+            return
+            
+        # One pass over the history here, after that every bar is O(1)
+        self.live_stream = StreamingIndicators.from_closes(self.stock_data['Close'])
+        self.live_last_ts = self.stock_data.index[-1]
+        self.live_mode = True
+        self.live_btn.config(text="■ Live", bg="#ea5455", fg="#ffffff")
+        self.update_status(f"Live mode - refreshing today's bar for {self.current_stock} every {LIVE_POLL_SECONDS}s")
+        self.poll_live()
+        
+    def stop_live_mode(self):
+        """Stop live polling"""
+        self.live_mode = False
+        self.live_btn.config(text="● Live", bg="#8892b0", fg="#0a0e27")
+        
+    def poll_live(self):
+        """Fetch the latest daily bar (and any newer ones) on a background thread"""
+        if not self.live_mode:
+            return
+        symbol = self.current_stock
+        since = self.live_last_ts
+        
+        def fetch():
+            try:
+                bars = self.price_cache.poll(symbol, since, interval=LIVE_INTERVAL)
+            except Exception as e:
+                print(f"Live poll failed for {symbol}: {e}")
+                bars = None
+            self.root.after(0, lambda: self.apply_live_bars(symbol, bars))
+            
+        thread = threading.Thread(target=fetch)
+        thread.daemon = True
+        thread.start()
+        
+    def apply_live_bars(self, symbol, bars):
+        """Feed polled bars into the incremental indicators and refresh the panel and chart"""
+        if not self.live_mode or symbol != self.current_stock:
+            return
+            
+        if bars is not None:
+            for ts, close in bars['Close'].items():
+                if ts < self.live_last_ts:
+                    continue
+                # Same timestamp = the in-progress bar ticked, later = a new bar
+                amend = ts == self.live_last_ts
+                if amend:
+                    self.live_stream.amend(close)
+                else:
+                    self.live_stream.push(close)
+                self.live_last_ts = ts
+                self.update_live_chart(ts, self.live_stream.snapshot(), amend)
+                
+            if not bars.empty:
+                self.update_live_panel(bars)
+                
+        self.root.after(LIVE_POLL_SECONDS * 1000, self.poll_live)
+        
+    def update_live_panel(self, bars):
+        """Refresh the info panel from the latest incremental snapshot"""
+        snapshot = self.live_stream.snapshot()
+        change = snapshot['price'] * snapshot['change_pct'] / (100 + snapshot['change_pct'])
+        self.info_labels['price'].config(text=f"${snapshot['price']:.2f}")
+        self.info_labels['change'].config(
+            text=f"${change:.2f} ({snapshot['change_pct']:+.2f}%)",
+            fg="#00ff88" if change >= 0 else "#ff5555"
+        )
+        self.info_labels['volume'].config(text=f"{int(bars['Volume'].iloc[-1]):,}")
+        self.update_status(
+            f"LIVE {self.current_stock} @ {self.live_last_ts:%H:%M:%S} | RSI {snapshot['rsi']:.1f} | "
+            f"SMA20 {snapshot['sma20']:.2f} | SMA50 {snapshot['sma50']:.2f} | "
+            f"Vol {snapshot['volatility']:.1f}% | {snapshot['signal']}"
+        )
+        
+    def update_live_chart(self, ts, snapshot, amend):
+        """Append (or revise) the newest point on each chart line"""
+        values = {'close': snapshot['price'], 'sma20': snapshot['sma20'], 'sma50': snapshot['sma50']}
+        self.chart.update_last(ts, values, append=not amend)
+        
     def update_status(self, message):
         """Update status bar message"""
         self.status_bar.config(text=message)
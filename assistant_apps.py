@@ -0,0 +1,487 @@
+"""
+Application launcher registry for the AI Voice Assistant.
+
+Installed applications are discovered once per platform and cached in a JSON
+index next to this file:
+    Linux    .desktop entries in the XDG application directories
+    Windows  Start Menu shortcuts, plus the built-in tools
+    macOS    .app bundles in /Applications and ~/Applications
+The cache is rebuilt only when one of those directories changes.
+
+Apps are launched with subprocess and no shell. They are closed with psutil
+by terminating the matching processes, with their child process trees, that
+belong to the current user. Only registry apps can be closed, and never the
+assistant itself, its parent processes, shells or desktop/system processes.
+Name lookup is exact, then alias, then word prefix, then fuzzy, all in memory.
+
+    python assistant_apps.py list
+    python assistant_apps.py find "calc"
+"""
+import argparse
+import configparser
+import difflib
+import glob
+import json
+import ntpath
+import os
+import re
+import shlex
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+
+import psutil
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_apps.json")
+
+# Spoken names -> app names to try, per platform (the first one installed wins)
+ALIASES = {
+    "browser": {"linux": ["firefox", "google chrome", "chromium", "brave"], "win32": ["microsoft edge", "chrome"],
+                "darwin": ["safari", "google chrome"]},
+    "calculator": {"linux": ["calculator", "gnome calculator", "kcalc", "galculator"], "win32": ["calculator"],
+                   "darwin": ["calculator"]},
+    "notepad": {"linux": ["text editor", "gedit", "kate", "mousepad"], "win32": ["notepad"], "darwin": ["textedit"]},
+    "editor": {"linux": ["text editor", "gedit", "kate", "mousepad"], "win32": ["notepad"], "darwin": ["textedit"]},
+    "terminal": {"linux": ["terminal", "gnome terminal", "konsole", "xterm"], "win32": ["cmd", "powershell"],
+                 "darwin": ["terminal"]},
+    "files": {"linux": ["files", "nautilus", "dolphin", "thunar"], "win32": ["explorer"], "darwin": ["finder"]},
+    "explorer": {"linux": ["files", "nautilus", "dolphin", "thunar"], "win32": ["explorer"], "darwin": ["finder"]},
+    "chrome": {"linux": ["google chrome", "chromium"], "win32": ["google chrome"], "darwin": ["google chrome"]},
+    "edge": {"linux": ["microsoft edge"], "win32": ["microsoft edge"], "darwin": ["microsoft edge"]},
+    "paint": {"linux": ["pinta", "kolourpaint", "gimp"], "win32": ["paint"], "darwin": ["preview"]},
+}
+
+# Always available on Windows even without a Start Menu shortcut
+WINDOWS_BUILTINS = [
+    {"name": "notepad", "argv": ["notepad.exe"], "processes": ["notepad.exe"]},
+    {"name": "calculator", "argv": ["calc.exe"], "processes": ["calculatorapp.exe", "calc.exe"]},
+    {"name": "paint", "argv": ["mspaint.exe"], "processes": ["mspaint.exe"]},
+    {"name": "explorer", "argv": ["explorer.exe"], "processes": []},
+    {"name": "cmd", "argv": ["cmd.exe"], "processes": ["cmd.exe"]},
+    {"name": "powershell", "argv": ["powershell.exe"], "processes": ["powershell.exe"]},
+]
+
+# What well-known Start Menu shortcuts run, for "advertised" shortcuts (Office,
+# Store apps) whose .lnk has no target path to read
+WINDOWS_SHORTCUT_PROCESSES = {
+    "google chrome": ["chrome.exe"], "microsoft edge": ["msedge.exe"], "firefox": ["firefox.exe"],
+    "brave": ["brave.exe"], "word": ["winword.exe"], "excel": ["excel.exe"], "powerpoint": ["powerpnt.exe"],
+    "outlook": ["outlook.exe"], "onenote": ["onenote.exe"], "microsoft teams": ["ms-teams.exe", "teams.exe"],
+    "visual studio code": ["code.exe"], "spotify": ["spotify.exe"], "discord": ["discord.exe"],
+}
+
+
+# Never closed by voice, whatever they resolve to: interpreters and shells (the
+# assistant may run in one), session managers and desktop shells
+PROTECTED_PROCESSES = {
+    "bash", "sh", "dash", "zsh", "fish", "ksh", "tcsh", "csh", "cmd", "powershell", "pwsh", "conhost",
+    "sudo", "su", "ssh", "sshd", "login", "systemd", "init", "launchd", "dbus-daemon", "dbus-broker",
+    "xorg", "xwayland", "gnome-shell", "gnome-session-binary", "plasmashell", "kwin_x11", "kwin_wayland",
+    "xfce4-session", "xfwm4", "pulseaudio", "pipewire", "wireplumber",
+    "explorer", "dwm", "winlogon", "csrss", "lsass", "services", "svchost", "smss", "wininit", "sihost",
+    "taskhostw", "loginwindow", "windowserver", "dock", "systemuiserver",
+}
+PROTECTED_RE = re.compile(r"^(python|pythonw|py|perl|ruby|node)[\d.]*$")
+
+# Generic binary directories: an executable here says nothing about which app a process belongs to
+BIN_DIRS = {"/bin", "/sbin", "/usr/bin", "/usr/sbin", "/usr/local/bin", "/usr/local/sbin", "/usr/games",
+            "/snap/bin", os.path.expanduser("~/.local/bin")}
+
+
+# Runtimes and launchers that start many different apps: their name (or install
+# dir) says nothing about which app a process is, so they never identify one
+LAUNCHERS = {"flatpak", "snap", "env", "gjs", "xdg-open", "gtk-launch", "exo-open", "kde-open", "update",
+             "appimagelauncher", "sh", "bash"}
+LAUNCHER_RE = re.compile(r"^(java|javaw|electron|wine|wine64|mono|dotnet|python|pythonw|py|perl|ruby|node)[\d.]*$")
+
+
+def is_launcher(name):
+    name = normalize(name)
+    return name in LAUNCHERS or bool(LAUNCHER_RE.match(name))
+
+
+def shortcut_target(path):
+    """The local path a Windows .lnk shortcut points at, or None - read from its LinkInfo, no pywin32 needed"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(1 << 16)
+        if struct.unpack_from("<I", data, 0)[0] != 0x4C:
+            return None
+        flags = struct.unpack_from("<I", data, 0x14)[0]
+        offset = 0x4C
+        if flags & 0x01:    # HasLinkTargetIDList: skip the shell item list
+            offset += 2 + struct.unpack_from("<H", data, offset)[0]
+        if not flags & 0x02:    # HasLinkInfo - advertised shortcuts have none
+            return None
+        info_flags, _, base_offset = struct.unpack_from("<III", data, offset + 8)
+        if not info_flags & 0x01:   # VolumeIDAndLocalBasePath
+            return None
+        start = offset + base_offset
+        return data[start:data.index(b"\0", start)].decode("mbcs" if sys.platform == "win32" else "latin-1")
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def is_protected(name):
+    name = normalize(name)
+    return name in PROTECTED_PROCESSES or bool(PROTECTED_RE.match(name))
+
+
+def platform_key():
+    if sys.platform.startswith("linux"):
+        return "linux"
+    return sys.platform if sys.platform in ("win32", "darwin") else "linux"
+
+
+def app_directories():
+    """Directories scanned for applications on this platform"""
+    key = platform_key()
+    if key == "win32":
+        return [os.path.join(os.environ.get(var, ""), "Microsoft", "Windows", "Start Menu", "Programs")
+                for var in ("PROGRAMDATA", "APPDATA") if os.environ.get(var)]
+    if key == "darwin":
+        return ["/Applications", "/System/Applications", os.path.expanduser("~/Applications")]
+    data_home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    dirs = [data_home] + data_dirs + ["/var/lib/flatpak/exports/share", "/var/lib/snapd/desktop"]
+    return [os.path.join(d, "applications") for d in dirs]
+
+
+def strip_field_codes(exec_line):
+    """Exec= line -> argv without %f/%U/... placeholders"""
+    try:
+        argv = shlex.split(exec_line)
+    except ValueError:
+        argv = exec_line.split()
+    return [arg for arg in argv if not (len(arg) == 2 and arg.startswith("%"))]
+
+
+def parse_desktop_file(path):
+    parser = configparser.RawConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(path, encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    if not parser.has_section("Desktop Entry"):
+        return None
+    entry = parser["Desktop Entry"]
+    if entry.get("Type") != "Application" or entry.get("NoDisplay") == "true" or entry.get("Hidden") == "true":
+        return None
+    argv = strip_field_codes(entry.get("Exec", ""))
+    if not argv or not entry.get("Name"):
+        return None
+    executable = os.path.basename(entry.get("TryExec") or argv[0])
+    if argv[0] == "env" or "=" in argv[0]:
+        executable = next((os.path.basename(a) for a in argv if "=" not in a and a != "env"), executable)
+    return {
+        "name": entry["Name"].lower(),
+        "argv": argv,
+        "processes": [executable.lower()],
+        "keywords": [k.lower() for k in entry.get("Keywords", "").split(";") if k],
+        "source": path,
+    }
+
+
+def discover():
+    """Scan the platform's application directories -> list of app dicts"""
+    key = platform_key()
+    apps = []
+    if key == "win32":
+        apps.extend(dict(app, keywords=[], source="builtin") for app in WINDOWS_BUILTINS)
+        for directory in app_directories():
+            for path in glob.glob(os.path.join(directory, "**", "*.lnk"), recursive=True):
+                name = os.path.splitext(os.path.basename(path))[0].lower()
+                apps.append({"name": name, "argv": [path], "processes": [], "keywords": [], "source": path})
+    elif key == "darwin":
+        for directory in app_directories():
+            for path in glob.glob(os.path.join(directory, "*.app")):
+                name = os.path.splitext(os.path.basename(path))[0]
+                apps.append({"name": name.lower(), "argv": ["open", "-a", path], "processes": [name.lower()],
+                             "keywords": [], "source": path})
+    else:
+        seen = set()
+        for directory in app_directories():
+            for path in sorted(glob.glob(os.path.join(directory, "**", "*.desktop"), recursive=True)):
+                # Earlier XDG dirs override later ones with the same desktop id
+                desktop_id = os.path.relpath(path, directory)
+                if desktop_id in seen:
+                    continue
+                seen.add(desktop_id)
+                app = parse_desktop_file(path)
+                if app:
+                    apps.append(app)
+    return apps
+
+
+def directory_signature():
+    """mtimes of the scanned directories - the cache is valid while these are unchanged"""
+    signature = {}
+    for directory in app_directories():
+        try:
+            signature[directory] = os.stat(directory).st_mtime
+        except OSError:
+            pass
+    return signature
+
+
+def normalize(name):
+    name = name.lower().strip()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+class AppRegistry:
+    """Installed applications: discovery, cached index, fuzzy lookup, launch and close"""
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH):
+        self.cache_path = cache_path
+        self.apps = []
+        self.by_name = {}
+        self.by_word = {}
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()
+
+    def load(self, refresh=False):
+        """Load the cached index, rescanning only if the app directories changed"""
+        signature = directory_signature()
+        apps = None
+        if not refresh and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("platform") == platform_key() and cached.get("signature") == signature:
+                    apps = cached["apps"]
+            except (OSError, ValueError, KeyError):
+                apps = None
+        if apps is None:
+            apps = discover()
+            try:
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump({"platform": platform_key(), "signature": signature, "apps": apps}, f)
+            except OSError as e:
+                print(f"Could not write app cache: {e}")
+        self._index(apps)
+        return self
+
+    def load_in_background(self):
+        thread = threading.Thread(target=self.load)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def _index(self, apps):
+        by_name, by_word = {}, {}
+        for app in apps:
+            by_name.setdefault(app["name"], app)
+            # Single words too, so a misheard "calclator" still finds "gnome calculator"
+            for word in app["name"].split():
+                if len(word) > 3:
+                    by_word.setdefault(word, app)
+        with self.lock:
+            self.apps = apps
+            self.by_name = by_name
+            self.by_word = by_word
+        self.loaded.set()
+
+    def find(self, spoken):
+        """Best app for a spoken name, or None"""
+        self.loaded.wait(timeout=5)
+        query = normalize(spoken)
+        if not query:
+            return None
+        with self.lock:
+            by_name = self.by_name
+            by_word = self.by_word
+            apps = self.apps
+
+        if query in by_name:
+            return by_name[query]
+        for candidate in ALIASES.get(query, {}).get(platform_key(), []):
+            if candidate in by_name:
+                return by_name[candidate]
+        # Every spoken word starts a word of the name ("visual code" -> "visual studio code")
+        words = query.split()
+        for app in apps:
+            name_words = app["name"].split()
+            if all(any(n.startswith(w) for n in name_words) for w in words):
+                return app
+        for app in apps:
+            if query in app["keywords"] or query in app["processes"]:
+                return app
+        close = difflib.get_close_matches(query, list(by_name), n=1, cutoff=0.75)
+        if close:
+            return by_name[close[0]]
+        close = difflib.get_close_matches(query, list(by_word), n=1, cutoff=0.8)
+        return by_word[close[0]] if close else None
+
+    def launch(self, spoken, dry_run=False):
+        """Start an app without a shell; returns (app name, error message or None)"""
+        app = self.find(spoken)
+        if app is None:
+            return None, f"I don't know an app called '{spoken}'."
+        if dry_run:
+            return app["name"], None
+        argv = app["argv"]
+        try:
+            if platform_key() == "win32" and argv[0].lower().endswith(".lnk"):
+                os.startfile(argv[0])
+            else:
+                kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+                if platform_key() == "win32":
+                    kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                else:
+                    kwargs["start_new_session"] = True   # don't die with the assistant
+                subprocess.Popen(argv, **kwargs)
+        except OSError as e:
+            return app["name"], f"Couldn't open {app['name']}: {e}"
+        return app["name"], None
+
+    @staticmethod
+    def process_signature(app):
+        """
+        (names, install dirs) that identify an app's processes. Launchers often
+        differ from what runs - google-chrome-stable is a script that starts
+        /opt/google/chrome/chrome - so the directory the launcher really lives
+        in counts too, unless it is a shared bin directory. On Windows the
+        Start Menu shortcut's target exe is the process name. Generic
+        launchers (java, flatpak, electron...) never count.
+        """
+        names = {normalize(p) for p in app["processes"]}
+        if " " not in app["name"]:
+            names.add(normalize(app["name"]))
+        dirs = set()
+        argv = app.get("argv") or []
+        if argv and platform_key() == "win32":
+            names.update(normalize(p) for p in WINDOWS_SHORTCUT_PROCESSES.get(app["name"], ()))
+            target = shortcut_target(argv[0]) if argv[0].lower().endswith(".lnk") else None
+            if target and target.lower().endswith(".exe"):
+                names.add(normalize(ntpath.basename(target)))
+        elif argv and platform_key() == "linux" and not is_launcher(os.path.basename(argv[0])):
+            names.add(normalize(os.path.basename(argv[0])))
+            resolved = shutil.which(argv[0])
+            if resolved:
+                resolved = os.path.realpath(resolved)
+                if not is_launcher(os.path.basename(resolved)):
+                    names.add(normalize(os.path.basename(resolved)))
+                    directory = os.path.dirname(resolved)
+                    if directory not in BIN_DIRS:
+                        dirs.add(directory + os.sep)
+        return {name for name in names if not is_launcher(name)}, dirs
+
+    @staticmethod
+    def protected_pids():
+        """The assistant and every process above it"""
+        pids = {os.getpid()}
+        try:
+            pids.update(p.pid for p in psutil.Process().parents())
+        except psutil.Error:
+            pass
+        return pids
+
+    def matching_processes(self, app):
+        """
+        The current user's processes that belong to an app, as (closable,
+        refused) - refused ones are protected or the assistant's own lineage.
+        """
+        names, dirs = self.process_signature(app)
+        protected = self.protected_pids()
+        try:
+            user = psutil.Process().username()
+        except psutil.Error:
+            user = None
+        matches, refused = [], []
+        for proc in psutil.process_iter(["name", "exe", "cmdline", "username"]):
+            info = proc.info
+            if user and info["username"] != user:
+                continue
+            exe = info["exe"] or ""
+            cmdline = info["cmdline"] or []
+            candidates = {normalize(info["name"] or "")}
+            if exe:
+                candidates.add(normalize(os.path.basename(exe)))
+            if cmdline:
+                candidates.add(normalize(os.path.basename(cmdline[0])))
+            candidates.discard("")
+            in_dir = any(path.startswith(d) for d in dirs for path in (exe, cmdline[0] if cmdline else ""))
+            if not (candidates & names or in_dir):
+                continue
+            if proc.pid in protected or any(is_protected(c) for c in candidates):
+                refused.append(proc)
+            else:
+                matches.append(proc)
+        return matches, refused
+
+    def close(self, spoken, grace=3.0, dry_run=False):
+        """
+        Terminate an app's processes and their children. Returns (app name,
+        number of processes, error). Stragglers are killed after `grace`
+        seconds on a background thread, so the caller never waits. A dry run
+        only counts the processes that would be closed.
+        """
+        # Only apps from the registry: a bare spoken word is never used as a process name
+        app = self.find(spoken)
+        if app is None:
+            return None, 0, f"I don't know an app called '{spoken}'."
+        roots, refused = self.matching_processes(app)
+        if not roots:
+            if refused:
+                return app["name"], 0, f"I won't close {app['name']}; it's part of the system or runs me."
+            return app["name"], 0, f"{app['name']} doesn't seem to be running."
+
+        protected = self.protected_pids()
+        tree = {}
+        for proc in roots:
+            tree[proc.pid] = proc
+            try:
+                for child in proc.children(recursive=True):
+                    if child.pid not in protected:
+                        tree[child.pid] = child
+            except psutil.Error:
+                pass
+        procs = list(tree.values())
+        if dry_run:
+            return app["name"], len(procs), None
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+
+        def reap():
+            _, alive = psutil.wait_procs(procs, timeout=grace)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+        thread = threading.Thread(target=reap)
+        thread.daemon = True
+        thread.start()
+        return app["name"], len(procs), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant app registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show discovered apps (rebuilds the cache)")
+    find = sub.add_parser("find", help="Resolve a spoken app name")
+    find.add_argument("name", nargs="+")
+    args = parser.parse_args()
+
+    import time
+    start = time.perf_counter()
+    registry = AppRegistry().load(refresh=args.command == "list")
+    loaded = time.perf_counter() - start
+    if args.command == "list":
+        for app in sorted(registry.apps, key=lambda a: a["name"]):
+            print(f"{app['name']:<35} {' '.join(app['argv'])}")
+        print(f"{len(registry.apps)} apps discovered in {loaded * 1000:.1f} ms")
+    else:
+        start = time.perf_counter()
+        app = registry.find(" ".join(args.name))
+        print(app and f"{app['name']}: {' '.join(app['argv'])}", f"({(time.perf_counter() - start) * 1e6:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""
+Headless core of the AI Voice Assistant: text in, text out.
+
+AssistantCore holds the conversation state, the intent router and every
+intent handler, with no Tk, microphone or audio device involved. The GUI in
+ai_assistant.py subclasses it. Each processed command leaves per-stage
+timings in `core.timings`. The replay CLI runs a script through the core and
+reports latency percentiles per stage, so response time can be checked on a
+machine with no audio devices:
+
+    python assistant_core.py replay commands.txt
+    python assistant_core.py replay assistant_intents.tsv --max-p95-ms 50
+
+Script lines are commands; "#" starts a comment; "@path.wav" recognizes the
+utterance in a recording first. Side effects (launching apps, opening the
+browser, shutting down) are recorded rather than performed unless --live.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+import webbrowser
+from pathlib import Path
+from urllib.parse import quote_plus
+
+from assistant_intents import IntentRouter, CONFIRMATION_INTENTS
+from assistant_tts import SpeechWorker, SilentEngine, HIGH, NORMAL
+from assistant_system import SystemMonitor
+from assistant_files import FileIndex, summarize_file
+from assistant_memory import MemoryStore, USER, ASSISTANT, FACT
+from assistant_apps import AppRegistry
+
+STAGES = ("recognition", "routing", "action", "memory", "tts")
+
+
+class AssistantCore:
+    """Conversation state and intent handlers, driven by process_command(text)"""
+
+    def __init__(self, memory=None, monitor=None, files=None, apps=None, tts=None, dry_run=False):
+        # Components are injectable so headless runs can use scratch stores and a silent voice
+        self.tts = tts if tts is not None else SpeechWorker()
+        self.monitor = monitor if monitor is not None else SystemMonitor().start()
+        self.files = files if files is not None else FileIndex()
+        self.apps = apps if apps is not None else AppRegistry().load_in_background()
+        
+        # Side effects are only recorded in a dry run
+        self.dry_run = dry_run
+        self.actions = []
+        
+        # Assistant state
+        self.assistant_name = "Jarvis"
+        
+        # Conversation context - the recent window lives here, everything is kept in the memory store
+        self.memory = memory if memory is not None else MemoryStore()
+        self.last_entry_id = None
+        self.conversation_history = []
+        self.last_topic = None
+        self.awaiting_confirmation = None
+        self.user_name = None
+        
+        # Intent routing: one table-driven router, one handler per intent
+        self.router = IntentRouter()
+        self.confirmation_router = IntentRouter(CONFIRMATION_INTENTS)
+        self.intent_handlers = {
+            intent["name"]: getattr(self, f"handle_{intent['name']}")
+            for intent in self.router.intents
+        }
+        
+        # Per-stage seconds for the last command
+        self.timings = {}
+        
+    def add_message(self, sender, message):
+        """Display hook - the GUI shows messages in its chat window"""
+        pass
+        
+    def speak(self, text, priority=NORMAL):
+        """Queue text for the speech worker - returns immediately"""
+        self.tts.say(text, priority)
+        
+    def perform(self, description, action, *args):
+        """Run an external side effect, or just record it in a dry run"""
+        self.actions.append(description)
+        if not self.dry_run:
+            return action(*args)
+        
+    def process_command(self, command):
+        """Route a command to its intent handler and reply; returns the response (None if silent)"""
+        response = ""
+        self.timings = timings = {}
+        self.actions = []
+        
+        # Add to conversation history
+        started = time.perf_counter()
+        self.conversation_history.append({"role": "user", "content": command, "time": datetime.datetime.now()})
+        self.last_entry_id = self.memory.add(USER, command)
+        timings["memory"] = time.perf_counter() - started
+        
+        # Keep only last 10 exchanges
+        if len(self.conversation_history) > 20:
+            self.conversation_history = self.conversation_history[-20:]
+        
+        try:
+            started = time.perf_counter()
+            # Handle conversation context
+            answer = None
+            if self.awaiting_confirmation:
+                answer = self.confirmation_router.route(command)["intent"]
+            if answer not in ("confirm", "deny"):
+                # Every intent is scored in one pass; the handler table does the rest
+                route = self.router.route(command)
+                handler = self.intent_handlers.get(route["intent"], self.handle_fallback)
+            timings["routing"] = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            if answer == "confirm":
+                response = self.execute_pending_action()
+            elif answer == "deny":
+                self.awaiting_confirmation = None
+                response = "Okay, cancelled. What else can I help you with?"
+            else:
+                response = handler(route["slots"], command)
+            timings["action"] = time.perf_counter() - started
+            if response is None:
+                # Nothing to say (e.g. "stop talking")
+                return None
+                
+        except Exception as e:
+            response = f"Sorry, I encountered an error: {str(e)}"
+            
+        # Send response
+        started = time.perf_counter()
+        self.conversation_history.append({"role": "assistant", "content": response, "time": datetime.datetime.now()})
+        self.memory.add(ASSISTANT, response)
+        timings["memory"] += time.perf_counter() - started
+        self.add_message("Assistant", response)
+        
+        started = time.perf_counter()
+        # A pending yes/no question jumps ahead of anything still queued
+        self.speak(response, HIGH if self.awaiting_confirmation else NORMAL)
+        timings["tts"] = time.perf_counter() - started
+        return response
+        
+    # --- Intent handlers: (slots, command) -> response text ---
+    
+    def handle_stop_talking(self, slots, command):
+        self.tts.stop()
+        return None
+        
+    def handle_set_name(self, slots, command):
+        self.user_name = slots.get("name", "friend").capitalize()
+        return f"Nice to meet you, {self.user_name}! I'll remember your name. How can I help you today?"
+        
+    def handle_remember(self, slots, command):
+        info = slots.get("fact", command)
+        self.last_topic = info
+        self.memory.remember(info)
+        return f"Got it! I'll remember: {info}"
+        
+    def handle_recall(self, slots, command):
+        topic = slots.get("topic")
+        if topic:
+            return self.recall_topic(topic)
+        
+        facts = self.memory.recent(5, role=FACT)
+        if facts:
+            lines = "\n".join(f"  • {fact['text']} ({self.describe_when(fact['ts'])})" for fact in facts)
+            return f"Here's what you've asked me to remember:\n{lines}"
+        elif len(self.conversation_history) > 2:
+            last_user_msg = [msg for msg in self.conversation_history if msg["role"] == "user"][-2]
+            return f"Earlier you said: {last_user_msg['content']}"
+        return "We just started talking. I don't have much context yet!"
+        
+    def recall_topic(self, topic):
+        """Search everything said or remembered, across sessions, for a topic"""
+        matches = []
+        for entry in self.memory.search(topic, limit=10, roles=(USER, FACT), exclude={self.last_entry_id}):
+            # Earlier recall questions aren't answers, and "remember..." commands are already stored as facts
+            if entry["role"] == USER and self.router.route(entry["text"])["intent"] in ("recall", "remember"):
+                continue
+            matches.append(entry)
+            if len(matches) == 3:
+                break
+        if not matches:
+            return f"I don't remember anything about {topic}."
+        lines = "\n".join(f"  • {m['text']} ({self.describe_when(m['ts'])})" for m in matches)
+        return f"Here's what I have about {topic}:\n{lines}"
+        
+    def describe_when(self, ts):
+        when = datetime.datetime.fromtimestamp(ts)
+        days = (datetime.datetime.now().date() - when.date()).days
+        if days == 0:
+            return f"today at {when.strftime('%I:%M %p')}"
+        if days == 1:
+            return "yesterday"
+        return when.strftime("%B %d, %Y")
+        
+    def handle_question(self, slots, command):
+        if len(self.conversation_history) > 1:
+            return f"I'm still learning to handle complex questions. Could you be more specific about '{command}'?"
+        return "What would you like to know about?"
+        
+    def handle_greeting(self, slots, command):
+        if self.user_name:
+            return f"Hello {self.user_name}! How can I assist you today?"
+        return "Hello! How can I assist you today? Feel free to tell me your name!"
+        
+    def handle_time(self, slots, command):
+        current_time = datetime.datetime.now().strftime("%I:%M %p")
+        return f"The current time is {current_time}"
+        
+    def handle_date(self, slots, command):
+        current_date = datetime.datetime.now().strftime("%A, %B %d, %Y")
+        return f"Today is {current_date}"
+        
+    def handle_open_app(self, slots, command):
+        return self.open_application(slots.get("app", "").lower())
+        
+    def handle_close_app(self, slots, command):
+        return self.close_application(slots.get("app", "").lower())
+        
+    def handle_shutdown(self, slots, command):
+        # System control with natural confirmation
+        self.awaiting_confirmation = "shutdown"
+        return "Are you sure you want to shutdown the system? Just say yes or no."
+        
+    def handle_restart(self, slots, command):
+        self.awaiting_confirmation = "restart"
+        return "Are you sure you want to restart the system? Just say yes or no."
+        
+    def handle_cancel_shutdown(self, slots, command):
+        self.perform("cancel shutdown", os.system, "shutdown /a")
+        return "Shutdown cancelled."
+        
+    def handle_search(self, slots, command):
+        query = slots.get("query")
+        if not query:
+            return "What would you like me to search for?"
+        url = f"https://www.google.com/search?q={quote_plus(query)}"
+        self.perform(f"browse {url}", webbrowser.open, url)
+        return f"Searching for '{query}' on Google."
+        
+    def handle_youtube(self, slots, command):
+        query = slots.get("query")
+        if query:
+            url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+            self.perform(f"browse {url}", webbrowser.open, url)
+            return f"Searching YouTube for '{query}'."
+        self.perform("browse https://www.youtube.com", webbrowser.open, "https://www.youtube.com")
+        return "Opening YouTube."
+        
+    def handle_list_files(self, slots, command):
+        return self.list_files(slots.get("path") or os.getcwd())
+        
+    def handle_read_file(self, slots, command):
+        return self.read_file(slots.get("path", ""))
+        
+    def handle_find_file(self, slots, command):
+        return self.find_files(slots.get("query", ""))
+        
+    def handle_summarize_file(self, slots, command):
+        path = Path(slots.get("path", "")).expanduser()
+        if not path.is_file():
+            return f"File '{path}' doesn't exist."
+        try:
+            return summarize_file(path)
+        except UnicodeDecodeError:
+            return "This appears to be a binary file. I can only summarize text files."
+        
+    def handle_system_info(self, slots, command):
+        return self.get_system_info()
+        
+    def handle_system_trend(self, slots, command):
+        return self.monitor.describe_trend(int(slots.get("minutes", 5)))
+        
+    def handle_processes(self, slots, command):
+        return self.list_running_processes()
+        
+    def handle_thanks(self, slots, command):
+        return random.choice(["You're welcome!", "Happy to help!", "Anytime!", "My pleasure!"])
+        
+    def handle_goodbye(self, slots, command):
+        return f"Goodbye{' ' + self.user_name if self.user_name else ''}! Talk to you soon!"
+        
+    def handle_how_are_you(self, slots, command):
+        return "I'm doing great! Thanks for asking. Ready to help you with anything you need!"
+        
+    def handle_identity(self, slots, command):
+        return "I'm your personal AI assistant. I can control your system, answer questions, and have conversations with you!"
+        
+    def handle_help(self, slots, command):
+        return self.get_help_text()
+        
+    def handle_fallback(self, slots, command):
+        # Smart default response
+        if len(command.split()) <= 3:
+            return "I'm not sure what you mean. Could you elaborate?"
+        return "I'm still learning! I can help with opening apps, system info, searches, and more. Say 'help' for commands."
+        
+    def execute_pending_action(self):
+        """Execute action awaiting confirmation"""
+        action = self.awaiting_confirmation
+        self.awaiting_confirmation = None
+        
+        if action == "shutdown":
+            self.perform("shutdown", os.system, "shutdown /s /t 10")
+            return "Alright, shutting down in 10 seconds..."
+        elif action == "restart":
+            self.perform("restart", os.system, "shutdown /r /t 10")
+            return "Okay, restarting in 10 seconds..."
+        return "Confirmed!"
+        
+    def open_application(self, app_name):
+        """Open an application from the launcher registry"""
+        if not app_name:
+            return "Which application should I open?"
+        self.actions.append(f"open {app_name}")
+        name, error = self.apps.launch(app_name, dry_run=self.dry_run)
+        return error or f"Opening {name}..."
+        
+    def close_application(self, app_name):
+        """Close a running application and its child processes"""
+        if not app_name:
+            return "Which application should I close?"
+        self.actions.append(f"close {app_name}")
+        name, count, error = self.apps.close(app_name, dry_run=self.dry_run)
+        if error:
+            return error
+        return f"Closed {name}." if count == 1 else f"Closed {name} ({count} processes)."
+        
+    def list_files(self, path):
+        """List files in a directory"""
+        try:
+            path = Path(path).expanduser()
+            if not path.exists():
+                return f"Path '{path}' doesn't exist."
+                
+            files = list(path.iterdir())[:10]  # Limit to 10 items
+            if not files:
+                return f"No files found in {path}"
+                
+            file_list = "\n".join([f"  • {f.name}" for f in files])
+            return f"Files in {path}:\n{file_list}\n(Showing first 10 items)"
+        except Exception as e:
+            return f"Error listing files: {str(e)}"
+            
+    def read_file(self, filepath):
+        """Read and display file contents (text files only)"""
+        try:
+            filepath = Path(filepath).expanduser()
+            if not filepath.exists():
+                return f"File '{filepath}' doesn't exist."
+                
+            # Anything over 1KB is too long to read aloud - summarize it instead
+            if filepath.stat().st_size > 1000:
+                return summarize_file(filepath)
+                
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+                
+            return f"Content of {filepath.name}:\n{content[:500]}"
+        except UnicodeDecodeError:
+            return "This appears to be a binary file. I can only read text files."
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+            
+    def find_files(self, query):
+        """Search the file index by name, then content"""
+        if not query:
+            return "What file should I look for?"
+        results = self.files.search(query, limit=5)
+        if not results:
+            if self.files.last_crawl is None:
+                return f"No matches for '{query}' yet - I'm still indexing your files."
+            return f"I couldn't find any files matching '{query}'."
+        lines = []
+        for r in results:
+            where = " (content match)" if r["match"] == "content" else ""
+            lines.append(f"  • {r['name']}{where}\n    {r['path']}")
+        return f"Files matching '{query}':\n" + "\n".join(lines)
+        
+    def get_system_info(self):
+        """Get system information from the latest background sample"""
+        return self.monitor.describe_latest()
+        
+    def list_running_processes(self):
+        """List the busiest processes from the latest background sample"""
+        return self.monitor.describe_processes()
+        
+    def get_help_text(self):
+        """Return help information"""
+        help_text = """I can help you with:
+
+🗣️ Voice Commands:
+  • "What time is it?"
+  • "What's the date?"
+  • "Open [notepad/calculator/browser]"
+  • "Close [application]"
+  • "Shutdown/Restart system"
+  • "Search [query]"
+  • "YouTube [search]"
+  
+📁 File Operations:
+  • "List files in [path]"
+  • "Read file [filepath]"
+  • "Find file [name or words in it]"
+  • "Summarize file [filepath]"
+  
+💻 System Info:
+  • "System info"
+  • "Running processes"
+  • "System trend [last 10 minutes]"
+  
+Just speak naturally or type your command!"""
+        
+        return help_text
+
+
+def load_script(path):
+    """Commands from a script: one per line, or the first column of a labeled .tsv"""
+    commands = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("\t")[0].strip()
+            if line and not line.startswith("#"):
+                commands.append(line)
+    return commands
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the voice assistant headless")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay", help="Replay a script of commands and report per-stage latency")
+    replay.add_argument("script")
+    replay.add_argument("--repeat", type=int, default=1, help="Run the script this many times")
+    replay.add_argument("--recognizer", default=None, help="vosk[:dir], whisper[:size] or google, for @file.wav lines")
+    replay.add_argument("--memory", default=None, help="Memory database (default: a scratch one)")
+    replay.add_argument("--live", action="store_true", help="Really launch apps, open the browser, etc.")
+    replay.add_argument("--quiet", action="store_true", help="Only print the latency report")
+    replay.add_argument("--max-p95-ms", type=float, default=None,
+                        help="Exit with status 1 if the p95 response time exceeds this")
+    args = parser.parse_args()
+
+    commands = load_script(args.script)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Scratch stores only: a replay must neither read nor change the user's real state.
+        # The monitor is never started - status questions take one sample on the spot
+        core = AssistantCore(
+            memory=MemoryStore(args.memory or os.path.join(tmp, "memory.db")),
+            monitor=SystemMonitor(),
+            files=FileIndex(os.path.join(tmp, "index.db"), roots=[]),
+            apps=AppRegistry(cache_path=os.path.join(tmp, "apps.json")).load(),
+            tts=SpeechWorker(engine_factory=SilentEngine),
+            dry_run=not args.live,
+        )
+        recognizer = None
+        samples = {stage: [] for stage in STAGES + ("total",)}
+
+        for _ in range(args.repeat):
+            for line in commands:
+                recognition = None
+                if line.startswith("@"):
+                    # Imported here so text-only scripts don't need numpy or a recognizer
+                    from assistant_speech import SpeechPipeline, WavSource, make_recognizer
+                    recognizer = recognizer or make_recognizer(args.recognizer)
+                    pipeline = SpeechPipeline(WavSource(line[1:]), recognizer)
+                    text = pipeline.listen_once(timeout=3600)
+                    # What the user waits for: speech end -> final transcript
+                    recognition = pipeline.stats.get("final_latency", 0.0)
+                    if not text:
+                        print(f"{line}: no speech recognized", file=sys.stderr)
+                        continue
+                else:
+                    text = line
+
+                response = core.process_command(text)
+                timings = dict(core.timings)
+                if recognition is not None:
+                    timings["recognition"] = recognition
+                for stage, seconds in timings.items():
+                    samples[stage].append(seconds)
+                samples["total"].append(sum(timings.values()))
+                if not args.quiet:
+                    actions = f"  [{'; '.join(core.actions)}]" if core.actions else ""
+                    first_line = (response or "(silent)").splitlines()[0]
+                    print(f"> {text}\n  {first_line}{actions}")
+        core.tts.close()
+        core.monitor.stop()
+
+    count = len(samples["total"])
+    if not count:
+        print("No commands were run.")
+        return
+    print(f"\n{count} commands{' (dry run)' if not args.live else ''}, latency in ms:")
+    print(f"  {'stage':<12}{'p50':>9}{'p95':>9}{'max':>9}")
+    for stage in STAGES + ("total",):
+        values = samples[stage]
+        if not values:
+            # e.g. no recorded audio in the script, or every command was silent
+            print(f"  {stage:<12}{'-':>9}{'-':>9}{'-':>9}")
+            continue
+        print(f"  {stage:<12}{percentile(values, 0.5) * 1000:9.3f}{percentile(values, 0.95) * 1000:9.3f}"
+              f"{max(values) * 1000:9.3f}")
+
+    p95 = percentile(samples["total"], 0.95) * 1000
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        print(f"FAIL: p95 response time {p95:.2f} ms exceeds {args.max_p95_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
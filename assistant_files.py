@@ -0,0 +1,347 @@
+"""
+File index for the AI Voice Assistant.
+
+An incremental crawler records every file under the indexed roots in SQLite:
+file names go into an FTS5 trigram index (substring and typo-tolerant name
+matches) and small text files into an FTS5 full-text index. Re-crawls
+compare size and mtime, so only new or changed files are re-read and
+deleted ones are dropped.
+
+"find file ..." looks names up first, exact substrings then trigram
+overlap, re-ranks the candidates by similarity and falls back to
+content matches. Large text files are summarized by streaming them line by
+line instead of being refused.
+
+    python assistant_files.py index ~/Documents ~/Projects
+    python assistant_files.py find "quarterly reprot"
+    python assistant_files.py summary ~/notes/meeting.md
+"""
+import argparse
+import collections
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from pathlib import Path
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_index.db")
+DEFAULT_ROOTS = [str(Path.home())]
+
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".cache",
+             ".tox", ".mypy_cache", ".pytest_cache", "site-packages", "AppData", "Library"}
+TEXT_EXTENSIONS = {".txt", ".md", ".rst", ".py", ".js", ".ts", ".html", ".css", ".json", ".csv", ".ini",
+                   ".cfg", ".toml", ".yaml", ".yml", ".xml", ".log", ".sh", ".bat", ".c", ".h", ".cpp",
+                   ".java", ".go", ".rs", ".sql", ".tex"}
+MAX_CONTENT_BYTES = 256 * 1024      # text indexed per file
+MAX_CONTENT_FILE = 4 * 1024 * 1024  # larger files are indexed by name only
+BATCH = 2000
+
+STOPWORDS = {"the", "a", "an", "my", "file", "files", "named", "called", "for", "about", "with", "of", "in",
+             "and", "or", "to", "is", "it", "that", "this", "on", "at", "be", "are", "was", "i", "you"}
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def query_words(query):
+    return [w for w in WORD_RE.findall(query.lower()) if w not in STOPWORDS]
+
+
+def fts_quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class FileIndex:
+    """SQLite FTS5 index of file names and text content"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, roots=None):
+        self.path = path
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in (DEFAULT_ROOTS if roots is None else roots)]
+        self._local = threading.local()
+        self.crawling = threading.Lock()
+        self.last_crawl = None
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # One connection per thread: the crawler writes while commands read
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL
+                )
+            """)
+            # rowid = files.id in both
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, tokenize='trigram')")
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS contents USING fts5(body, tokenize='porter unicode61')")
+
+    # --- Crawling ---
+
+    def walk(self, root):
+        """(path, name, size, mtime) for every file under root, skipping hidden and tool dirs"""
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(".") and entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        yield entry.path, entry.name, stat.st_size, stat.st_mtime
+                except OSError:
+                    continue
+
+    def _read_text(self, path, name, size):
+        if os.path.splitext(name)[1].lower() not in TEXT_EXTENSIONS or size > MAX_CONTENT_FILE:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return f.read(MAX_CONTENT_BYTES)
+        except OSError:
+            return None
+
+    def crawl(self, roots=None, on_progress=None):
+        """
+        Bring the index up to date with the file system. Unchanged files
+        (same size and mtime) cost one stat each; returns counts.
+        """
+        roots = [os.path.abspath(os.path.expanduser(r)) for r in (roots or self.roots)]
+        stats = collections.Counter()
+        start = time.perf_counter()
+        with self.crawling:
+            for root in roots:
+                prefix = root.rstrip(os.sep) + os.sep
+                with self._connect() as conn:
+                    known = {
+                        path: (file_id, size, mtime)
+                        for file_id, path, size, mtime in conn.execute(
+                            "SELECT id, path, size, mtime FROM files WHERE path >= ? AND path < ?",
+                            (prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+                        )
+                    }
+
+                pending = []
+                for entry in self.walk(root):
+                    path, name, size, mtime = entry
+                    stats["seen"] += 1
+                    old = known.pop(path, None)
+                    if old and old[1] == size and old[2] == mtime:
+                        continue
+                    pending.append((old[0] if old else None, entry))
+                    if len(pending) >= BATCH:
+                        self._write(pending, stats)
+                        pending = []
+                        if on_progress:
+                            on_progress(stats)
+                self._write(pending, stats)
+
+                # Whatever wasn't seen has been deleted or moved
+                removed = [file_id for file_id, _, _ in known.values()]
+                for i in range(0, len(removed), BATCH):
+                    chunk = [(file_id,) for file_id in removed[i:i + BATCH]]
+                    with self._connect() as conn:
+                        conn.executemany("DELETE FROM files WHERE id = ?", chunk)
+                        conn.executemany("DELETE FROM names WHERE rowid = ?", chunk)
+                        conn.executemany("DELETE FROM contents WHERE rowid = ?", chunk)
+                stats["removed"] += len(removed)
+
+        stats["seconds"] = time.perf_counter() - start
+        self.last_crawl = time.time()
+        return dict(stats)
+
+    def _write(self, pending, stats):
+        if not pending:
+            return
+        with self._connect() as conn:
+            for file_id, (path, name, size, mtime) in pending:
+                if file_id is None:
+                    file_id = conn.execute(
+                        "INSERT INTO files (path, name, size, mtime) VALUES (?, ?, ?, ?)", (path, name, size, mtime)
+                    ).lastrowid
+                    stats["added"] += 1
+                else:
+                    conn.execute("UPDATE files SET size = ?, mtime = ? WHERE id = ?", (size, mtime, file_id))
+                    conn.execute("DELETE FROM names WHERE rowid = ?", (file_id,))
+                    conn.execute("DELETE FROM contents WHERE rowid = ?", (file_id,))
+                    stats["updated"] += 1
+                conn.execute("INSERT INTO names (rowid, name) VALUES (?, ?)", (file_id, name))
+                text = self._read_text(path, name, size)
+                if text:
+                    conn.execute("INSERT INTO contents (rowid, body) VALUES (?, ?)", (file_id, text))
+                    stats["text"] += 1
+
+    def crawl_in_background(self, interval=None):
+        """Crawl on a daemon thread now, and every `interval` seconds if given"""
+        def run():
+            while True:
+                try:
+                    self.crawl()
+                except Exception as e:
+                    print(f"File index crawl failed: {e}")
+                if not interval:
+                    return
+                time.sleep(interval)
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    # --- Queries ---
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _name_candidates(self, conn, words, limit):
+        # Exact substrings of every word first; trigram overlap tolerates typos
+        long_words = [w for w in words if len(w) >= 3]
+        if not long_words:
+            pattern = "%" + "%".join(words) + "%"
+            return conn.execute(
+                "SELECT path, name, mtime FROM files WHERE name LIKE ? LIMIT ?", (pattern, limit)
+            ).fetchall()
+        rows = conn.execute(
+            "SELECT f.path, f.name, f.mtime FROM names JOIN files f ON f.id = names.rowid "
+            "WHERE names MATCH ? ORDER BY rank LIMIT ?",
+            (" AND ".join(fts_quote(w) for w in long_words), limit)
+        ).fetchall()
+        if len(rows) < limit:
+            # Typos: every word must share a trigram with the name, then any trigram at all
+            groups = ["(" + " OR ".join(fts_quote(w[i:i + 3]) for i in range(len(w) - 2)) + ")" for w in long_words]
+            seen = {row[0] for row in rows}
+            for match in (" AND ".join(groups), " OR ".join(groups)):
+                rows += [row for row in conn.execute(
+                    "SELECT f.path, f.name, f.mtime FROM names JOIN files f ON f.id = names.rowid "
+                    "WHERE names MATCH ? ORDER BY rank LIMIT ?",
+                    (match, limit)
+                ) if row[0] not in seen]
+                seen.update(row[0] for row in rows)
+                if len(rows) >= limit or len(groups) == 1:
+                    break
+        return rows
+
+    def search(self, query, limit=10, candidates=200):
+        """
+        Best matching files: [{"path", "name", "score", "match"}] where match
+        is "name" or "content".
+        """
+        words = query_words(query)
+        if not words:
+            return []
+        target = " ".join(words)
+        now = time.time()
+        with self._connect() as conn:
+            rows = self._name_candidates(conn, words, candidates)
+
+            results = []
+            for path, name, mtime in rows:
+                stem = os.path.splitext(name)[0].lower()
+                contained = sum(w in name.lower() for w in words) / len(words)
+                similarity = SequenceMatcher(None, target, stem).ratio()
+                # Recently modified files edge out stale copies with the same name
+                recency = 0.05 / (1 + (now - mtime) / 86400 / 30)
+                results.append({"path": path, "name": name, "score": contained + similarity + recency, "match": "name"})
+            results.sort(key=lambda r: r["score"], reverse=True)
+            results = [r for r in results if r["score"] >= 0.6][:limit]
+
+            if len(results) < limit:
+                known = {r["path"] for r in results}
+                for path, name, snippet in conn.execute(
+                    "SELECT f.path, f.name, snippet(contents, 0, '[', ']', '...', 8) FROM contents "
+                    "JOIN files f ON f.id = contents.rowid WHERE contents MATCH ? ORDER BY rank LIMIT ?",
+                    (" OR ".join(fts_quote(w) for w in words), limit)
+                ):
+                    if path not in known and len(results) < limit:
+                        results.append({"path": path, "name": name, "score": 0.0, "match": "content",
+                                        "snippet": snippet})
+        return results
+
+
+def summarize_file(path, head_lines=5, top_words=8):
+    """
+    Describe a text file of any size by streaming it once: size, line and
+    word counts, the opening lines, outline entries (headings, def/class)
+    and the most frequent words.
+    """
+    path = Path(path).expanduser()
+    lines = words = 0
+    head, outline = [], []
+    counter = collections.Counter()
+    with open(path, "r", encoding="utf-8", errors="strict") as f:
+        for line in f:
+            lines += 1
+            stripped = line.strip()
+            if stripped and len(head) < head_lines:
+                head.append(stripped[:120])
+            if len(outline) < 10 and (stripped.startswith("#") or stripped.startswith(("def ", "class "))):
+                outline.append(stripped[:80])
+            tokens = WORD_RE.findall(line.lower())
+            words += len(tokens)
+            counter.update(t for t in tokens if len(t) > 3 and t not in STOPWORDS)
+
+    size = path.stat().st_size
+    summary = [f"{path.name}: {size:,} bytes, {lines:,} lines, {words:,} words."]
+    if head:
+        summary.append("It starts with:\n" + "\n".join(f"  {line}" for line in head))
+    if outline:
+        summary.append("Outline:\n" + "\n".join(f"  • {line}" for line in outline))
+    if counter:
+        summary.append("Frequent words: " + ", ".join(w for w, _ in counter.most_common(top_words)))
+    return "\n".join(summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant file index")
+    parser.add_argument("--db", default=DEFAULT_INDEX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    idx = sub.add_parser("index", help="Crawl roots into the index (incremental)")
+    idx.add_argument("roots", nargs="*", default=DEFAULT_ROOTS)
+    find = sub.add_parser("find", help="Search file names and contents")
+    find.add_argument("query", nargs="+")
+    find.add_argument("--limit", type=int, default=10)
+    summ = sub.add_parser("summary", help="Stream-summarize a text file")
+    summ.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        print(summarize_file(args.path))
+        return
+
+    index = FileIndex(args.db)
+    if args.command == "index":
+        stats = index.crawl(args.roots)
+        print(f"Indexed {stats.get('seen', 0):,} files in {stats['seconds']:.1f}s: "
+              f"{stats.get('added', 0):,} added, {stats.get('updated', 0):,} updated, "
+              f"{stats.get('removed', 0):,} removed, {stats.get('text', 0):,} with text")
+    else:
+        start = time.perf_counter()
+        results = index.search(" ".join(args.query), args.limit)
+        elapsed = time.perf_counter() - start
+        for r in results:
+            print(f"{r['score']:5.2f}  {r['match']:<7}  {r['path']}")
+        print(f"{len(results)} results from {index.count():,} files in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
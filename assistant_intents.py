@@ -0,0 +1,282 @@
+"""
+Intent router for the AI Voice Assistant.
+
+Intents are declared in the INTENTS table. Each one has trigger phrases and an
+optional slot pattern. The phrases are compiled into an index keyed on their
+first token. An utterance is tokenized once, and every position looks up the
+phrases that can start there, so all intents are scored in a single pass. The
+order of the table no longer decides the answer. Longer and more specific
+phrases outscore short ones, and the table order only breaks exact ties.
+
+    python assistant_intents.py route "open the calculator"
+    python assistant_intents.py eval
+    python assistant_intents.py bench --utterances 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+# Labeled utterances used by `eval` and `bench`: utterance <TAB> intent [<TAB> slot=value;...]
+SAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_intents.tsv")
+
+FALLBACK = "fallback"
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# name: intent id
+# phrases: trigger phrases; a phrase scores its token count x weight
+# weight: multiplier for every phrase of the intent (default 1.0)
+# anchored: phrases only count at the start of the utterance
+# max_tokens: ignore the intent for utterances longer than this
+# requires: at least one of these tokens must also appear somewhere
+# slots: regex with named groups, searched case-insensitively on the original text
+# needs: slots that must be filled for the intent to count
+# rejects: slot -> values that disqualify the intent ("call me later" is not a name)
+NOT_NAMES = {"a", "an", "the", "back", "later", "tomorrow", "tonight", "now", "soon", "again", "when", "if",
+             "maybe", "sometime", "anytime", "not"}
+INTENTS = [
+    {"name": "stop_talking", "phrases": ["stop talking", "stop speaking", "be quiet", "shut up", "quiet",
+                                         "silence", "stop", "enough"], "weight": 2, "max_tokens": 4},
+    {"name": "set_name", "phrases": ["my name is", "call me"], "weight": 1.5,
+     "slots": r"(?:my name is|call me)\s+(?P<name>[\w'-]+)", "rejects": {"name": NOT_NAMES}},
+    # "i'm <word>" is usually a state ("i'm cooking"), so it only names the user when the word is capitalised
+    {"name": "set_name", "phrases": ["i am", "i'm", "im"], "anchored": True, "max_tokens": 3,
+     "slots": r"(?:i am|i'm|im)\s+(?P<name>(?-i:[A-Z])[\w'-]*)", "needs": ["name"]},
+    {"name": "remember", "phrases": ["remember", "remember that", "note that", "don't forget", "make a note",
+                                     "remind me to"],
+     "slots": r"(?:remind me|remember|note|don't forget|make a note)(?:\s+that)?(?:\s+to)?\s+(?P<fact>.+)"},
+    {"name": "recall", "phrases": ["what did i say", "what do you remember", "remind me", "what did i tell you"],
+     "weight": 1.2, "slots": r"(?:about|regarding)\s+(?P<topic>.+)"},
+    {"name": "greeting", "phrases": ["hello", "hi", "hey", "good morning", "good evening", "good afternoon"]},
+    {"name": "time", "phrases": ["time", "what time", "the time", "what's the time"], "weight": 1.5},
+    {"name": "date", "phrases": ["date", "today", "what day", "the date", "today's date"], "weight": 1.2},
+    {"name": "open_app", "phrases": ["open", "launch", "start"],
+     "slots": r"(?:open|launch|start)\s+(?:up\s+)?(?:the\s+|a\s+|my\s+)?(?P<app>.+)"},
+    {"name": "close_app", "phrases": ["close", "kill", "quit", "exit", "terminate"],
+     "slots": r"(?:close|kill|quit|exit|terminate)\s+(?:the\s+|my\s+)?(?P<app>.+)"},
+    {"name": "shutdown", "phrases": ["shutdown", "shut down", "power off", "turn off the computer"], "weight": 1.5},
+    {"name": "restart", "phrases": ["restart", "reboot"], "weight": 1.5},
+    {"name": "cancel_shutdown", "phrases": ["cancel", "abort", "stop"], "weight": 4,
+     "requires": ["shutdown", "restart", "reboot"]},
+    {"name": "search", "phrases": ["search", "search for", "google", "look up", "search the web for"],
+     "slots": r"(?:search(?: the web)?(?: for)?|google|look up)\s+(?P<query>.+)"},
+    {"name": "youtube", "phrases": ["youtube", "on youtube"], "weight": 1.5,
+     "slots": r"youtube(?:\s+for)?\s+(?P<query>.+)|(?:search(?:\s+for)?|play|find)\s+(?P<query2>.+?)\s+on youtube"},
+    {"name": "list_files", "phrases": ["list files", "show files", "list directory", "show directory",
+                                       "what files", "list the files"],
+     "weight": 1.5, "slots": r"(?:files|directory)(?:\s+(?:are\s+)?(?:in|of|under))?\s+(?P<path>\S.*)"},
+    {"name": "read_file", "phrases": ["read file", "open file", "read the file", "show file"], "weight": 1.5,
+     "slots": r"file\s+(?P<path>\S.*)"},
+    {"name": "find_file", "phrases": ["find file", "find files", "find my", "find the file", "search files",
+                                      "search my files", "where is the file", "where is my", "locate"], "weight": 2,
+     "slots": r"(?:find|search|locate|where is)(?:\s+(?:my|the|a))?(?:\s+files?)?"
+              r"(?:\s+(?:named|called|for|about|containing|with))?\s+(?P<query>.+)"},
+    {"name": "summarize_file", "phrases": ["summarize", "summarise", "summary of"], "weight": 2,
+     "slots": r"(?:summari[sz]e|summary of)(?:\s+(?:the|my))?(?:\s+file)?\s+(?P<path>\S.*)"},
+    {"name": "system_info", "phrases": ["system info", "system status", "system information", "cpu usage",
+                                        "memory usage", "disk usage", "how is my computer", "how much memory",
+                                        "how much cpu", "how much disk"],
+     "weight": 1.5},
+    {"name": "system_trend", "phrases": ["system trend", "cpu trend", "memory trend", "performance trend",
+                                         "system history", "trend"], "weight": 2,
+     "slots": r"(?:last|past)\s+(?P<minutes>\d+)\s+min"},
+    {"name": "processes", "phrases": ["running processes", "process list", "list processes", "processes",
+                                      "what's running", "top processes"]},
+    {"name": "thanks", "phrases": ["thank", "thanks", "thank you", "appreciate"]},
+    {"name": "goodbye", "phrases": ["bye", "goodbye", "see you", "good night"]},
+    {"name": "how_are_you", "phrases": ["how are you", "how's it going", "how are things"], "weight": 1.2},
+    {"name": "identity", "phrases": ["who are you", "what are you", "your name"], "weight": 1.2},
+    {"name": "help", "phrases": ["help", "what can you do", "commands"]},
+    {"name": "question", "phrases": ["why", "how", "what", "what's", "when", "where", "who"], "anchored": True,
+     "weight": 0.5},
+]
+
+# Only consulted while a yes/no question is pending
+CONFIRMATION_INTENTS = [
+    {"name": "stop_talking", "phrases": ["stop talking", "stop speaking", "be quiet", "shut up", "quiet",
+                                         "silence", "stop", "enough"], "weight": 2, "max_tokens": 4},
+    {"name": "confirm", "phrases": ["yes", "yeah", "yep", "sure", "ok", "okay", "confirm", "do it", "go ahead"]},
+    {"name": "deny", "phrases": ["no", "nope", "cancel", "don't", "stop", "never mind"], "weight": 1.1},
+]
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower().replace("’", "'"))
+
+
+class IntentRouter:
+    """Table-driven intent classifier and slot extractor"""
+
+    def __init__(self, intents=INTENTS):
+        self.intents = list(intents)
+        self._compile()
+
+    def _compile(self):
+        # first token -> [(phrase tokens, intent index, score)]
+        self.index = {}
+        for i, intent in enumerate(self.intents):
+            weight = intent.get("weight", 1.0)
+            for phrase in intent["phrases"]:
+                tokens = tuple(tokenize(phrase))
+                self.index.setdefault(tokens[0], []).append((tokens, i, len(tokens) * weight))
+        self.slot_patterns = [
+            re.compile(intent["slots"], re.IGNORECASE) if intent.get("slots") else None
+            for intent in self.intents
+        ]
+        self.requires = [set(intent.get("requires", ())) for intent in self.intents]
+        self.needs = [intent.get("needs", ()) for intent in self.intents]
+        self.rejects = [
+            {slot: {v.lower() for v in values} for slot, values in intent.get("rejects", {}).items()}
+            for intent in self.intents
+        ]
+
+    def add(self, intent):
+        """Register one more intent (e.g. from a plugin) and rebuild the index"""
+        self.intents.append(intent)
+        self._compile()
+
+    def scores(self, tokens):
+        """Best phrase score per intent index for a tokenized utterance"""
+        best = {}
+        tokens = tuple(tokens)
+        n = len(tokens)
+        for position, token in enumerate(tokens):
+            for phrase, i, score in self.index.get(token, ()):
+                if len(phrase) > 1 and tokens[position:position + len(phrase)] != phrase:
+                    continue
+                intent = self.intents[i]
+                if intent.get("anchored") and position != 0:
+                    continue
+                if n > intent.get("max_tokens", n):
+                    continue
+                # Tie-break towards the start of the utterance, where the command usually is
+                score += 0.01 * (n - position) / n
+                if score > best.get(i, 0.0):
+                    best[i] = score
+        if best and any(self.requires):
+            present = set(tokens)
+            best = {i: s for i, s in best.items() if not self.requires[i] or self.requires[i] & present}
+        return best
+
+    def route(self, text):
+        """
+        Classify one utterance: {"intent", "score", "slots"}.
+        Unmatched text routes to FALLBACK with score 0.
+        """
+        tokens = tokenize(text)
+        best = self.scores(tokens)
+        if not best:
+            return {"intent": FALLBACK, "score": 0.0, "slots": {}}
+
+        # Highest score wins, earlier table entries win exact ties. An intent missing
+        # a needed slot, or whose slot holds a rejected value, steps aside for the next best
+        for i in sorted(best, key=lambda k: (-best[k], k)):
+            slots = self.extract_slots(i, text)
+            if any(slot not in slots for slot in self.needs[i]):
+                continue
+            if any(slots.get(slot, "").lower() in values for slot, values in self.rejects[i].items()):
+                continue
+            return {"intent": self.intents[i]["name"], "score": best[i], "slots": slots}
+        return {"intent": FALLBACK, "score": 0.0, "slots": {}}
+
+    def extract_slots(self, i, text):
+        pattern = self.slot_patterns[i]
+        if pattern is None:
+            return {}
+        match = pattern.search(text)
+        if not match:
+            return {}
+        slots = {}
+        for key, value in match.groupdict().items():
+            if value:
+                # Alternative groups (query2) fill the same slot
+                slots.setdefault(key.rstrip("0123456789"), value.strip(" ?.!,"))
+        return slots
+
+
+def load_samples(path=SAMPLES_PATH):
+    """[(utterance, intent, {slot: value})] from the labeled TSV"""
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split("\t")
+            slots = {}
+            if len(parts) > 2 and parts[2]:
+                slots = dict(pair.split("=", 1) for pair in parts[2].split(";"))
+            samples.append((parts[0], parts[1], slots))
+    return samples
+
+
+def evaluate(router, samples):
+    """Intent accuracy, slot accuracy and the misroutes"""
+    intent_hits = slot_hits = slot_total = 0
+    errors = []
+    for text, intent, slots in samples:
+        route = router.route(text)
+        if route["intent"] == intent:
+            intent_hits += 1
+        else:
+            errors.append((text, intent, route["intent"]))
+        for key, value in slots.items():
+            slot_total += 1
+            if route["slots"].get(key, "").lower() == value.lower():
+                slot_hits += 1
+            elif route["intent"] == intent:
+                errors.append((text, f"{key}={value}", f"{key}={route['slots'].get(key)}"))
+    return {
+        "samples": len(samples),
+        "intent_accuracy": intent_hits / len(samples) if samples else float("nan"),
+        "slot_accuracy": slot_hits / slot_total if slot_total else float("nan"),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant intent router")
+    sub = parser.add_subparsers(dest="command", required=True)
+    route = sub.add_parser("route", help="Route one utterance")
+    route.add_argument("text", nargs="+")
+    ev = sub.add_parser("eval", help="Accuracy on the labeled set")
+    ev.add_argument("--samples", default=SAMPLES_PATH)
+    bench = sub.add_parser("bench", help="Routing throughput")
+    bench.add_argument("--samples", default=SAMPLES_PATH)
+    bench.add_argument("--utterances", type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    router = IntentRouter()
+    build = time.perf_counter() - start
+
+    if args.command == "route":
+        print(router.route(" ".join(args.text)))
+        return
+
+    samples = load_samples(args.samples)
+    if args.command == "eval":
+        result = evaluate(router, samples)
+        print(f"{result['samples']} samples: intent accuracy {result['intent_accuracy'] * 100:.1f}%, "
+              f"slot accuracy {result['slot_accuracy'] * 100:.1f}%")
+        for text, expected, got in result["errors"]:
+            print(f"  {text!r}: expected {expected}, got {got}")
+        sys.exit(1 if result["errors"] else 0)
+
+    texts = [text for text, _, _ in samples]
+    texts = (texts * (args.utterances // len(texts) + 1))[:args.utterances]
+    router.route(texts[0])  # warm up the regex cache
+    start = time.perf_counter()
+    for text in texts:
+        router.route(text)
+    elapsed = time.perf_counter() - start
+    print(f"Router: {len(router.intents)} intents, {sum(map(len, router.index.values()))} phrases, "
+          f"built in {build * 1000:.2f} ms")
+    print(f"  {len(texts):,} utterances in {elapsed * 1000:.1f} ms: {len(texts) / elapsed:,.0f} utterances/s, "
+          f"{elapsed / len(texts) * 1e6:.1f} us each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Persistent conversation memory for the AI Voice Assistant.
+
+Every exchange and every remembered fact is appended to a SQLite table, with
+an FTS5 inverted index kept in step by an insert trigger. Nothing is updated
+in place. Retrieval runs in bounded time however large the history gets: the
+index is walked newest-first for at most `window` matching entries, which
+FTS5 does without touching the rest of the doclist. Only that window is
+ranked by relevance and recency.
+
+    python assistant_memory.py search "dentist appointment"
+    python assistant_memory.py bench --entries 1000000
+"""
+import argparse
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+DEFAULT_MEMORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_memory.db")
+
+STOPWORDS = {"the", "a", "an", "my", "i", "me", "you", "your", "it", "is", "was", "are", "to", "of", "in",
+             "on", "at", "for", "and", "or", "that", "this", "what", "did", "do", "say", "said", "about",
+             "tell", "told", "remember", "remind", "be", "with", "we", "our"}
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Roles stored in the log
+USER, ASSISTANT, FACT = "user", "assistant", "fact"
+
+
+class MemoryStore:
+    """Append-only log of exchanges and facts with full-text retrieval"""
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH, session=None):
+        self.path = path
+        self.session = session or uuid.uuid4().hex[:12]
+        self._local = threading.local()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # One connection per thread: voice commands are handled off the Tk thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    session TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    text TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_role ON entries (role, id)")
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    text, content='entries', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+            # Append-only, so inserts are the only thing the index has to follow
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_fts (rowid, text) VALUES (new.id, new.text);
+                END
+            """)
+
+    def add(self, role, text, ts=None):
+        """Append one entry; returns its id"""
+        with self._connect() as conn:
+            return conn.execute(
+                "INSERT INTO entries (ts, session, role, text) VALUES (?, ?, ?, ?)",
+                (ts or time.time(), self.session, role, text)
+            ).lastrowid
+
+    def remember(self, fact):
+        return self.add(FACT, fact)
+
+    def recent(self, limit=5, role=None):
+        """Newest entries first, optionally of one role"""
+        with self._connect() as conn:
+            if role:
+                rows = conn.execute(
+                    "SELECT id, ts, session, role, text FROM entries WHERE role = ? ORDER BY id DESC LIMIT ?",
+                    (role, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT id, ts, session, role, text FROM entries ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT MAX(id) FROM entries").fetchone()[0] or 0
+
+    @staticmethod
+    def _row(row, score=None):
+        entry = {"id": row[0], "ts": row[1], "session": row[2], "role": row[3], "text": row[4]}
+        if score is not None:
+            entry["score"] = score
+        return entry
+
+    def search(self, query, limit=5, roles=None, window=500, exclude=()):
+        """
+        Entries relevant to `query`, best first. At most `window` of the newest
+        matching entries are considered, which keeps the cost bounded. Roles and
+        exclusions are applied in SQL before that cut, so a flood of assistant
+        replies can't push an old fact out of reach.
+        """
+        words = [w for w in WORD_RE.findall(query.lower()) if w not in STOPWORDS]
+        if not words:
+            return []
+        # Plain terms - the porter tokenizer already folds plurals; prefix queries can expand to thousands of terms
+        match = " OR ".join(f'"{w}"' for w in words)
+
+        sql = ("SELECT e.id, e.ts, e.session, e.role, e.text, bm25(entries_fts) FROM entries_fts "
+               "JOIN entries e ON e.id = entries_fts.rowid WHERE entries_fts MATCH ?")
+        params = [match]
+        if roles:
+            sql += f" AND e.role IN ({', '.join('?' * len(roles))})"
+            params.extend(roles)
+        exclude = [i for i in exclude if i is not None]
+        if exclude:
+            sql += f" AND e.id NOT IN ({', '.join('?' * len(exclude))})"
+            params.extend(exclude)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY entries_fts.rowid DESC LIMIT ?", (*params, window)).fetchall()
+
+        now = time.time()
+        results = []
+        for row in rows:
+            relevance = -row[5]                              # bm25: lower is better
+            age_days = max(now - row[1], 0) / 86400
+            recency = 1 / (1 + math.log1p(age_days))
+            bonus = 0.5 if row[3] == FACT else 0.0
+            results.append(self._row(row[:5], relevance + recency + bonus))
+        results.sort(key=lambda e: e["score"], reverse=True)
+        return results[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant memory store")
+    parser.add_argument("--db", default=DEFAULT_MEMORY_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    search = sub.add_parser("search", help="Search the memory")
+    search.add_argument("query", nargs="+")
+    bench = sub.add_parser("bench", help="Fill a scratch store and time retrieval")
+    bench.add_argument("--entries", type=int, default=200_000)
+    bench.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.command == "search":
+        store = MemoryStore(args.db)
+        for entry in store.search(" ".join(args.query), limit=10):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["ts"]))
+            print(f"{entry['score']:6.2f}  {when}  {entry['role']:<9} {entry['text']}")
+        return
+
+    import random
+    import tempfile
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(20_000)] + ["dentist", "paris", "budget", "birthday", "project"]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "bench.db"))
+        start = time.perf_counter()
+        now = time.time()
+        for offset in range(0, args.entries, 10_000):
+            n = min(10_000, args.entries - offset)
+            rows = [
+                (now - (args.entries - offset - i) * 60, store.session, rng.choice((USER, ASSISTANT, FACT)),
+                 " ".join(rng.choices(vocabulary, k=12)))
+                for i in range(n)
+            ]
+            with store._connect() as conn:
+                conn.executemany("INSERT INTO entries (ts, session, role, text) VALUES (?, ?, ?, ?)", rows)
+        fill = time.perf_counter() - start
+
+        queries = ["dentist", "paris budget", "birthday project", "word17 word4242", "word1"]
+        timings = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            store.search(queries[i % len(queries)])
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"Memory: {args.entries:,} entries inserted in {fill:.1f}s "
+              f"({args.entries / fill:,.0f}/s), db {os.path.getsize(store.path) / 1e6:.0f} MB")
+        print(f"  search : median {timings[len(timings) // 2] * 1000:.2f} ms, "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1000:.2f} ms over {args.queries} queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+"""
+Streaming speech recognition for the AI Voice Assistant.
+
+Audio comes from one persistent capture stream of 16 kHz mono int16 frames
+(30 ms each). An energy voice-activity detector with an adaptive noise floor
+cuts the stream into utterances, so there is no per-command ambient-noise
+calibration. Speech frames go to a pluggable recognizer backend as they
+arrive. Backends with streaming support report partial text while the user
+is still talking.
+
+Backends are chosen with a spec string (see make_recognizer):
+    vosk:<model dir>     offline, streaming partials
+    whisper:<size>       offline (faster-whisper), partials by re-decoding
+    google               online, final text only (the original behaviour)
+
+Everything runs against WAV files as well as a microphone:
+
+    python assistant_speech.py transcribe command.wav --recognizer vosk:models/vosk-en
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import threading
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+RECOGNIZER_ENV_VAR = "ASSISTANT_RECOGNIZER"
+DEFAULT_VOSK_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "vosk")
+
+
+# --- Audio sources: iterables of FRAME_SAMPLES int16 frames as bytes ---
+
+class WavSource:
+    """Frames from a WAV file, converted to 16 kHz mono. `realtime` paces them like a microphone."""
+
+    def __init__(self, path, realtime=False):
+        self.path = path
+        self.realtime = realtime
+
+    def read(self):
+        """The whole file as int16 samples at SAMPLE_RATE"""
+        with wave.open(self.path, "rb") as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+        if width != 2:
+            raise ValueError(f"{self.path}: only 16-bit PCM WAV files are supported")
+        samples = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels).mean(axis=1)
+        if rate != SAMPLE_RATE:
+            # Linear resampling is plenty for speech recognizers
+            n = int(len(samples) * SAMPLE_RATE / rate)
+            samples = np.interp(np.linspace(0, len(samples) - 1, n), np.arange(len(samples)), samples)
+        return samples.astype(np.int16)
+
+    def frames(self):
+        samples = self.read()
+        period = FRAME_MS / 1000
+        for start in range(0, len(samples) - FRAME_SAMPLES + 1, FRAME_SAMPLES):
+            if self.realtime:
+                time.sleep(period)
+            yield samples[start:start + FRAME_SAMPLES].tobytes()
+
+    def close(self):
+        pass
+
+
+class MicrophoneSource:
+    """
+    One long-lived PyAudio input stream. A reader thread keeps the most recent
+    `buffer_seconds` of frames in a ring buffer, so listeners can start at any
+    time without reopening the device, and a little audio from just before
+    they started is still available. Frames pushed out of a full ring are
+    counted in `overruns`; reserve() grows the ring for a longer listen.
+    """
+
+    def __init__(self, buffer_seconds=3.0, device_index=None):
+        self.device_index = device_index
+        self.buffer = collections.deque(maxlen=int(buffer_seconds * 1000 / FRAME_MS))
+        self.overruns = 0
+        self.ready = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.stream = None
+        self.audio = None
+
+    def start(self):
+        if self.running:
+            return
+        # Imported lazily so WAV/headless use doesn't need PyAudio
+        import pyaudio
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16, channels=1, rate=SAMPLE_RATE, input=True,
+            frames_per_buffer=FRAME_SAMPLES, input_device_index=self.device_index
+        )
+        self.running = True
+        self.thread = threading.Thread(target=self._capture)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _capture(self):
+        while self.running:
+            try:
+                frame = self.stream.read(FRAME_SAMPLES, exception_on_overflow=False)
+            except OSError:
+                continue
+            with self.ready:
+                if len(self.buffer) == self.buffer.maxlen:
+                    # The reader has fallen a whole ring behind: the oldest frame is lost
+                    self.overruns += 1
+                self.buffer.append(frame)
+                self.ready.notify_all()
+
+    def reserve(self, seconds):
+        """Make the ring hold at least `seconds` of audio (it never shrinks)"""
+        frames = int(seconds * 1000 / FRAME_MS)
+        with self.ready:
+            if frames > self.buffer.maxlen:
+                self.buffer = collections.deque(self.buffer, maxlen=frames)
+
+    def flush(self, keep=0):
+        """Drop buffered audio except the newest `keep` frames"""
+        with self.ready:
+            while len(self.buffer) > keep:
+                self.buffer.popleft()
+
+    def frames(self):
+        self.start()
+        while self.running:
+            with self.ready:
+                while not self.buffer and self.running:
+                    self.ready.wait(0.5)
+                if not self.buffer:
+                    continue
+                frame = self.buffer.popleft()
+            yield frame
+
+    def close(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+        if self.audio:
+            self.audio.terminate()
+        self.thread = self.stream = self.audio = None
+
+
+# --- Voice activity detection ---
+
+def frame_energy(frame):
+    """RMS level of an int16 frame in dBFS"""
+    samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+    rms = np.sqrt(np.mean(samples * samples)) if len(samples) else 0.0
+    return 20 * np.log10(max(rms, 1.0) / 32768)
+
+
+class EnergyVAD:
+    """
+    Speech/silence per frame from its energy relative to a running noise floor.
+    The floor follows quiet audio quickly and creeps up under steady noise, so
+    it keeps itself calibrated - no ambient-noise pause before each command.
+    """
+
+    def __init__(self, margin_db=10.0, min_speech_db=-50.0, adapt=0.05, creep=0.002):
+        self.margin_db = margin_db
+        self.min_speech_db = min_speech_db
+        self.adapt = adapt
+        self.creep = creep
+        self.floor_db = None
+
+    def is_speech(self, frame):
+        level = frame_energy(frame)
+        if self.floor_db is None:
+            # Seed from the first frame - the stream opens on background noise
+            self.floor_db = level
+        speech = level > max(self.floor_db + self.margin_db, self.min_speech_db)
+        if level < self.floor_db:
+            self.floor_db += 0.5 * (level - self.floor_db)
+        else:
+            self.floor_db += (self.creep if speech else self.adapt) * (level - self.floor_db)
+        return speech
+
+
+class WebRtcVAD:
+    """webrtcvad's GMM detector, if installed - more robust to music and fans"""
+
+    def __init__(self, aggressiveness=2):
+        import webrtcvad
+        self.vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame):
+        return self.vad.is_speech(frame, SAMPLE_RATE)
+
+
+def make_vad():
+    try:
+        return WebRtcVAD()
+    except ImportError:
+        return EnergyVAD()
+
+
+# --- Recognizer backends ---
+
+class SpeechBackend:
+    """Base class: feed frames of one utterance, get partial and final text"""
+    name = "base"
+    streaming = False
+
+    def reset(self):
+        """Start a new utterance"""
+
+    def accept(self, frame):
+        """Feed one frame; return partial text if the backend has a new hypothesis, else None"""
+        return None
+
+    def finish(self):
+        """End of utterance: return the final text ("" if nothing was understood)"""
+        raise NotImplementedError
+
+
+class VoskBackend(SpeechBackend):
+    """Offline Kaldi models via vosk - true streaming partials"""
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path=DEFAULT_VOSK_MODEL):
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        self.recognizer = KaldiRecognizer(self.model, SAMPLE_RATE)
+        self.last_partial = ""
+        self.text = []
+
+    def reset(self):
+        self.recognizer.Reset()
+        self.last_partial = ""
+        self.text = []
+
+    def accept(self, frame):
+        if self.recognizer.AcceptWaveform(frame):
+            # Vosk closed a segment mid-utterance; keep it and carry on
+            self.text.append(json.loads(self.recognizer.Result()).get("text", ""))
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        hypothesis = " ".join(t for t in self.text + [partial] if t)
+        if hypothesis and hypothesis != self.last_partial:
+            self.last_partial = hypothesis
+            return hypothesis
+        return None
+
+    def finish(self):
+        self.text.append(json.loads(self.recognizer.FinalResult()).get("text", ""))
+        return " ".join(t for t in self.text if t)
+
+
+class WhisperBackend(SpeechBackend):
+    """
+    Offline Whisper via faster-whisper.  Whisper isn't streaming, so partials
+    come from re-decoding the audio so far every `partial_every` seconds.
+    """
+    name = "whisper"
+    streaming = True
+
+    def __init__(self, size="base.en", partial_every=1.0):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(size, device="cpu", compute_type="int8")
+        self.partial_frames = int(partial_every * 1000 / FRAME_MS)
+        self.frames = []
+
+    def _decode(self):
+        audio = np.frombuffer(b"".join(self.frames), dtype=np.int16).astype(np.float32) / 32768
+        segments, _ = self.model.transcribe(audio, language="en", beam_size=1, vad_filter=False)
+        return "".join(segment.text for segment in segments).strip()
+
+    def reset(self):
+        self.frames = []
+
+    def accept(self, frame):
+        self.frames.append(frame)
+        if self.partial_frames and len(self.frames) % self.partial_frames == 0:
+            return self._decode() or None
+        return None
+
+    def finish(self):
+        return self._decode() if self.frames else ""
+
+
+class GoogleBackend(SpeechBackend):
+    """The Google Web Speech API through speech_recognition - needs network, no partials"""
+    name = "google"
+
+    def __init__(self):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self.frames = []
+
+    def reset(self):
+        self.frames = []
+
+    def accept(self, frame):
+        self.frames.append(frame)
+        return None
+
+    def finish(self):
+        audio = self.sr.AudioData(b"".join(self.frames), SAMPLE_RATE, 2)
+        try:
+            return self.recognizer.recognize_google(audio)
+        except self.sr.UnknownValueError:
+            return ""
+        except self.sr.RequestError as e:
+            raise RuntimeError("Speech recognition service unavailable.") from e
+
+
+def make_recognizer(spec=None):
+    """
+    Build a backend from a spec string: "vosk[:<model dir>]", "whisper[:<size>]"
+    or "google".  Falls back to ASSISTANT_RECOGNIZER, then to vosk if a model
+    is installed under models/vosk, then google.
+    """
+    spec = spec or os.environ.get(RECOGNIZER_ENV_VAR)
+    if not spec:
+        spec = "vosk" if os.path.isdir(DEFAULT_VOSK_MODEL) else "google"
+    name, _, arg = spec.partition(":")
+    if name == "vosk":
+        return VoskBackend(arg or DEFAULT_VOSK_MODEL)
+    if name == "whisper":
+        return WhisperBackend(arg or "base.en")
+    if name == "google":
+        return GoogleBackend()
+    raise ValueError(f"Unknown speech recognizer: {spec}")
+
+
+# --- Pipeline ---
+
+class SpeechPipeline:
+    """Source -> VAD -> recognizer, one utterance at a time"""
+
+    def __init__(self, source, recognizer, vad=None, preroll_ms=300, hangover_ms=600, min_speech_ms=150):
+        self.source = source
+        self.recognizer = recognizer
+        self.vad = vad or make_vad()
+        self.preroll = int(preroll_ms / FRAME_MS)
+        self.hangover = int(hangover_ms / FRAME_MS)
+        self.min_speech = int(min_speech_ms / FRAME_MS)
+        self.frames = None
+        self.stats = {}
+
+    def _frames(self):
+        # One generator for the pipeline's lifetime - the stream stays open between commands
+        if self.frames is None:
+            self.frames = iter(self.source.frames())
+        return self.frames
+
+    def stream(self):
+        """The live frame iterator, for a wake-word detector to read between commands"""
+        return self._frames()
+
+    def listen_once(self, timeout=5.0, phrase_time_limit=10.0, on_partial=None, stop=None, flush=True):
+        """
+        Wait up to `timeout` seconds for speech, then recognize until a pause.
+        Returns the final text, "" if speech wasn't understood, or None if
+        nobody spoke (or `stop` was set). Latencies, and frames the source
+        dropped because we fell behind, are left in self.stats. Pass
+        flush=False to pick up where another reader of the stream (the wake
+        word detector) stopped, keeping what was buffered meanwhile.
+        """
+        if hasattr(self.source, "reserve"):
+            # Room for a whole utterance: a recognizer that blocks while decoding (Whisper
+            # re-decodes for partials) can fall behind by up to the phrase limit
+            self.source.reserve(phrase_time_limit + (self.preroll + self.hangover) * FRAME_MS / 1000 + 1)
+        overruns = getattr(self.source, "overruns", 0)
+        if flush and hasattr(self.source, "flush"):
+            # Only the pre-roll of what was captured before we were asked to listen
+            self.source.flush(keep=self.preroll)
+
+        frames = self._frames()
+        preroll = collections.deque(maxlen=self.preroll)
+        wait_frames = int(timeout * 1000 / FRAME_MS)
+        limit_frames = int(phrase_time_limit * 1000 / FRAME_MS)
+
+        # Wait for the start of speech
+        voiced = 0
+        for count, frame in enumerate(frames):
+            if stop is not None and stop.is_set():
+                return None
+            preroll.append(frame)
+            voiced = voiced + 1 if self.vad.is_speech(frame) else 0
+            if voiced >= max(self.min_speech, 1):
+                break
+            if count >= wait_frames:
+                return None
+        else:
+            return None
+
+        started = time.perf_counter()
+        first_partial = None
+        self.recognizer.reset()
+        for frame in preroll:
+            self.recognizer.accept(frame)
+
+        # Stream frames until `hangover` frames of silence or the phrase limit
+        silent = 0
+        spoken = len(preroll)
+        for frame in frames:
+            if stop is not None and stop.is_set():
+                break
+            partial = self.recognizer.accept(frame)
+            spoken += 1
+            if partial and on_partial:
+                first_partial = first_partial or time.perf_counter() - started
+                on_partial(partial)
+            silent = 0 if self.vad.is_speech(frame) else silent + 1
+            if silent >= self.hangover or spoken >= limit_frames:
+                break
+
+        speech_end = time.perf_counter()
+        text = self.recognizer.finish()
+        self.stats = {
+            "audio_seconds": spoken * FRAME_MS / 1000,
+            "first_partial": first_partial,
+            "final_latency": time.perf_counter() - speech_end,
+            "overruns": getattr(self.source, "overruns", 0) - overruns,
+        }
+        if self.stats["overruns"]:
+            print(f"Warning: {self.stats['overruns']} audio frames were dropped while listening - "
+                  f"the recognizer fell behind the microphone", file=sys.stderr)
+        return text
+
+    def close(self):
+        self.source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant speech pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tr = sub.add_parser("transcribe", help="Transcribe every utterance in a WAV file")
+    tr.add_argument("wav")
+    tr.add_argument("--recognizer", default=None, help="vosk[:dir], whisper[:size] or google")
+    tr.add_argument("--realtime", action="store_true", help="Feed frames at microphone pace")
+    args = parser.parse_args()
+
+    pipeline = SpeechPipeline(WavSource(args.wav, realtime=args.realtime), make_recognizer(args.recognizer))
+    start = time.perf_counter()
+    while True:
+        text = pipeline.listen_once(timeout=3600, on_partial=lambda t: sys.stderr.write(f"\r  ... {t}"))
+        if text is None:
+            break
+        stats = pipeline.stats
+        sys.stderr.write("\n")
+        first = f"{stats['first_partial'] * 1000:.0f} ms" if stats["first_partial"] is not None else "-"
+        print(f"{text!r}  (audio {stats['audio_seconds']:.2f}s, first partial {first}, "
+              f"final {stats['final_latency'] * 1000:.0f} ms, {stats['overruns']} frames dropped)")
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Background system monitor for the AI Voice Assistant.
+
+A daemon thread samples CPU, memory, disk and the busiest processes every few
+seconds, using psutil's non-blocking deltas: cpu_percent(None) measures since
+the previous call, so nothing sleeps for a full second. Samples are kept in a
+rolling window. "System info" and "running processes" answer from the latest
+sample straight away, and "system trend" summarizes the window.
+"""
+import collections
+import os
+import threading
+import time
+
+import psutil
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+class SystemMonitor:
+    """Rolling window of system samples, refreshed on a background thread"""
+
+    def __init__(self, interval=2.0, window_seconds=600, top_n=5, process_every=3):
+        self.interval = interval
+        self.top_n = top_n
+        self.process_every = process_every     # the process walk is the costly part - do it every Nth sample
+        self.samples = collections.deque(maxlen=int(window_seconds / interval))
+        self.processes = {"cpu": [], "memory": [], "count": 0, "time": None}
+        self.disk_path = os.path.abspath(os.sep)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread:
+            return self
+        # Prime the deltas so the first real sample measures a real interval
+        psutil.cpu_percent(None)
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        count = 0
+        while not self.stopped.wait(self.interval if count else 0.5):
+            try:
+                self.sample(with_processes=count % self.process_every == 0)
+            except Exception as e:
+                print(f"System sampler error: {e}")
+            count += 1
+
+    def sample(self, with_processes=True):
+        """Take one sample now (also callable directly, e.g. from tests)"""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        sample = {
+            "time": time.time(),
+            "cpu": psutil.cpu_percent(None),
+            "memory": memory.percent,
+            "memory_used": memory.used,
+            "memory_total": memory.total,
+            "disk": disk.percent,
+            "disk_used": disk.used,
+            "disk_total": disk.total,
+        }
+        processes = self.sample_processes() if with_processes else None
+        with self.lock:
+            self.samples.append(sample)
+            if processes:
+                self.processes = processes
+        return sample
+
+    def sample_processes(self):
+        """Top-N processes by CPU (since the last walk) and by resident memory"""
+        rows = []
+        # process_iter reuses Process objects between calls, so cpu_percent(None) is a delta
+        for proc in psutil.process_iter(["name", "memory_info"]):
+            try:
+                rows.append((proc.info["name"] or str(proc.pid), proc.pid, proc.cpu_percent(None),
+                             proc.info["memory_info"].rss if proc.info["memory_info"] else 0))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return {
+            "cpu": sorted(rows, key=lambda r: r[2], reverse=True)[:self.top_n],
+            "memory": sorted(rows, key=lambda r: r[3], reverse=True)[:self.top_n],
+            "count": len(rows),
+            "time": time.time(),
+        }
+
+    def latest(self):
+        """The newest sample, taking one on the spot if the sampler hasn't run yet"""
+        with self.lock:
+            if self.samples:
+                return self.samples[-1]
+        return self.sample(with_processes=False)
+
+    def window(self, minutes):
+        cutoff = time.time() - minutes * 60
+        with self.lock:
+            return [s for s in self.samples if s["time"] >= cutoff]
+
+    # --- Answers for the assistant ---
+
+    def describe_latest(self):
+        s = self.latest()
+        info = "System Status:\n"
+        info += f"  • CPU Usage: {s['cpu']:.0f}%\n"
+        info += f"  • Memory: {s['memory']}% ({s['memory_used'] / GB:.1f}GB / {s['memory_total'] / GB:.1f}GB)\n"
+        info += f"  • Disk: {s['disk']}% ({s['disk_used'] / GB:.1f}GB / {s['disk_total'] / GB:.1f}GB)"
+        return info
+
+    def describe_processes(self):
+        with self.lock:
+            processes = self.processes
+        if processes["time"] is None:
+            processes = self.sample_processes()
+        by_cpu = "\n".join(f"  • {name} ({cpu:.0f}% CPU)" for name, pid, cpu, rss in processes["cpu"])
+        by_memory = "\n".join(f"  • {name} ({rss / MB:,.0f} MB)" for name, pid, cpu, rss in processes["memory"])
+        return (f"{processes['count']} processes running.\n"
+                f"Busiest by CPU:\n{by_cpu}\nLargest by memory:\n{by_memory}")
+
+    def describe_trend(self, minutes=5):
+        samples = self.window(minutes)
+        if len(samples) < 2:
+            return "I've only just started watching the system - ask me again in a minute."
+        span = (samples[-1]["time"] - samples[0]["time"]) / 60
+        lines = [f"System trend over the last {span:.1f} minutes ({len(samples)} samples):"]
+        for key, label in (("cpu", "CPU"), ("memory", "Memory"), ("disk", "Disk")):
+            values = [s[key] for s in samples]
+            third = max(len(values) // 3, 1)
+            change = sum(values[-third:]) / third - sum(values[:third]) / third
+            direction = "rising" if change > 5 else "falling" if change < -5 else "steady"
+            lines.append(f"  • {label}: avg {sum(values) / len(values):.0f}%, "
+                         f"min {min(values):.0f}%, max {max(values):.0f}% - {direction}")
+        return "\n".join(lines)
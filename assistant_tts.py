@@ -0,0 +1,167 @@
+"""
+Text-to-speech worker for the AI Voice Assistant.
+
+One long-lived thread owns the pyttsx3 engine; everything else talks to it
+through a priority queue, so overlapping responses can't contend on the
+engine. Responses are split into sentences and queued as separate chunks:
+the first sentence starts speaking while the rest wait, and stop() cuts the
+current sentence short and drops the remaining ones.
+"""
+import collections
+import itertools
+import queue
+import re
+import threading
+import time
+
+HIGH = 0        # confirmations, errors - jump the queue
+NORMAL = 1
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+MAX_CHUNK = 200
+
+
+def split_sentences(text):
+    """Speakable chunks: sentences/lines, with overlong ones split at commas"""
+    chunks = []
+    for sentence in SENTENCE_RE.split(text):
+        sentence = sentence.strip(" •\t")
+        while len(sentence) > MAX_CHUNK:
+            cut = sentence.rfind(",", 0, MAX_CHUNK)
+            cut = cut + 1 if cut > 0 else MAX_CHUNK
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+def default_engine():
+    # Imported lazily so headless use can pass its own engine factory
+    import pyttsx3
+    return pyttsx3.init()
+
+
+class SilentEngine:
+    """Stand-in engine for headless runs: accepts everything, says nothing"""
+
+    def say(self, text):
+        pass
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def connect(self, name, callback):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+
+class SpeechWorker:
+    """Single pyttsx3 thread fed by a priority queue"""
+
+    def __init__(self, engine_factory=default_engine, setup=None, history=500):
+        self.engine_factory = engine_factory
+        self.setup = setup
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.utterances = itertools.count(1)
+        # Bumped by stop(); chunks queued before the bump are dropped
+        self.generation = 0
+        self.current_generation = 0
+        self.speaking = threading.Event()
+        self.engine = None
+        self.lock = threading.Lock()
+
+        self.queue_latency = collections.deque(maxlen=history)   # enqueue -> chunk starts
+        self.first_chunk = collections.deque(maxlen=history)     # say() -> first words of an utterance
+        self.counts = collections.Counter()
+
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def say(self, text, priority=NORMAL):
+        """Queue text for speaking; returns immediately with an utterance id"""
+        utterance = next(self.utterances)
+        now = time.perf_counter()
+        with self.lock:
+            generation = self.generation
+            for i, chunk in enumerate(split_sentences(text)):
+                self.queue.put((priority, next(self.sequence), generation, utterance, i == 0, chunk, now))
+        self.counts["utterances"] += 1
+        return utterance
+
+    def stop(self):
+        """Interrupt: cut off the current sentence and drop everything queued"""
+        with self.lock:
+            self.generation += 1
+        if self.speaking.is_set():
+            self.counts["interrupted"] += 1
+
+    def close(self):
+        self.stop()
+        self.queue.put((-1, -1, None, None, False, None, 0.0))
+        self.thread.join(timeout=2)
+
+    def _on_word(self, name, location, length):
+        # Runs on the worker thread inside runAndWait - the safe place to stop the engine
+        if self.current_generation != self.generation:
+            self.engine.stop()
+
+    def _run(self):
+        self.engine = self.engine_factory()
+        if self.setup:
+            self.setup(self.engine)
+        self.current_generation = self.generation
+        try:
+            self.engine.connect("started-word", self._on_word)
+        except Exception:
+            pass  # engines without word callbacks still stop between sentences
+
+        while True:
+            priority, _, generation, utterance, first, chunk, queued_at = self.queue.get()
+            if chunk is None:
+                break
+            if generation != self.generation:
+                self.counts["dropped"] += 1
+                continue
+
+            started = time.perf_counter()
+            self.queue_latency.append(started - queued_at)
+            if first:
+                self.first_chunk.append(started - queued_at)
+            self.current_generation = generation
+            self.speaking.set()
+            try:
+                self.engine.say(chunk)
+                self.engine.runAndWait()
+                self.counts["chunks"] += 1
+            except Exception as e:
+                self.counts["errors"] += 1
+                print(f"Speech error: {e}")
+            finally:
+                self.speaking.clear()
+
+    def metrics(self):
+        """Queue latency percentiles (ms) and counters"""
+        def percentile(values, q):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+        return {
+            "pending": self.queue.qsize(),
+            "queue_ms_p50": percentile(self.queue_latency, 0.5),
+            "queue_ms_p95": percentile(self.queue_latency, 0.95),
+            "first_words_ms_p50": percentile(self.first_chunk, 0.5),
+            "first_words_ms_p95": percentile(self.first_chunk, 0.95),
+            **self.counts,
+        }
@@ -0,0 +1,446 @@
+"""
+Wake-word detection for the AI Voice Assistant's continuous mode.
+
+Instead of running a full listen cycle every second, continuous mode reads
+the microphone's frame stream through a cheap gate. A voice-activity
+detector looks at every 30 ms frame. Only the start of each voiced
+stretch, at most `max_word_ms`, goes to a keyword spotter. Recognition
+starts only after the spotter hears the wake word ("Jarvis"). Silence and
+background noise cost one energy computation per frame.
+
+Spotters are chosen with a spec string (see make_spotter):
+    template:<dir>      MFCC + DTW against enrollment recordings of the wake word (numpy only)
+    vosk:<model dir>    Vosk restricted to a one-word grammar
+    transcript[:<rec>]  the session's own recognizer (e.g. google) on each short
+                        voiced stretch - works with nothing installed or recorded
+
+    python assistant_wake.py enroll --count 5          # record templates into models/wake
+    python assistant_wake.py eval --positives rec/jarvis*.wav --negatives rec/talk*.wav
+"""
+import argparse
+import collections
+import glob
+import json
+import os
+import re
+import time
+import wave
+
+import numpy as np
+
+from assistant_speech import (SAMPLE_RATE, FRAME_MS, FRAME_SAMPLES, DEFAULT_VOSK_MODEL, MicrophoneSource,
+                              WavSource, make_recognizer, make_vad)
+
+WAKE_WORD = "jarvis"
+WAKE_ENV_VAR = "ASSISTANT_WAKE"
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "wake")
+
+# --- Features: 12 MFCCs per 30 ms frame ---
+
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 12
+
+
+def _mel_filterbank(low=100.0, high=4000.0):
+    mel = lambda hz: 2595 * np.log10(1 + hz / 700)
+    hz = lambda m: 700 * (10 ** (m / 2595) - 1)
+    edges = hz(np.linspace(mel(low), mel(high), N_MELS + 2))
+    bins = np.floor((N_FFT + 1) * edges / SAMPLE_RATE).astype(int)
+    bank = np.zeros((N_MELS, N_FFT // 2 + 1), dtype=np.float32)
+    for i in range(N_MELS):
+        left, center, right = bins[i], bins[i + 1], bins[i + 2]
+        bank[i, left:center] = (np.arange(left, center) - left) / max(center - left, 1)
+        bank[i, center:right] = (right - np.arange(center, right)) / max(right - center, 1)
+    return bank
+
+
+# Built once - per frame the cost is one FFT and two small matrix products
+MEL_BANK = _mel_filterbank()
+WINDOW = np.hanning(FRAME_SAMPLES).astype(np.float32)
+DCT = np.cos(np.pi / N_MELS * (np.arange(N_MELS) + 0.5)[None, :] * np.arange(1, N_MFCC + 1)[:, None]).astype(np.float32)
+
+
+def mfcc(frame):
+    """Cepstral coefficients 1-12 of one int16 frame (c0, the loudness, is left out)"""
+    samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32) / 32768
+    power = np.abs(np.fft.rfft(samples * WINDOW, N_FFT)) ** 2
+    return DCT @ np.log(MEL_BANK @ power + 1e-10)
+
+
+def dtw_distance(template, window):
+    """
+    Subsequence DTW: the best match of `template` anywhere in `window`,
+    per template frame. Steps (1,0), (1,1), (1,2) let speech run from twice
+    as fast to much slower than the template, and each row is one vector op.
+    """
+    cost = np.sqrt(((template[:, None, :] - window[None, :, :]) ** 2).sum(axis=2))
+    total = cost[0].copy()                  # free start anywhere in the window
+    for i in range(1, len(template)):
+        best = total.copy()
+        best[1:] = np.minimum(best[1:], total[:-1])
+        best[2:] = np.minimum(best[2:], total[:-2])
+        total = cost[i] + best
+    return float(total.min()) / len(template)
+
+
+# --- Spotters ---
+
+class KeywordSpotter:
+    """Base class: fed the frames of one voiced stretch, decides whether it holds the wake word"""
+    name = "base"
+
+    def reset(self):
+        """Start a new voiced stretch"""
+
+    def accept(self, frame):
+        """Feed one frame; True/False once decided, None while undecided"""
+        return None
+
+    def finish(self):
+        """End of the stretch: decide with what was heard"""
+        raise NotImplementedError
+
+
+class TemplateSpotter(KeywordSpotter):
+    """
+    Matches against a few recordings of the user saying the wake word. Each
+    recording is cut to its voiced part. The threshold defaults to the
+    templates' spread: how far each one is from its nearest neighbour, plus
+    `margin`.
+    """
+    name = "template"
+
+    def __init__(self, paths, threshold=None, margin=1.5):
+        self.templates = [features for features in (self.word_features(path) for path in paths) if len(features)]
+        if not self.templates:
+            raise ValueError("No usable wake-word recordings")
+        self.longest = max(len(t) for t in self.templates)
+        if threshold is None:
+            if len(self.templates) < 2:
+                raise ValueError("Record the wake word at least twice, or pass a threshold")
+            spread = [min(dtw_distance(t, other) for other in self.templates if other is not t)
+                      for t in self.templates]
+            threshold = max(spread) * margin
+        self.threshold = threshold
+        self.features = []
+        self.last_distance = None
+
+    @staticmethod
+    def word_features(path):
+        """MFCCs of the loud part of a recording (within 30 dB of its peak)"""
+        frames = list(WavSource(path).frames())
+        if not frames:
+            return np.zeros((0, N_MFCC), dtype=np.float32)
+        levels = np.array([np.abs(np.frombuffer(f, dtype=np.int16)).max() for f in frames], dtype=np.float32)
+        loud = np.nonzero(levels > levels.max() * 10 ** (-30 / 20))[0]
+        return np.array([mfcc(f) for f in frames[loud[0]:loud[-1] + 1]])
+
+    def reset(self):
+        self.features = []
+
+    def accept(self, frame):
+        self.features.append(mfcc(frame))
+        # Decide as soon as the slowest allowed rendition of the longest template could fit
+        if len(self.features) >= 2 * self.longest:
+            return self.finish()
+        return None
+
+    def finish(self):
+        if len(self.features) < 3:
+            return False
+        window = np.array(self.features)
+        self.last_distance = min(dtw_distance(t, window) for t in self.templates)
+        return self.last_distance <= self.threshold
+
+
+class VoskSpotter(KeywordSpotter):
+    """Vosk with a grammar of just the wake word and [unk] - small search, quick decode"""
+    name = "vosk"
+
+    def __init__(self, word=WAKE_WORD, model_path=DEFAULT_VOSK_MODEL):
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+        SetLogLevel(-1)
+        self.word = word
+        self.recognizer = KaldiRecognizer(Model(model_path), SAMPLE_RATE, json.dumps([word, "[unk]"]))
+
+    def reset(self):
+        self.recognizer.Reset()
+
+    def accept(self, frame):
+        if self.recognizer.AcceptWaveform(frame):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return True if self.word in text.split() else None
+
+    def finish(self):
+        return self.word in json.loads(self.recognizer.FinalResult()).get("text", "").split()
+
+
+class TranscriptSpotter(KeywordSpotter):
+    """
+    Runs a speech recognizer backend over the stretch and looks for the wake
+    word in its text. Costs a full decode (a network request with google) per
+    voiced stretch, but needs no model or enrollment - the fallback.
+    """
+    name = "transcript"
+
+    def __init__(self, recognizer, word=WAKE_WORD):
+        self.recognizer = recognizer
+        self.word = word.lower()
+
+    def heard(self, text):
+        return self.word in re.findall(r"[a-z0-9']+", (text or "").lower())
+
+    def reset(self):
+        self.recognizer.reset()
+
+    def accept(self, frame):
+        partial = self.recognizer.accept(frame)
+        return True if partial and self.heard(partial) else None
+
+    def finish(self):
+        try:
+            return self.heard(self.recognizer.finish())
+        except RuntimeError:
+            # Recognition service unreachable: keep waiting rather than end continuous mode
+            return False
+
+
+def template_paths(word, directory=DEFAULT_TEMPLATE_DIR):
+    """Recordings of `word` saved by `enroll` (named <word>_<time>_<n>.wav)"""
+    return sorted(glob.glob(os.path.join(directory, f"{word.lower()}_*.wav")))
+
+
+def make_spotter(spec=None, word=WAKE_WORD, recognizer=None):
+    """
+    Build a spotter from a spec string: "template[:<dir of wavs>]",
+    "vosk[:<model dir>]" or "transcript[:<recognizer spec>]". Falls back to ASSISTANT_WAKE, then
+    to templates if models/wake has recordings of `word`, then vosk if its
+    model is installed, then the transcript of `recognizer` (or the default one).
+    """
+    spec = spec or os.environ.get(WAKE_ENV_VAR)
+    if not spec:
+        if template_paths(word):
+            spec = "template"
+        elif os.path.isdir(DEFAULT_VOSK_MODEL):
+            spec = "vosk"
+        else:
+            spec = "transcript"
+    name, _, arg = spec.partition(":")
+    if name == "template":
+        paths = template_paths(word, arg or DEFAULT_TEMPLATE_DIR)
+        if paths:
+            return TemplateSpotter(paths)
+        # Recordings of another word (e.g. the old name) don't count - try the next spotter
+        name, arg = ("vosk", "") if os.path.isdir(DEFAULT_VOSK_MODEL) else ("transcript", "")
+    if name == "vosk":
+        return VoskSpotter(word, arg or DEFAULT_VOSK_MODEL)
+    if name == "transcript":
+        return TranscriptSpotter(recognizer or make_recognizer(arg or None), word)
+    raise ValueError(f"Unknown wake-word spotter: {spec}")
+
+
+# --- Detector ---
+
+class WakeWordDetector:
+    """VAD-gated keyword spotting over a frame stream"""
+
+    def __init__(self, spotter, vad=None, preroll_ms=150, min_speech_ms=90, hangover_ms=300, max_word_ms=1500):
+        self.spotter = spotter
+        self.vad = vad or make_vad()
+        self.preroll = collections.deque(maxlen=int(preroll_ms / FRAME_MS))
+        self.min_speech = max(int(min_speech_ms / FRAME_MS), 1)
+        self.hangover = int(hangover_ms / FRAME_MS)
+        self.max_word = int(max_word_ms / FRAME_MS)
+        self.counts = collections.Counter()
+        self.reset()
+
+    def reset(self):
+        """Forget the current stretch (state is otherwise kept between wait() calls)"""
+        self.preroll.clear()
+        self.in_stretch = False
+        self.decided = False
+        self.length = 0
+        self.voiced = 0
+        self.silent = 0
+
+    def _feed(self, frame):
+        """Spotter verdict for one frame of the current stretch"""
+        self.counts["spotted_frames"] += 1
+        verdict = self.spotter.accept(frame)
+        if verdict is not None:
+            self.decided = True
+        return verdict is True
+
+    def wait(self, frames, stop=None):
+        """
+        Consume frames until the wake word is heard (True), or until the
+        stream ends or `stop` is set (False). The rest of a stretch that
+        held the wake word is left for the caller's recognizer.
+        """
+        for frame in frames:
+            if stop is not None and stop.is_set():
+                return False
+            self.counts["frames"] += 1
+            speech = self.vad.is_speech(frame)
+
+            if not self.in_stretch:
+                self.preroll.append(frame)
+                self.voiced = self.voiced + 1 if speech else 0
+                if self.voiced < self.min_speech:
+                    continue
+                self.counts["stretches"] += 1
+                self.in_stretch, self.decided, self.silent = True, False, 0
+                self.length = len(self.preroll)
+                self.spotter.reset()
+                heard = False
+                for buffered in self.preroll:
+                    heard = heard or (not self.decided and self._feed(buffered))
+                self.preroll.clear()
+                if heard:
+                    return self._detected()
+                continue
+
+            self.length += 1
+            if not self.decided:
+                if self._feed(frame):
+                    return self._detected()
+                if self.length >= self.max_word:
+                    self.decided = True
+                    if self.spotter.finish():
+                        return self._detected()
+
+            self.silent = 0 if speech else self.silent + 1
+            if self.silent >= self.hangover:
+                self.in_stretch, self.voiced = False, 0
+                if not self.decided and self.spotter.finish():
+                    return self._detected()
+        return False
+
+    def _detected(self):
+        self.counts["detections"] += 1
+        # The stretch is spoken for: the rest isn't searched for the wake word again
+        self.decided = True
+        return True
+
+
+def evaluate(detector, paths):
+    """Run the detector over recordings -> (detections per file, audio seconds, cpu seconds)"""
+    detections, audio_seconds, cpu_seconds = [], 0.0, 0.0
+    for path in paths:
+        source = WavSource(path)
+        frames = list(source.frames())
+        audio_seconds += len(frames) * FRAME_MS / 1000
+        detector.reset()
+        start = time.process_time()
+        stream = iter(frames)
+        count = 0
+        while detector.wait(stream):
+            count += 1
+        cpu_seconds += time.process_time() - start
+        detections.append(count)
+    return detections, audio_seconds, cpu_seconds
+
+
+def record_word(frames, vad, preroll_ms=150, hangover_ms=300, max_ms=2000):
+    """Frames of the next voiced stretch, with a little audio from before it"""
+    preroll = collections.deque(maxlen=int(preroll_ms / FRAME_MS))
+    hangover, limit = int(hangover_ms / FRAME_MS), int(max_ms / FRAME_MS)
+    recorded, silent = None, 0
+    for frame in frames:
+        speech = vad.is_speech(frame)
+        if recorded is None:
+            preroll.append(frame)
+            if speech:
+                recorded = list(preroll)
+            continue
+        recorded.append(frame)
+        silent = 0 if speech else silent + 1
+        if silent >= hangover or len(recorded) >= limit:
+            return recorded
+    return recorded or []
+
+
+def enroll(word, count, directory, source=None):
+    """Record `count` takes of the wake word into `directory`; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    source = source or MicrophoneSource()
+    vad = make_vad()
+    frames = source.frames()
+    paths = []
+    try:
+        # Half a second of room noise first, so the VAD's noise floor is settled
+        for _ in range(int(500 / FRAME_MS)):
+            vad.is_speech(next(frames))
+        for i in range(count):
+            print(f"Say '{word}' ({i + 1}/{count})...")
+            if hasattr(source, "flush"):
+                source.flush()
+            recorded = record_word(frames, vad)
+            if len(recorded) < 5:
+                print("  Didn't catch that - stopping.")
+                break
+            path = os.path.join(directory, f"{word.lower()}_{int(time.time())}_{i + 1}.wav")
+            with wave.open(path, "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(SAMPLE_RATE)
+                f.writeframes(b"".join(recorded))
+            print(f"  {len(recorded) * FRAME_MS} ms -> {path}")
+            paths.append(path)
+    finally:
+        source.close()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice assistant wake-word detector")
+    sub = parser.add_subparsers(dest="command", required=True)
+    en = sub.add_parser("enroll", help="Record the wake word from the microphone as templates")
+    en.add_argument("--word", default=WAKE_WORD)
+    en.add_argument("--count", type=int, default=5)
+    en.add_argument("--dir", default=DEFAULT_TEMPLATE_DIR)
+    ev = sub.add_parser("eval", help="Detection rate, false accepts and CPU cost on recordings")
+    ev.add_argument("--word", default=WAKE_WORD)
+    ev.add_argument("--spotter", default=None, help="template[:dir], vosk[:dir] or transcript[:recognizer]")
+    ev.add_argument("--positives", nargs="*", default=[], help="Recordings that each contain the wake word once")
+    ev.add_argument("--negatives", nargs="*", default=[], help="Recordings without the wake word")
+    ev.add_argument("--threshold", type=float, default=None, help="Override the template threshold")
+    args = parser.parse_args()
+
+    if args.command == "enroll":
+        paths = enroll(args.word, args.count, args.dir)
+        if len(paths) >= 2:
+            spotter = TemplateSpotter(template_paths(args.word, args.dir))
+            print(f"{len(spotter.templates)} templates in {args.dir}, threshold {spotter.threshold:.2f}. "
+                  f"Check it with: python assistant_wake.py eval --positives <recordings>")
+        return
+
+    spotter = make_spotter(args.spotter, word=args.word)
+    if args.threshold is not None and hasattr(spotter, "threshold"):
+        spotter.threshold = args.threshold
+    detector = WakeWordDetector(spotter)
+    if hasattr(spotter, "threshold"):
+        print(f"Template threshold {spotter.threshold:.2f} ({len(spotter.templates)} templates)")
+
+    audio_total = cpu_total = 0.0
+    if args.positives:
+        found, audio, cpu = evaluate(detector, args.positives)
+        audio_total, cpu_total = audio_total + audio, cpu_total + cpu
+        hits = sum(1 for n in found if n > 0)
+        print(f"Positives: {hits}/{len(found)} detected ({100 * hits / len(found):.1f}%)")
+    if args.negatives:
+        found, audio, cpu = evaluate(detector, args.negatives)
+        audio_total, cpu_total = audio_total + audio, cpu_total + cpu
+        print(f"Negatives: {sum(found)} false accepts in {audio / 60:.1f} min of audio "
+              f"({sum(found) / (audio / 3600):.2f} per hour)")
+    if audio_total:
+        gated = detector.counts["spotted_frames"] / max(detector.counts["frames"], 1)
+        print(f"CPU: {cpu_total:.2f}s for {audio_total:.0f}s of audio ({100 * cpu_total / audio_total:.2f}% of one core), "
+              f"spotter ran on {100 * gated:.0f}% of frames")
+
+
+if __name__ == "__main__":
+    main()
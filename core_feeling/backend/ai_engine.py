@@ -1,36 +1,393 @@
+import asyncio
+import collections
+import json
 import os
+import re
+import sqlite3
+import threading
+import time
 
-# Placeholder for OpenAI integration
-# In a real scenario, use:
-# import openai
-# openai.api_key = os.getenv("OPENAI_API_KEY")
+# Task parsing goes through a pluggable backend:
+#   rules          local heuristics (default)
+#   remote[:model] one OpenAI call per batch; a simulated stub without OPENAI_API_KEY
+# Results are cached in memory (LRU) and on disk, keyed on the normalized input,
+# and concurrent async requests are coalesced into one backend call.
+BACKEND_ENV_VAR = "CORE_FEELING_AI_BACKEND"
+CACHE_ENV_VAR = "CORE_FEELING_AI_CACHE"
+DEFAULT_CACHE_PATH = "./ai_cache.db"
+
+PRIORITIES = ("High", "Medium", "Low")
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+TIME_RE = re.compile(r"\b(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b", re.IGNORECASE)
+WORD_RE = re.compile(r"[a-z]+")
+
+def normalize(user_input: str) -> str:
+    """Cache key: case and spacing don't change what a task means"""
+    return " ".join(user_input.split()).casefold()
+
+
+# --- Backends: list of inputs -> list of task dicts, one call per batch ---
+
+class ParserBackend:
+    name = "base"
+
+    @property
+    def namespace(self):
+        """Cache namespace: answers from different backends or models never mix"""
+        return self.name
+
+    def parse_many(self, user_inputs):
+        raise NotImplementedError
+
+
+class RuleBackend(ParserBackend):
+    """Local keyword rules - instant, no network"""
+    name = "rules"
+
+    def parse_one(self, user_input):
+        text = user_input.lower()
+        words = set(WORD_RE.findall(text))
 
-class AIEngine:
-    @staticmethod
-    def parse_task_input(user_input: str):
-        """
-        Mock AI parsing logic.
-        Future: Call OpenAI API to extracting structured data.
-        """
-        print(f"[AI Engine] Parsing: {user_input}")
-        
-        # Simple heuristic for demo purposes
         priority = "Medium"
-        if "urgent" in user_input.lower() or "important" in user_input.lower():
+        if "urgent" in text or "important" in text:
             priority = "High"
-        
+        elif words & {"someday", "eventually", "maybe", "optional"}:
+            priority = "Low"
+
         date = "Today"
-        if "tomorrow" in user_input.lower():
+        if "tomorrow" in text:
             date = "Tomorrow"
-            
+        else:
+            weekday = next((day for day in WEEKDAYS if day in words), None)
+            if weekday:
+                date = weekday.capitalize()
+
+        time_of_day = "Flexible" # Default
+        match = TIME_RE.search(user_input)
+        if match:
+            hour, minute, meridiem = match.groups()
+            time_of_day = f"{int(hour)}:{minute or '00'} {meridiem.upper()}"
+        elif words & {"morning", "afternoon", "evening", "tonight"}:
+            time_of_day = "Evening" if "tonight" in words else next(
+                w.capitalize() for w in ("morning", "afternoon", "evening") if w in words)
+
         return {
             "title": user_input,
             "date": date,
-            "time": "Flexible", # Default
+            "time": time_of_day,
             "priority": priority,
             "mood": "Neutral" # Default
         }
 
+    def parse_many(self, user_inputs):
+        return [self.parse_one(user_input) for user_input in user_inputs]
+
+
+class RemoteBackend(ParserBackend):
+    """
+    An OpenAI chat model, asked for a whole batch in one request. Without an
+    API key (or the openai package) it is a stub: it waits `simulated_latency`
+    like a network round trip and answers with the rules, so batching and
+    caching behave as they would in production.
+    """
+    name = "remote"
+    PROMPT = (
+        "Turn each to-do note into a task. Reply with JSON: {\"tasks\": [...]} with one object per note, "
+        "in order, each with title, date (Today, Tomorrow or a weekday), time (e.g. \"5:00 PM\" or Flexible), "
+        "priority (High, Medium or Low) and mood (Neutral unless the note says otherwise)."
+    )
+
+    def __init__(self, model="gpt-4o-mini", api_key=None, simulated_latency=0.4):
+        self.model = model
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY")
+        self.simulated_latency = simulated_latency
+        self.rules = RuleBackend()
+
+    @property
+    def namespace(self):
+        # The stub's rule answers get their own namespace, so setting a key later isn't served stale stubs
+        return f"remote:{self.model}" if self.api_key else f"remote-stub:{self.model}"
+
+    def parse_many(self, user_inputs):
+        if not self.api_key:
+            time.sleep(self.simulated_latency)
+            return self.rules.parse_many(user_inputs)
+
+        import openai
+        client = openai.OpenAI(api_key=self.api_key)
+        response = client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.PROMPT},
+                {"role": "user", "content": json.dumps(user_inputs)},
+            ],
+            response_format={"type": "json_object"},
+        )
+        tasks = json.loads(response.choices[0].message.content).get("tasks", [])
+        return [self.clean(tasks[i] if i < len(tasks) else None, user_input)
+                for i, user_input in enumerate(user_inputs)]
+
+    def clean(self, task, user_input):
+        """Keep the model's answer only where it fits the schema"""
+        fallback = self.rules.parse_one(user_input)
+        if not isinstance(task, dict):
+            return fallback
+        cleaned = {key: str(task.get(key) or fallback[key]) for key in fallback}
+        if cleaned["priority"] not in PRIORITIES:
+            cleaned["priority"] = fallback["priority"]
+        return cleaned
+
+
+def make_backend(spec=None):
+    """"rules" or "remote[:model]"; defaults to CORE_FEELING_AI_BACKEND, then rules"""
+    spec = spec or os.getenv(BACKEND_ENV_VAR, "rules")
+    name, _, arg = spec.partition(":")
+    if name == "rules":
+        return RuleBackend()
+    if name == "remote":
+        return RemoteBackend(model=arg or "gpt-4o-mini")
+    raise ValueError(f"Unknown AI backend: {spec}")
+
+
+# --- Cache: LRU in memory in front of a SQLite table ---
+
+class ParseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=2048, namespace="rules"):
+        self.path = path
+        self.max_entries = max_entries
+        self.namespace = namespace      # results from different backends don't mix
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        if path:
+            with self.connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS parses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def connect(self):
+        # One connection per thread: sync callers and the batcher's worker threads all read and write
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key, disk=True):
+        """-> (result, "memory" | "disk") or (None, None); disk=False never blocks on SQLite"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key], "memory"
+        if not disk or not self.path:
+            return None, None
+        row = self.connect().execute(
+            "SELECT value FROM parses WHERE key = ?", (f"{self.namespace}:{key}",)
+        ).fetchone()
+        if row is None:
+            return None, None
+        result = json.loads(row[0])
+        self._remember(key, result)
+        return result, "disk"
+
+    def put_many(self, items):
+        for key, result in items:
+            self._remember(key, result)
+        if self.path and items:
+            with self.connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO parses (key, value) VALUES (?, ?)",
+                    [(f"{self.namespace}:{key}", json.dumps(result)) for key, result in items]
+                )
+
+    def _remember(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# --- Micro-batcher: concurrent awaits -> one call ---
+
+class MicroBatcher:
+    """
+    Collects items submitted within `window` seconds (or until `max_batch`)
+    and hands them to `handler` in one call on a worker thread.
+    """
+
+    def __init__(self, handler, window=0.01, max_batch=32):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []
+        self.timer = None
+        self.sizes = collections.deque(maxlen=1000)
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            asyncio.ensure_future(self.run(batch))
+
+    async def run(self, batch):
+        self.sizes.append(len(batch))
+        try:
+            results = await asyncio.to_thread(self.handler, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def metrics(self):
+        sizes = list(self.sizes)
+        return {
+            "batches": len(sizes),
+            "avg_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+            "max_batch_size": max(sizes) if sizes else None,
+            "window_ms": self.window * 1000,
+        }
+
+
+class TaskParser:
+    """Backend + cache + batcher, with counters for /ai/metrics"""
+
+    def __init__(self, backend=None, cache_path=None, window=0.01, max_batch=32):
+        self.backend = backend or make_backend()
+        if cache_path is None:
+            cache_path = os.getenv(CACHE_ENV_VAR, DEFAULT_CACHE_PATH)
+        self.cache = ParseCache(cache_path, namespace=self.backend.namespace)
+        self.batcher = MicroBatcher(self.parse_many, window=window, max_batch=max_batch)
+        self.counts = collections.Counter()
+        self.backend_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def adapt(self, result, user_input):
+        """A cached parse for another spelling of the same input keeps this input as its title"""
+        result = dict(result)
+        if normalize(result["title"]) == normalize(user_input):
+            result["title"] = user_input
+        return result
+
+    def lookup(self, user_input, count_miss=True, disk=True):
+        result, tier = self.cache.get(normalize(user_input), disk=disk)
+        if result is None:
+            if count_miss:
+                self.count("cache_misses")
+            return None
+        self.count(f"cache_hits_{tier}")
+        return self.adapt(result, user_input)
+
+    def parse_many(self, user_inputs):
+        """Cached results where possible, one backend call for the rest (blocking)"""
+        results = [None] * len(user_inputs)
+        missing = collections.OrderedDict()     # key -> positions; duplicates are parsed once
+        for i, user_input in enumerate(user_inputs):
+            results[i] = self.lookup(user_input)
+            if results[i] is None:
+                missing.setdefault(normalize(user_input), []).append(i)
+
+        if missing:
+            inputs = [user_inputs[positions[0]] for positions in missing.values()]
+            print(f"[AI Engine] Parsing {len(inputs)} input(s) with the {self.backend.name} backend")
+            start = time.perf_counter()
+            parsed = self.backend.parse_many(inputs)
+            with self.lock:
+                self.backend_seconds += time.perf_counter() - start
+                self.counts["backend_calls"] += 1
+                self.counts["backend_items"] += len(inputs)
+            self.cache.put_many(list(zip(missing, parsed)))
+            for positions, result in zip(missing.values(), parsed):
+                for i in positions:
+                    results[i] = self.adapt(result, user_inputs[i])
+        return results
+
+    async def parse(self, user_input):
+        """Async path: memory hits return at once, the rest go through the batcher"""
+        # Only the in-memory LRU is checked on the event loop. The disk tier is read by
+        # the batch on its worker thread, and a miss is counted there, once
+        result = self.lookup(user_input, count_miss=False, disk=False)
+        if result is not None:
+            return result
+        return await self.batcher.submit(user_input)
+
+    def metrics(self):
+        with self.lock:
+            counts = dict(self.counts)
+            backend_seconds = self.backend_seconds
+        hits = counts.get("cache_hits_memory", 0) + counts.get("cache_hits_disk", 0)
+        lookups = hits + counts.get("cache_misses", 0)
+        calls = counts.get("backend_calls", 0)
+        return {
+            "backend": self.backend.namespace,
+            "cache": {
+                "memory_hits": counts.get("cache_hits_memory", 0),
+                "disk_hits": counts.get("cache_hits_disk", 0),
+                "misses": counts.get("cache_misses", 0),
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "memory_entries": len(self.cache),
+            },
+            "backend_calls": calls,
+            "backend_items": counts.get("backend_items", 0),
+            "avg_backend_ms": round(backend_seconds / calls * 1000, 2) if calls else None,
+            "batching": self.batcher.metrics(),
+        }
+
+
+class AIEngine:
+    parser = None   # TaskParser, built from the environment on first use
+
+    @classmethod
+    def get_parser(cls):
+        if cls.parser is None:
+            cls.parser = TaskParser()
+        return cls.parser
+
+    @classmethod
+    def parse_task_input(cls, user_input: str):
+        """
+        Parses a user string into a structured task (title, date, time,
+        priority, mood) with the configured backend, through the cache.
+        """
+        return cls.get_parser().parse_many([user_input])[0]
+
+    @classmethod
+    def parse_batch(cls, user_inputs):
+        """Parses several inputs with at most one backend call (used by bulk import)"""
+        return cls.get_parser().parse_many(list(user_inputs))
+
+    @classmethod
+    async def parse_async(cls, user_input: str):
+        """Like parse_task_input, but concurrent callers share backend calls"""
+        return await cls.get_parser().parse(user_input)
+
+    @classmethod
+    def metrics(cls):
+        return cls.get_parser().metrics()
+
     @staticmethod
     def get_motivation_message(mood: str):
         """
@@ -0,0 +1,92 @@
+import os
+
+# Where serialized missions are kept between requests:
+#   memory://            this process only (default)
+#   redis://host:port/0  shared by every worker; any Redis-protocol server
+#                        (Redis, Valkey, KeyDB, ...) - needs `pip install redis`
+CACHE_URL = os.getenv("CORE_FEELING_CACHE_URL", "memory://")
+
+# Each owner has a generation that every write bumps. A mission is stored with
+# the generation read *before* it was computed, so one computed while a write
+# was landing is never served afterwards.
+
+class MissionCache:
+    """In-process cache: one (etag, body) per owner"""
+
+    def __init__(self):
+        self.entries = {}       # owner -> (generation, etag, body)
+        self.generations = {}   # owner -> writes seen so far
+
+    async def generation(self, owner):
+        return self.generations.get(owner, 0)
+
+    async def get(self, owner):
+        entry = self.entries.get(owner)
+        if entry is None or entry[0] != self.generations.get(owner, 0):
+            return None
+        return entry[1], entry[2]
+
+    async def put(self, owner, generation, etag, body):
+        if generation == self.generations.get(owner, 0):
+            self.entries[owner] = (generation, etag, body)
+
+    async def invalidate(self, owner):
+        self.generations[owner] = self.generations.get(owner, 0) + 1
+        self.entries.pop(owner, None)
+
+    async def close(self):
+        pass
+
+
+class RedisMissionCache:
+    """
+    The same cache on a Redis-protocol server, so a write in one worker
+    invalidates the mission every worker serves. Entries carry their
+    generation and are checked against the owner's counter on read.
+    """
+
+    def __init__(self, url, ttl=24 * 3600):
+        import redis.asyncio as redis   # optional dependency, only for redis:// URLs
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    def key(self, owner, part):
+        return f"core_feeling:mission:{'shared' if owner is None else owner}:{part}"
+
+    async def generation(self, owner):
+        return int(await self.client.get(self.key(owner, "gen")) or 0)
+
+    async def get(self, owner):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(self.key(owner, "gen"))
+            pipe.hgetall(self.key(owner, "entry"))
+            generation, entry = await pipe.execute()
+        if not entry or int(entry[b"gen"]) != int(generation or 0):
+            return None
+        return entry[b"etag"].decode(), entry[b"body"]
+
+    async def put(self, owner, generation, etag, body):
+        # A stale put just leaves an entry whose generation no longer matches
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.key(owner, "entry"), mapping={"gen": generation, "etag": etag, "body": body})
+            pipe.expire(self.key(owner, "entry"), self.ttl)
+            await pipe.execute()
+
+    async def invalidate(self, owner):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(self.key(owner, "gen"))
+            pipe.delete(self.key(owner, "entry"))
+            await pipe.execute()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def make_mission_cache(url=CACHE_URL):
+    if url.startswith("memory"):
+        return MissionCache()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisMissionCache(url)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+mission_cache = make_mission_cache()
@@ -1,20 +1,48 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from .models import Base
+import os
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from .models import Base, PRIORITY_RANKS, UNRANKED
 
-DATABASE_URL = "sqlite:///./core_feeling.db"
+DATABASE_URL = os.getenv("CORE_FEELING_DATABASE_URL", "sqlite:///./core_feeling.db")
+# Plain sqlite:// URLs keep working - they are served through the aiosqlite driver
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Requests wait for a pooled connection without holding a thread; with WAL the
+# readers run side by side and only writers take turns
+engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=8, max_overflow=0, pool_timeout=30)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")     # durable at checkpoints; WAL keeps it consistent
+    cursor.execute("PRAGMA busy_timeout=5000")      # writers queue instead of failing with "database is locked"
+    cursor.execute("PRAGMA cache_size=-16000")      # 16 MB page cache per connection
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_db)
+
+def upgrade_db(conn):
+    """Bring databases created by older versions (no priority_rank, old index) up to date"""
+    columns = {c["name"] for c in inspect(conn).get_columns("tasks")}
+    if "priority_rank" not in columns:
+        cases = " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_RANKS.items())
+        conn.execute(text(f"ALTER TABLE tasks ADD COLUMN priority_rank INTEGER NOT NULL DEFAULT {UNRANKED}"))
+        conn.execute(text(f"UPDATE tasks SET priority_rank = CASE priority {cases} ELSE {UNRANKED} END"))
+    # Superseded by the owner-scoped index below
+    conn.execute(text("DROP INDEX IF EXISTS ix_tasks_completed_rank_id"))
+    # create_all skips indexes on tables that already existed
+    for index in Base.metadata.tables["tasks"].indexes:
+        index.create(bind=conn, checkfirst=True)
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
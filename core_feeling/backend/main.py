@@ -1,14 +1,28 @@
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
-from sqlalchemy.orm import Session
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from .database import get_db, init_db, engine
+from .cache import mission_cache
 from . import models, ai_engine
 
-# Initialize DB
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app):
+    # Initialize DB
+    await init_db()
+    yield
+    await mission_cache.close()
+    await engine.dispose()
 
-app = FastAPI(title="Core Feeling API")
+app = FastAPI(title="Core Feeling API", lifespan=lifespan)
 
 # --- Pydantic Schemas ---
 class TaskCreate(BaseModel):
@@ -25,75 +39,346 @@ class Task(TaskCreate):
     class Config:
         orm_mode = True
 
+NULLABLE_FIELDS = {"mood"}
+
+class TaskUpdate(BaseModel):
+    title: Optional[str] = None
+    date: Optional[str] = None
+    time: Optional[str] = None
+    priority: Optional[str] = None
+    mood: Optional[str] = None
+    completed: Optional[bool] = None
+
 class Mission(BaseModel):
     mission_tasks: List[Task]
     quick_win: Optional[Task]
     optional_task: Optional[Task]
 
+class TaskPage(BaseModel):
+    items: List[Task]
+    next_cursor: Optional[str]
+
+class BulkError(BaseModel):
+    index: int
+    error: str
+
+class BulkResult(BaseModel):
+    inserted: int
+    failed: int
+    ids: List[Optional[int]]     # per input item, None where it failed
+    errors: List[BulkError]
+    seconds: float
+    rows_per_sec: float
+
+# --- Keyset cursors: an opaque (priority_rank, id) position ---
+def encode_cursor(task):
+    return base64.urlsafe_b64encode(f"{task.priority_rank}:{task.id}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        rank, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(rank), int(task_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# --- Owners: there is no login yet. Clients identify with X-User-Id; requests
+# without it share the unowned tasks, as before ---
+async def current_owner(x_user_id: Optional[int] = Header(None)):
+    return x_user_id
+
+def owned_by(owner):
+    return models.Task.owner_id.is_(None) if owner is None else models.Task.owner_id == owner
+
+# --- Mission ETags: a hash of the cached body ---
+def make_etag(body: bytes):
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
 # --- Endpoints ---
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Core Feeling Backend is Running"}
 
-@app.get("/mission", response_model=Mission)
-def get_daily_mission(db: Session = Depends(get_db)):
+@app.get("/mission", response_model=Mission,
+         responses={304: {"description": "Unchanged since the ETag sent in If-None-Match"}})
+async def get_daily_mission(
+    if_none_match: Optional[str] = Header(None),
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Returns the 'Daily Mission': 3 important tasks, 1 quick win, 1 optional.
+    Cached per owner until one of their tasks changes; send the ETag back in
+    If-None-Match to get a bodyless 304 while it still holds.
     """
-    # Logic: High priority first, then others
-    tasks = db.query(models.Task).filter(models.Task.completed == False).all()
-    
-    # Sort by priority (Simple heuristic: High > Medium > Low)
-    # real impl would use a proper sort key
-    high_priority = [t for t in tasks if t.priority == "High"]
-    medium_priority = [t for t in tasks if t.priority == "Medium"]
-    low_priority = [t for t in tasks if t.priority == "Low"]
-    
-    sorted_tasks = high_priority + medium_priority + low_priority
+    cached = await mission_cache.get(owner)
+    if cached is None:
+        # Read the generation first: a write committed during the queries makes this result stale
+        generation = await mission_cache.generation(owner)
+        body = await build_mission(db, owner)
+        etag = make_etag(body)
+        await mission_cache.put(owner, generation, etag, body)
+    else:
+        etag, body = cached
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "X-User-Id"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def build_mission(db: AsyncSession, owner):
+    """The mission as JSON bytes, ready to cache"""
+    # Logic: High priority first, then others - ordered and cut in SQL on the
+    # (owner_id, completed, priority_rank, id) index, so only five rows are ever read
+    open_tasks = select(models.Task).where(owned_by(owner), models.Task.completed == False)
+    sorted_tasks = (await db.scalars(
+        open_tasks.where(models.Task.priority_rank < models.UNRANKED)
+        .order_by(models.Task.priority_rank, models.Task.id)
+        .limit(5)
+    )).all()
     
     mission_tasks = sorted_tasks[:3]
     
     # Find a quick win (Low priority or just a short task)
-    quick_win = None
-    if low_priority:
-        quick_win = low_priority[0]
-    elif len(sorted_tasks) > 3:
+    quick_win = await db.scalar(
+        open_tasks.where(models.Task.priority_rank == models.PRIORITY_RANKS["Low"])
+        .order_by(models.Task.id)
+        .limit(1)
+    )
+    if quick_win is None and len(sorted_tasks) > 3:
          quick_win = sorted_tasks[3]
 
     optional = sorted_tasks[4] if len(sorted_tasks) > 4 else None
 
-    return {
-        "mission_tasks": mission_tasks,
-        "quick_win": quick_win,
-        "optional_task": optional
-    }
+    # Column by column: pydantic 2 no longer reads orm_mode, so from_orm isn't portable
+    as_task = lambda task: Task(**{field: getattr(task, field) for field in Task.__fields__}) if task is not None else None
+    return Mission(
+        mission_tasks=[as_task(task) for task in mission_tasks],
+        quick_win=as_task(quick_win),
+        optional_task=as_task(optional)
+    ).json().encode()
+
+@app.get("/tasks", response_model=TaskPage)
+async def list_tasks(
+    completed: bool = False,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Tasks in mission order, one page at a time. Pass the returned next_cursor
+    to get the following page. A cursor is (priority_rank, id): the rest of its
+    rank, then the ranks after it. Each half is a seek on the owner/completed/
+    rank/id index, so page 10,000 costs the same as page 1.
+    """
+    query = select(models.Task).where(owned_by(owner), models.Task.completed == completed)
+    if not cursor:
+        items = (await db.scalars(query.order_by(models.Task.priority_rank, models.Task.id).limit(limit + 1))).all()
+    else:
+        # SQLite only seeks a row-value comparison on its first column, then scans the
+        # cursor's whole rank - so split it into two range seeks
+        rank, task_id = decode_cursor(cursor)
+        items = (await db.scalars(
+            query.where(models.Task.priority_rank == rank, models.Task.id > task_id)
+            .order_by(models.Task.id).limit(limit + 1)
+        )).all()
+        if len(items) <= limit:
+            items += (await db.scalars(
+                query.where(models.Task.priority_rank > rank)
+                .order_by(models.Task.priority_rank, models.Task.id).limit(limit + 1 - len(items))
+            )).all()
+    
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
 
 @app.post("/tasks/magic_add", response_model=Task)
-def magic_add(user_input: str, db: Session = Depends(get_db)):
+async def magic_add(
+    user_input: str,
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Simulates AI parsing of a user string into a structured task.
     """
-    # Use AI Engine
-    parsed_data = ai_engine.AIEngine.parse_task_input(user_input)
+    # Use AI Engine - cached, and batched with other requests arriving at the same time
+    parsed_data = await ai_engine.AIEngine.parse_async(user_input)
     
     db_task = models.Task(
         title=parsed_data["title"],
         date=parsed_data["date"],
         time=parsed_data["time"],
         priority=parsed_data["priority"],
-        mood=parsed_data["mood"]
+        mood=parsed_data["mood"],
+        owner_id=owner
     )
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    # Defaults and the new id are filled in by the flush - no refresh round trip needed
+    await db.commit()
+    await mission_cache.invalidate(owner)
     
     return db_task
 
 @app.post("/tasks", response_model=Task)
-def create_task(task: TaskCreate, db: Session = Depends(get_db)):
-    db_task = models.Task(**task.dict())
+async def create_task(
+    task: TaskCreate,
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
+    db_task = models.Task(**task.dict(), owner_id=owner)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await mission_cache.invalidate(owner)
     return db_task
+
+@app.patch("/tasks/{task_id}", response_model=Task)
+async def update_task(
+    task_id: int,
+    changes: TaskUpdate,
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
+    """Edit or complete a task: only the fields sent are changed"""
+    db_task = await db.scalar(select(models.Task).where(models.Task.id == task_id, owned_by(owner)))
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    updates = changes.dict(exclude_unset=True)
+    # Omitted means "leave as is"; an explicit null is only meaningful for mood
+    nulls = [field for field, value in updates.items() if value is None and field not in NULLABLE_FIELDS]
+    if nulls:
+        raise HTTPException(status_code=422, detail=f"Can't be null: {', '.join(nulls)}")
+    for field, value in updates.items():
+        setattr(db_task, field, value)
+    await db.commit()
+    await mission_cache.invalidate(owner)
+    return db_task
+
+# --- Bulk import ---
+BULK_CHUNK = 500    # rows per parse batch and per transaction
+
+async def iter_bulk_items(request: Request):
+    """
+    (index, item, error) for each item of a JSON array body, or of an NDJSON
+    body read line by line as it streams in.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        index, buffer = 0, b""
+        async for piece in request.stream():
+            buffer += piece
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *decode_bulk_line(line))
+                    index += 1
+        if buffer.strip():
+            yield (index, *decode_bulk_line(buffer))
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array (or an NDJSON body)")
+    for index, item in enumerate(items):
+        yield index, item, None
+
+def decode_bulk_line(line: bytes):
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+async def bulk_rows(chunk):
+    """Validate a chunk -> (rows to insert, their positions in the chunk, errors by position)"""
+    errors = {}
+    # Plain strings go through the AI parser, one batch per chunk, off the event loop
+    texts = [(pos, item) for pos, (_, item, error) in enumerate(chunk) if error is None and isinstance(item, str)]
+    parsed = {}
+    if texts:
+        results = await asyncio.to_thread(ai_engine.AIEngine.parse_batch, [text for _, text in texts])
+        parsed = dict(zip((pos for pos, _ in texts), results))
+
+    rows, positions = [], []
+    for pos, (_, item, error) in enumerate(chunk):
+        if error is None and pos not in parsed and not isinstance(item, dict):
+            error = "Expected a task object or a string"
+        if error:
+            errors[pos] = error
+            continue
+        try:
+            task = TaskCreate(**parsed.get(pos, item))
+        except ValidationError as e:
+            errors[pos] = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            continue
+        rows.append(task.dict())
+        positions.append(pos)
+    return rows, positions, errors
+
+async def insert_bulk_chunk(db: AsyncSession, chunk, result, owner):
+    rows, positions, errors = await bulk_rows(chunk)
+    for row in rows:
+        row["owner_id"] = owner
+    ids = [None] * len(chunk)
+    if rows:
+        try:
+            # One executemany and one commit per chunk. RETURNING in input order would
+            # fall back to a statement per row on SQLite; instead, rows inserted under
+            # one write lock get consecutive INTEGER PRIMARY KEY ids ending at the last one
+            await db.execute(insert(models.Task), rows)
+            last_id = await db.scalar(text("SELECT last_insert_rowid()"))
+            await db.commit()
+            await mission_cache.invalidate(owner)
+            new_ids = range(last_id - len(rows) + 1, last_id + 1)
+            for pos, task_id in zip(positions, new_ids):
+                ids[pos] = task_id
+            result["inserted"] += len(new_ids)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for pos in positions:
+                errors[pos] = f"Database error: {e.__class__.__name__}"
+    for pos, error in sorted(errors.items()):
+        result["errors"].append({"index": chunk[pos][0], "error": error})
+    result["ids"].extend(ids)
+
+@app.post("/tasks/bulk", response_model=BulkResult)
+async def bulk_add(
+    request: Request,
+    owner: Optional[int] = Depends(current_owner),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Imports many tasks in one request. The body is a JSON array, or NDJSON
+    (Content-Type: application/x-ndjson) which is processed while it streams.
+    Each item is a task object, or a string that is parsed like magic_add.
+    Rows go in BULK_CHUNK at a time, one transaction per chunk. Failures are
+    reported per item, and the rest of the batch still goes in.
+    """
+    started = time.perf_counter()
+    result = {"inserted": 0, "ids": [], "errors": []}
+    chunk = []
+    async for entry in iter_bulk_items(request):
+        chunk.append(entry)
+        if len(chunk) >= BULK_CHUNK:
+            await insert_bulk_chunk(db, chunk, result, owner)
+            chunk = []
+    if chunk:
+        await insert_bulk_chunk(db, chunk, result, owner)
+
+    seconds = time.perf_counter() - started
+    result["failed"] = len(result["errors"])
+    result["seconds"] = round(seconds, 4)
+    result["rows_per_sec"] = round(result["inserted"] / seconds, 1) if seconds else 0.0
+    return result
+
+@app.get("/ai/metrics")
+async def ai_metrics():
+    """Parser cache hit rates and batch sizes"""
+    return ai_engine.AIEngine.metrics()
@@ -1,9 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 Base = declarative_base()
 
+# Mission order: High > Medium > Low, anything else last
+PRIORITY_RANKS = {"High": 0, "Medium": 1, "Low": 2}
+UNRANKED = 3
+
+def priority_rank(priority):
+    return PRIORITY_RANKS.get(priority, UNRANKED)
+
+def _rank_default(context):
+    return priority_rank(context.get_current_parameters().get("priority"))
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -18,8 +28,20 @@ class Task(Base):
     date = Column(String)
     time = Column(String)
     priority = Column(String) # High, Medium, Low
+    # Stored so SQL can order by it through an index; follows priority on insert and on edit
+    priority_rank = Column(Integer, default=_rank_default, nullable=False)
     mood = Column(String, nullable=True)
     completed = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"))
 
     owner = relationship("User", back_populates="tasks")
+
+    @validates("priority")
+    def _set_rank(self, key, priority):
+        self.priority_rank = priority_rank(priority)
+        return priority
+
+    __table_args__ = (
+        # Serves each owner's mission query and /tasks keyset pages without a sort step
+        Index("ix_tasks_owner_completed_rank_id", "owner_id", "completed", "priority_rank", "id"),
+    )
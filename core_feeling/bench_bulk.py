@@ -0,0 +1,62 @@
+"""
+Measures task import throughput (rows/sec) on a scratch database: one POST
+/tasks per row against /tasks/bulk with a JSON array and with NDJSON.
+
+    python bench_bulk.py --rows 20000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk task import")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--single-rows", type=int, default=1_000, help="Rows for the one-request-per-row baseline")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["CORE_FEELING_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bulk.db')}"
+    # A fresh parse cache, so the string import really goes through the parser
+    os.environ["CORE_FEELING_AI_CACHE"] = os.path.join(tmp, "ai_cache.db")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    tasks = [{"title": f"Imported task {i}", "priority": ("High", "Medium", "Low")[i % 3]} for i in range(args.rows)]
+    texts = [f"urgent imported task {i} tomorrow" if i % 4 == 0 else f"imported task {i}" for i in range(args.rows)]
+    results = []
+
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        for task in tasks[:args.single_rows]:
+            assert client.post("/tasks", json=task).status_code == 200
+        results.append(("POST /tasks, one per row", args.single_rows, time.perf_counter() - start))
+
+        start = time.perf_counter()
+        body = client.post("/tasks/bulk", json=tasks).json()
+        results.append(("/tasks/bulk, JSON objects", body["inserted"], time.perf_counter() - start))
+
+        ndjson = "\n".join(json.dumps(task) for task in tasks).encode()
+        start = time.perf_counter()
+        body = client.post("/tasks/bulk", content=ndjson, headers={"content-type": "application/x-ndjson"}).json()
+        results.append(("/tasks/bulk, NDJSON objects", body["inserted"], time.perf_counter() - start))
+
+        start = time.perf_counter()
+        # The parser logs every batch; keep that out of the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            body = client.post("/tasks/bulk", json=texts).json()
+        results.append(("/tasks/bulk, JSON strings (AI parse)", body["inserted"], time.perf_counter() - start))
+
+    print(f"  {'import':<38}{'rows':>8}{'seconds':>10}{'rows/sec':>12}")
+    for label, rows, seconds in results:
+        print(f"  {label:<38}{rows:>8,}{seconds:>10.2f}{rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Seeds a scratch SQLite database with N tasks and measures /mission and /tasks
+latency (p50/p99) through the FastAPI app. /mission is timed computed fresh,
+served from the mission cache, and revalidated with If-None-Match (304).
+
+    python bench_mission.py --tasks 1000000
+    python bench_mission.py --tasks 100000 --legacy   # also time the old load-everything mission
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered) * 1000, p99 * 1000
+
+
+def seed(engine, models, count, batch=50_000):
+    rng = random.Random(42)
+    priorities = ["High", "Medium", "Low"]
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, count, batch):
+            rows = [
+                {
+                    "title": f"Task {offset + i}",
+                    "date": "Today",
+                    "time": "Flexible",
+                    "priority": rng.choices(priorities, weights=(1, 3, 6))[0],
+                    "mood": "Neutral",
+                    # Most of a long-lived backlog is done
+                    "completed": rng.random() < 0.7,
+                }
+                for i in range(min(batch, count - offset))
+            ]
+            conn.execute(models.Task.__table__.insert(), rows)
+    return time.perf_counter() - start
+
+
+def legacy_mission(db, models):
+    """The previous implementation: every open task into Python, bucketed by priority"""
+    tasks = db.query(models.Task).filter(models.Task.completed == False).all()
+    high = [t for t in tasks if t.priority == "High"]
+    medium = [t for t in tasks if t.priority == "Medium"]
+    low = [t for t in tasks if t.priority == "Low"]
+    return (high + medium + low)[:5]
+
+
+def timed(client, url, runs, headers=None, status=200, before=None):
+    samples = []
+    for _ in range(runs):
+        if before:
+            before()
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == status, response.text
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mission and task listing endpoints")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--legacy", action="store_true", help="Also time the old Python-side mission")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    # Must be set before the backend creates its engine
+    os.environ["CORE_FEELING_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+    from backend import models
+    from backend.database import DATABASE_URL
+    from backend.cache import mission_cache
+    from backend.main import app, encode_cursor
+
+    # Seeding and the old-style query use a plain synchronous engine; the app runs its own async one
+    engine = create_engine(DATABASE_URL)
+    models.Base.metadata.create_all(bind=engine)
+    seconds = seed(engine, models, args.tasks)
+    print(f"Seeded {args.tasks:,} tasks in {seconds:.1f}s")
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE owner_id IS NULL AND completed = 0 AND priority_rank < 3 "
+            "ORDER BY priority_rank, id LIMIT 5"
+        )).fetchall()
+        print("Mission plan:", "; ".join(row[-1] for row in plan))
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE owner_id IS NULL AND completed = 0 AND priority_rank = 1 "
+            "AND id > 500 ORDER BY id LIMIT 51"
+        )).fetchall()
+        print("Cursor plan:", "; ".join(row[-1] for row in plan))
+        open_count = conn.execute(text("SELECT COUNT(*) FROM tasks WHERE completed = 0")).scalar()
+
+    # Entering the client runs the app's startup (init_db)
+    with TestClient(app) as client:
+        # Dropping the cached entry before each request times the queries themselves
+        uncached = timed(client, "/mission", args.runs, before=lambda: asyncio.run(mission_cache.invalidate(None)))
+        etag = client.get("/mission").headers["ETag"]
+        rows = [("GET /mission (computed)", uncached),
+                ("GET /mission (cached)", timed(client, "/mission", args.runs)),
+                ("GET /mission (304)", timed(client, "/mission", args.runs, {"If-None-Match": etag}, status=304)),
+                ("GET /tasks (first page)", timed(client, "/tasks?limit=50", args.runs))]
+
+        # Deep pages: cursors at random positions through the open backlog
+        rng = random.Random(7)
+        deep = []
+        for _ in range(args.runs):
+            task = models.Task(id=rng.randrange(args.tasks), priority_rank=rng.randrange(3))
+            start = time.perf_counter()
+            response = client.get(f"/tasks?limit=50&cursor={encode_cursor(task)}")
+            deep.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+        rows.append(("GET /tasks (deep cursor)", deep))
+
+    if args.legacy:
+        db = Session(engine)
+        runs = max(args.runs // 20, 3)
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            legacy_mission(db, models)
+            samples.append(time.perf_counter() - start)
+        db.close()
+        rows.append((f"old mission, no HTTP ({runs} runs)", samples))
+
+    print(f"\n{open_count:,} open tasks, {args.runs} requests each:")
+    print(f"  {'endpoint':<32}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, samples in rows:
+        p50, p99 = percentiles(samples)
+        print(f"  {label:<32}{p50:10.2f}{p99:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
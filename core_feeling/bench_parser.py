@@ -0,0 +1,74 @@
+"""
+Measures the AI parser under concurrent magic_add-style load: N coroutines
+parse at once against the simulated remote backend, first one call per
+request, then micro-batched, then again with a warm cache.
+
+    python bench_parser.py --requests 200 --latency 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+
+async def parse_all(parser, texts):
+    return await asyncio.gather(*(parser.parse(text) for text in texts))
+
+
+def run(label, parser, texts):
+    """-> (label, seconds, metrics for this run alone)"""
+    before = parser.metrics()
+    start = time.perf_counter()
+    asyncio.run(parse_all(parser, texts))
+    seconds = time.perf_counter() - start
+    after = parser.metrics()
+    # The parser's counters are cumulative - report the difference this run made
+    batches = list(parser.batcher.sizes)[before["batching"]["batches"]:]
+    hits = sum(after["cache"][k] - before["cache"][k] for k in ("memory_hits", "disk_hits"))
+    misses = after["cache"]["misses"] - before["cache"]["misses"]
+    return label, seconds, {
+        "calls": after["backend_calls"] - before["backend_calls"],
+        "avg_batch": round(sum(batches) / len(batches), 2) if batches else 0,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser batching and caching")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--unique", type=int, default=150, help="Distinct inputs among the requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated model round trip (seconds)")
+    parser.add_argument("--window-ms", type=float, default=10)
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from backend.ai_engine import RemoteBackend, TaskParser
+
+    texts = [f"call client {i % args.unique} tomorrow at {i % 12 + 1}pm" for i in range(args.requests)]
+    tmp = tempfile.mkdtemp()
+    # An empty API key (not just a missing one) forces the stub: it sleeps for the round trip and answers with the rules
+    backend = RemoteBackend(api_key="", simulated_latency=args.latency)
+    unbatched = TaskParser(backend, cache_path=os.path.join(tmp, "a.db"), max_batch=1)
+    batched = TaskParser(backend, cache_path=os.path.join(tmp, "b.db"),
+                         window=args.window_ms / 1000, max_batch=args.max_batch)
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows.append(run("one call per request", unbatched, texts))
+        rows.append(run("micro-batched", batched, texts))
+        rows.append(run("micro-batched, warm cache", batched, texts))
+
+    print(f"{args.requests} concurrent requests, {args.unique} distinct, {args.latency * 1000:.0f} ms model latency")
+    print(f"  {'mode':<28}{'seconds':>9}{'req/s':>9}{'calls':>7}{'avg batch':>11}{'hit rate':>10}")
+    for label, seconds, m in rows:
+        print(f"  {label:<28}{seconds:>9.2f}{args.requests / seconds:>9,.0f}{m['calls']:>7}"
+              f"{m['avg_batch']:>11}{m['hit_rate']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,20 @@ import json
 API_URL = "http://127.0.0.1:8000"
 
 class MissionScreen(MDScreen):
+    etag = None # Of the mission on screen
+
     def on_enter(self):
         self.fetch_mission()
 
     def fetch_mission(self):
         try:
             # In a real app, do this asynchronously
-            response = requests.get(f"{API_URL}/mission")
+            headers = {"If-None-Match": self.etag} if self.etag else {}
+            response = requests.get(f"{API_URL}/mission", headers=headers)
             if response.status_code == 200:
+                self.etag = response.headers.get("ETag")
                 self.render_mission(response.json())
+            # 304: nothing changed, the cards already shown are current
         except Exception as e:
             print(f"Error fetching mission: {e}")
 
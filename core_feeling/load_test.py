@@ -0,0 +1,137 @@
+"""
+Local load test for the Core Feeling API. Seeds a scratch SQLite database,
+starts the app under uvicorn, and keeps N concurrent clients busy for a fixed
+time. Reports requests/sec and latency percentiles.
+
+The request mix is mostly mission reads, with some task pages and writes:
+
+    python load_test.py --tasks 20000 --concurrency 64 --seconds 15
+    python load_test.py --url http://127.0.0.1:8000     # an already running server
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (weight, method, path, json body)
+MIX = [
+    (80, "GET", "/mission", None),
+    (15, "GET", "/tasks?limit=20", None),
+    (5, "POST", "/tasks", {"title": "Load test task", "priority": "Medium"}),
+]
+
+
+def seed(url, count):
+    """Create the schema and bulk-insert tasks with a plain synchronous engine"""
+    sys.path.insert(0, HERE)
+    from sqlalchemy import create_engine
+    from backend import models
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    rows = [
+        {"title": f"Task {i}", "date": "Today", "time": "Flexible", "mood": "Neutral",
+         "priority": rng.choice(["High", "Medium", "Low"]), "completed": rng.random() < 0.7}
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        if rows:
+            conn.execute(models.Task.__table__.insert(), rows)
+    engine.dispose()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url, port):
+    env = dict(os.environ, CORE_FEELING_DATABASE_URL=database_url)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Server didn't start")
+
+
+async def run_load(base_url, concurrency, seconds):
+    weights = [m[0] for m in MIX]
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(seed):
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                _, method, path, body = rng.choices(MIX, weights)[0]
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Core Feeling API")
+    parser.add_argument("--url", default=None, help="Test a running server instead of starting one")
+    parser.add_argument("--tasks", type=int, default=20_000, help="Tasks to seed in the scratch database")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--warmup", type=float, default=2)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "load.db")
+        seed(f"sqlite:///{path}", args.tasks)
+        port = free_port()
+        server = start_server(f"sqlite:///{path}", port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        if args.warmup:
+            asyncio.run(run_load(base_url, args.concurrency, args.warmup))
+        latencies, errors, elapsed = asyncio.run(run_load(base_url, args.concurrency, args.seconds))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{len(latencies):,} requests in {elapsed:.1f}s with {args.concurrency} clients: "
+          f"{len(latencies) / elapsed:,.0f} req/s, {errors} errors")
+    print(f"latency ms: p50 {pct(0.5):.1f}  p90 {pct(0.9):.1f}  p99 {pct(0.99):.1f}  max {latencies[-1] * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
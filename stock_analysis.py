@@ -0,0 +1,242 @@
+"""
+Headless analysis pipeline for the AI Stock Analyzer.
+
+Fetch (through the price cache), indicators and the text report, without
+tkinter or matplotlib, so it can run on servers and in scripts:
+
+    python stock_analysis.py AAPL MSFT --format json
+    python stock_analysis.py --symbols-file sp500.txt --workers 8 --format csv
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from stock_cache import PriceCache, make_provider, DEFAULT_CACHE_PATH
+from stock_indicators import IndicatorEngine
+
+HISTORY_DAYS = 180
+
+
+def fetch_history(cache, symbol, days=HISTORY_DAYS):
+    """The analysis window of daily bars, served from the cache"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    return cache.get_history(symbol, start_date, end_date)
+
+
+def build_report(symbol, indicators):
+    """The AI technical analysis text for one symbol of an IndicatorResult"""
+    analysis = []
+
+    # Technical indicators come from the shared indicator result
+    summary = indicators.summary(symbol)
+    current_price = summary['price']
+    sma20 = summary['sma20']
+    sma50 = summary['sma50']
+    current_rsi = summary['rsi']
+    volatility = summary['volatility']
+
+    # Add header
+    analysis.append(f"🤖 AI TECHNICAL ANALYSIS - {symbol}\n")
+    analysis.append("=" * 60 + "\n\n")
+
+    # Price trend analysis
+    analysis.append("📊 TREND ANALYSIS:\n")
+    if current_price > sma20 > sma50:
+        analysis.append("✅ Strong Uptrend - Price above both moving averages\n")
+    elif current_price > sma20:
+        analysis.append("⚠️ Bullish - Price above 20-day MA\n")
+    elif current_price < sma20 < sma50:
+        analysis.append("❌ Downtrend - Price below both moving averages\n")
+    else:
+        analysis.append("⚠️ Bearish - Price below 20-day MA\n")
+
+    analysis.append(f"   Current: ${current_price:.2f}\n")
+    analysis.append(f"   SMA 20: ${sma20:.2f}\n")
+    analysis.append(f"   SMA 50: ${sma50:.2f}\n\n")
+
+    # RSI analysis
+    analysis.append("📈 RSI INDICATOR:\n")
+    analysis.append(f"   RSI (14, Wilder): {current_rsi:.2f}\n")
+    if current_rsi > 70:
+        analysis.append("   ⚠️ OVERBOUGHT - Potential sell signal\n")
+    elif current_rsi < 30:
+        analysis.append("   ✅ OVERSOLD - Potential buy signal\n")
+    else:
+        analysis.append("   ➡️ NEUTRAL - No extreme signal\n")
+    analysis.append("\n")
+
+    # MACD analysis
+    if 'macd' in indicators:
+        macd = indicators.latest('macd', symbol)
+        macd_signal = indicators.latest('macd_signal', symbol)
+        analysis.append("📉 MACD (12, 26, 9):\n")
+        analysis.append(f"   MACD: {macd:.2f} | Signal: {macd_signal:.2f}\n")
+        if macd > macd_signal:
+            analysis.append("   ✅ Bullish momentum - MACD above signal line\n")
+        else:
+            analysis.append("   ⚠️ Bearish momentum - MACD below signal line\n")
+        analysis.append("\n")
+
+    # Bollinger bands
+    if 'bb_upper' in indicators:
+        upper = indicators.latest('bb_upper', symbol)
+        lower = indicators.latest('bb_lower', symbol)
+        analysis.append("📏 BOLLINGER BANDS (20, 2):\n")
+        analysis.append(f"   Upper: ${upper:.2f} | Lower: ${lower:.2f}\n")
+        if current_price > upper:
+            analysis.append("   ⚠️ Above upper band - Stretched to the upside\n")
+        elif current_price < lower:
+            analysis.append("   ✅ Below lower band - Stretched to the downside\n")
+        else:
+            analysis.append("   ➡️ Inside the bands\n")
+        analysis.append("\n")
+
+    # Volatility analysis
+    analysis.append("💹 VOLATILITY:\n")
+    analysis.append(f"   Annualized: {volatility:.2f}%\n")
+    if 'atr14' in indicators:
+        analysis.append(f"   ATR (14): ${indicators.latest('atr14', symbol):.2f}\n")
+    if volatility > 40:
+        analysis.append("   ⚠️ HIGH - Higher risk/reward\n")
+    elif volatility < 20:
+        analysis.append("   ✅ LOW - More stable\n")
+    else:
+        analysis.append("   ➡️ MODERATE\n")
+    analysis.append("\n")
+
+    # AI Recommendation
+    analysis.append("🎯 AI RECOMMENDATION:\n")
+    score = summary['score']
+    if score >= 3:
+        analysis.append("   💚 BULLISH - Strong buy signals\n")
+    elif score == 2:
+        analysis.append("   💛 NEUTRAL - Hold or wait for confirmation\n")
+    else:
+        analysis.append("   ❤️ BEARISH - Caution advised\n")
+
+    return "".join(analysis)
+
+
+def _clean(value):
+    """JSON has no NaN - missing indicator values become null"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def analyze_symbol(symbol, cache, engine=None, days=HISTORY_DAYS, with_info=True):
+    """Run the full pipeline for one symbol and return a plain dict"""
+    symbol = symbol.strip().upper()
+    engine = engine or IndicatorEngine()
+    data = fetch_history(cache, symbol, days)
+    if data.empty:
+        return {"symbol": symbol, "error": "no data"}
+
+    indicators = engine.compute_frame(data, symbol)
+    info = cache.get_info(symbol) if with_info else {}
+    result = {"symbol": symbol, "as_of": data.index[-1].strftime("%Y-%m-%d"), "bars": len(data)}
+    result.update(indicators.summary(symbol))
+    for name in ("ema12", "ema26", "macd", "macd_signal", "bb_upper", "bb_lower", "atr14"):
+        if name in indicators:
+            result[name] = indicators.latest(name, symbol)
+    result["market_cap"] = info.get("marketCap")
+    result["pe_ratio"] = info.get("trailingPE")
+    result["report"] = build_report(symbol, indicators)
+    return {key: _clean(value) for key, value in result.items()}
+
+
+# --- Worker processes: one cache/engine per process, created once ---
+
+_worker = {}
+
+
+def _init_worker(provider_spec, cache_path, with_info):
+    _worker["cache"] = PriceCache(make_provider(provider_spec), path=cache_path)
+    _worker["engine"] = IndicatorEngine()
+    _worker["with_info"] = with_info
+
+
+def _analyze_in_worker(symbol):
+    try:
+        return analyze_symbol(symbol, _worker["cache"], _worker["engine"], with_info=_worker["with_info"])
+    except Exception as e:
+        return {"symbol": symbol.strip().upper(), "error": str(e)}
+
+
+def analyze_many(symbols, workers=1, provider_spec=None, cache_path=DEFAULT_CACHE_PATH, with_info=True):
+    """Analyze symbols (in input order), across `workers` processes when > 1"""
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    if workers <= 1 or len(symbols) <= 1:
+        _init_worker(provider_spec, cache_path, with_info)
+        return [_analyze_in_worker(s) for s in symbols]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(provider_spec, cache_path, with_info)
+    ) as pool:
+        return list(pool.map(_analyze_in_worker, symbols, chunksize=max(1, len(symbols) // (workers * 4))))
+
+
+CSV_FIELDS = ["symbol", "as_of", "price", "change_pct", "sma20", "sma50", "rsi", "volatility",
+              "macd", "macd_signal", "atr14", "score", "signal", "market_cap", "pe_ratio", "error"]
+
+
+def write_results(results, fmt, out):
+    if fmt == "json":
+        json.dump(results, out, indent=2, ensure_ascii=False)
+        out.write("\n")
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        for result in results:
+            if "error" in result:
+                out.write(f"{result['symbol']}: {result['error']}\n\n")
+            else:
+                out.write(result["report"] + "\n")
+
+
+def read_symbols_file(path):
+    """One symbol per line or comma/space separated; # starts a comment"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [s for line in f for s in line.split("#", 1)[0].replace(",", " ").split()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="analyze", description="Headless AI stock analysis")
+    parser.add_argument("symbols", nargs="*", help="Ticker symbols, e.g. AAPL MSFT")
+    parser.add_argument("--symbols-file", help="File with one symbol per line")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default 1)")
+    parser.add_argument("--provider", help='"yfinance" or "fixture:<dir>" (default: $STOCK_ANALYZER_PROVIDER)')
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Price cache database path")
+    parser.add_argument("--no-info", action="store_true", help="Skip fundamentals (market cap, P/E)")
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        symbols += read_symbols_file(args.symbols_file)
+    if not symbols:
+        parser.error("no symbols given")
+
+    results = analyze_many(
+        symbols,
+        workers=args.workers or os.cpu_count(),
+        provider_spec=args.provider,
+        cache_path=args.cache,
+        with_info=not args.no_info
+    )
+    write_results(results, args.format, sys.stdout)
+    return 1 if all("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
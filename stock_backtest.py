@@ -0,0 +1,193 @@
+"""
+Vectorized backtester for the AI RECOMMENDATION score.
+
+The scoring rule from perform_technical_analysis is evaluated on every
+historical bar of every symbol at once: (n_symbols, n_bars) arrays in,
+positions out, no per-day Python loops. A signal at bar t's close earns
+bar t+1's return. The portfolio holds an equal-weight sleeve per symbol.
+
+    python stock_backtest.py AAPL MSFT NVDA --years 10 --rule score_long
+"""
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from stock_indicators import IndicatorEngine, TRADING_DAYS, rolling_std, score_recommendation
+
+# Volatility used by the live score is measured over the ~6 month analysis window
+VOL_WINDOW = 125
+
+
+def rolling_volatility(returns, window=VOL_WINDOW):
+    """Annualized volatility (%) of the trailing `window` returns - no look-ahead"""
+    return rolling_std(returns, window, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+
+def daily_scores(result, vol_window=VOL_WINDOW, **thresholds):
+    """The 0-4 recommendation score as it would have read at every bar's close"""
+    volatility = rolling_volatility(result["returns"], vol_window)
+    scores = score_recommendation(
+        result.close, result["sma20"], result["sma50"], result["rsi14"], volatility, **thresholds
+    )
+    # No score until every input exists
+    ready = np.isfinite(result["sma50"]) & np.isfinite(result["rsi14"]) & np.isfinite(volatility)
+    return np.where(ready, scores, -1)
+
+
+# --- Rules: IndicatorResult -> target position per (symbol, bar) in [-1, 1] ---
+
+def rule_score_long(result, **kwargs):
+    """Long while the score reads BULLISH (>= 3), flat otherwise"""
+    return (daily_scores(result, **kwargs) >= 3).astype(float)
+
+
+def rule_score_long_short(result, **kwargs):
+    """Long on BULLISH, short on BEARISH (<= 1), flat on NEUTRAL"""
+    scores = daily_scores(result, **kwargs)
+    return np.where(scores >= 3, 1.0, np.where((scores >= 0) & (scores <= 1), -1.0, 0.0))
+
+
+def rule_score_scaled(result, **kwargs):
+    """Exposure proportional to the score: 0, 25, 50, 75 or 100% long"""
+    return np.clip(daily_scores(result, **kwargs), 0, 4) / 4.0
+
+
+def rule_trend(result, **kwargs):
+    """Baseline: long while price is above SMA 50"""
+    with np.errstate(invalid="ignore"):
+        return (result.close > result["sma50"]).astype(float)
+
+
+def rule_buy_and_hold(result, **kwargs):
+    return np.where(np.isfinite(result.close), 1.0, 0.0)
+
+
+RULES = {
+    "score_long": rule_score_long,
+    "score_long_short": rule_score_long_short,
+    "score_scaled": rule_score_scaled,
+    "trend": rule_trend,
+    "buy_and_hold": rule_buy_and_hold,
+}
+
+
+def max_drawdown(returns):
+    """Worst peak-to-trough fall of the compounded returns along the last axis"""
+    equity = np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return (equity / peak - 1).min(axis=-1)
+
+
+def performance(positions, returns, cost_bps=5.0):
+    """
+    Metrics for target positions (n_symbols, n_bars) against simple returns.
+    Signal at t's close is held over t+1; each symbol gets an equal-weight sleeve.
+    """
+    positions = np.nan_to_num(np.asarray(positions, dtype=float))
+    held = np.zeros_like(positions)
+    held[:, 1:] = positions[:, :-1]
+    asset_returns = np.nan_to_num(returns)
+
+    trades = np.abs(np.diff(held, axis=1, prepend=0.0))
+    strategy = held * asset_returns - trades * cost_bps / 10_000
+
+    portfolio = strategy.mean(axis=0)
+    n_bars = portfolio.shape[0]
+    years = max(n_bars / TRADING_DAYS, 1e-9)
+    total = float(np.prod(1 + portfolio) - 1)
+    vol = float(portfolio.std(ddof=1) * np.sqrt(TRADING_DAYS)) if n_bars > 1 else float("nan")
+
+    # Hit rate: share of exposed symbol-days where the position made money
+    exposed = held != 0
+    hits = (held * asset_returns > 0) & exposed
+
+    return {
+        "bars": n_bars,
+        "total_return": total,
+        "cagr": float((1 + total) ** (1 / years) - 1) if total > -1 else -1.0,
+        "volatility": vol,
+        "sharpe": float(portfolio.mean() * TRADING_DAYS / vol) if vol else float("nan"),
+        "max_drawdown": float(max_drawdown(portfolio)),
+        "hit_rate": float(hits.sum() / exposed.sum()) if exposed.any() else float("nan"),
+        "exposure": float(exposed.mean()),
+        # Average one-way turnover per year, as a fraction of capital
+        "turnover": float(trades.mean(axis=0).sum() / years),
+        "strategy": strategy,
+        "returns": portfolio,
+    }
+
+
+def backtest(result, rule="score_long", cost_bps=5.0, **rule_kwargs):
+    """
+    Run a rule over an IndicatorResult and return the metrics dict.
+    `rule` is a name from RULES or any callable(result, **kwargs) -> positions.
+    """
+    rule_fn = RULES[rule] if isinstance(rule, str) else rule
+    metrics = performance(rule_fn(result, **rule_kwargs), result["returns"], cost_bps)
+
+    strategy = metrics.pop("strategy")
+    per_symbol_total = np.prod(1 + strategy, axis=1) - 1
+    metrics["rule"] = rule if isinstance(rule, str) else getattr(rule, "__name__", "custom")
+    metrics["symbols"] = len(result.symbols)
+    metrics["per_symbol"] = {
+        symbol: {
+            "total_return": float(per_symbol_total[i]),
+            "max_drawdown": float(max_drawdown(strategy[i]))
+        }
+        for i, symbol in enumerate(result.symbols)
+    }
+    return metrics
+
+
+def load_frames(cache, symbols, start, end=None):
+    """{symbol: OHLCV DataFrame} pulled through the price cache"""
+    frames = {}
+    for symbol in symbols:
+        data = cache.get_history(symbol, start, end)
+        if data.empty:
+            print(f"Skipping {symbol}: no data")
+            continue
+        frames[symbol.upper()] = data
+    return frames
+
+
+def load_universe(cache, symbols, start, end=None):
+    """Pull every symbol through the price cache and compute the score inputs"""
+    return IndicatorEngine({}).compute_frames(load_frames(cache, symbols, start, end))
+
+
+def format_report(metrics):
+    lines = [
+        f"Rule: {metrics['rule']} | {metrics['symbols']} symbols x {metrics['bars']} bars",
+        f"  Total return : {metrics['total_return'] * 100:+.2f}%",
+        f"  CAGR         : {metrics['cagr'] * 100:+.2f}%",
+        f"  Volatility   : {metrics['volatility'] * 100:.2f}%",
+        f"  Sharpe       : {metrics['sharpe']:.2f}",
+        f"  Max drawdown : {metrics['max_drawdown'] * 100:.2f}%",
+        f"  Hit rate     : {metrics['hit_rate'] * 100:.1f}%",
+        f"  Exposure     : {metrics['exposure'] * 100:.1f}%",
+        f"  Turnover     : {metrics['turnover']:.2f}x / year",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    from stock_cache import PriceCache
+
+    parser = argparse.ArgumentParser(description="Backtest the AI recommendation score")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--rule", choices=sorted(RULES), nargs="+", default=["score_long", "buy_and_hold"])
+    parser.add_argument("--cost-bps", type=float, default=5.0)
+    args = parser.parse_args()
+
+    end = datetime.now()
+    result = load_universe(PriceCache(), args.symbols, end - timedelta(days=365 * args.years), end)
+    for rule in args.rule:
+        print(format_report(backtest(result, rule, cost_bps=args.cost_bps)))
+        print()
+
+
+if __name__ == "__main__":
+    main()
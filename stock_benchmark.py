@@ -0,0 +1,128 @@
+"""
+Benchmarks for the AI Stock Analyzer engines.
+
+Runs on synthetic random-walk prices so no network or cache is needed:
+
+    python stock_benchmark.py indicators --symbols 1000 --years 5
+    python stock_benchmark.py chart --points 1000000
+    python stock_benchmark.py backtest --symbols 500 --years 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from stock_indicators import IndicatorEngine, TRADING_DAYS
+
+
+def random_walk(n_symbols, n_bars, seed=42):
+    """Synthetic OHLC arrays shaped (n_symbols, n_bars)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.02, size=(n_symbols, n_bars))
+    close = 100 * np.exp(np.cumsum(returns, axis=1))
+    spread = np.abs(rng.normal(0, 0.01, size=(n_symbols, n_bars))) * close
+    return close, close + spread, close - spread
+
+
+def bench_indicators(args):
+    n_bars = args.years * TRADING_DAYS
+    close, high, low = random_walk(args.symbols, n_bars)
+    engine = IndicatorEngine()
+
+    engine.compute(close[:10, :100], high[:10, :100], low[:10, :100])  # warm up
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        engine.compute(close, high, low)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"Indicators: {args.symbols} symbols x {args.years} years ({n_bars} bars)")
+    print(f"  indicators : {', '.join(f'{k}{v}' for k, v in engine.indicators.items())}")
+    print(f"  best       : {best * 1000:.1f} ms  (median {np.median(timings) * 1000:.1f} ms over {args.repeat} runs)")
+    print(f"  throughput : {args.symbols / best:,.0f} symbols/s, {args.symbols * n_bars / best / 1e6:,.1f} M bars/s")
+
+
+def bench_chart(args):
+    # Agg canvas: same artists/blitting code path as the Tk canvas, without a display
+    import matplotlib
+    matplotlib.use("Agg")
+    import pandas as pd
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from stock_chart import PriceChart
+
+    fig = Figure(figsize=(10, 5), dpi=100)
+    ax = fig.add_subplot(111)
+    canvas = FigureCanvasAgg(fig)
+    chart = PriceChart(fig, ax, canvas)
+
+    close, high, low = random_walk(1, args.points)
+    index = pd.date_range("2000-01-01", periods=args.points, freq="min")
+    result = IndicatorEngine({}).compute(close, high, low, symbols=["BENCH"], index=index)
+
+    chart.show(result, "BENCH")  # first draw warms font/text caches
+    start = time.perf_counter()
+    chart.show(result, "BENCH")
+    full = time.perf_counter() - start
+
+    timings = []
+    last = index[-1]
+    for i in range(args.repeat * 20):
+        value = close[0, -1] * (1 + 0.0001 * np.sin(i))
+        start = time.perf_counter()
+        chart.update_last(last, {"close": value, "sma20": value, "sma50": value}, append=False)
+        timings.append(time.perf_counter() - start)
+
+    print(f"Chart: {args.points:,} points downsampled to {chart.shown} for a {int(ax.bbox.width)} px axes")
+    print(f"  full draw (downsample + render) : {full * 1000:.1f} ms")
+    print(f"  live update (blit)              : {np.median(timings) * 1000:.2f} ms median, "
+          f"{np.percentile(timings, 99) * 1000:.2f} ms p99")
+
+
+def bench_backtest(args):
+    from stock_backtest import backtest, RULES
+
+    n_bars = args.years * TRADING_DAYS
+    close, high, low = random_walk(args.symbols, n_bars)
+
+    start = time.perf_counter()
+    result = IndicatorEngine({}).compute(close, high, low)
+    indicators = time.perf_counter() - start
+
+    print(f"Backtest: {args.symbols} symbols x {args.years} years ({n_bars} bars)")
+    print(f"  indicators : {indicators * 1000:.1f} ms")
+    for rule in sorted(RULES):
+        start = time.perf_counter()
+        metrics = backtest(result, rule)
+        elapsed = time.perf_counter() - start
+        print(f"  {rule:<17}: {elapsed * 1000:7.1f} ms  (total {metrics['total_return'] * 100:+.1f}%, "
+              f"hit rate {metrics['hit_rate'] * 100:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Stock Analyzer benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ind = sub.add_parser("indicators", help="Indicator engine throughput")
+    ind.add_argument("--symbols", type=int, default=1000)
+    ind.add_argument("--years", type=int, default=5)
+    ind.add_argument("--repeat", type=int, default=5)
+    ind.set_defaults(func=bench_indicators)
+
+    chart = sub.add_parser("chart", help="Chart redraw latency")
+    chart.add_argument("--points", type=int, default=1_000_000)
+    chart.add_argument("--repeat", type=int, default=5)
+    chart.set_defaults(func=bench_chart)
+
+    bt = sub.add_parser("backtest", help="Vectorized backtest throughput")
+    bt.add_argument("--symbols", type=int, default=500)
+    bt.add_argument("--years", type=int, default=10)
+    bt.set_defaults(func=bench_backtest)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
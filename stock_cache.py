@@ -0,0 +1,336 @@
+"""
+Local OHLCV price cache for the AI Stock Analyzer.
+
+Bars are stored in a small SQLite database keyed on (symbol, interval, ts).
+Repeat analyses are served from disk and only the missing trailing bars are
+requested from the provider.  Providers are pluggable so the cache can run
+offline against recorded CSV fixtures.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_cache.db")
+PROVIDER_ENV_VAR = "STOCK_ANALYZER_PROVIDER"
+
+
+def _normalize_frame(data):
+    """Return an OHLCV frame with a tz-naive DatetimeIndex named Date"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+
+    data = data[COLUMNS].copy()
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    data.index = index.rename("Date")
+    return data[~data.index.duplicated(keep="last")].sort_index()
+
+
+class PriceProvider:
+    """Base class for anything that can supply OHLCV bars"""
+    name = "base"
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        """Return a DataFrame of bars in [start, end) indexed by timestamp"""
+        raise NotImplementedError
+
+    def fetch_info(self, symbol):
+        """Return the fundamentals dict for a symbol (may be empty)"""
+        return {}
+
+
+class YFinanceProvider(PriceProvider):
+    """Live data from Yahoo Finance"""
+    name = "yfinance"
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        # Imported lazily so offline/fixture use doesn't need yfinance installed
+        import yfinance as yf
+        return yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+
+    def fetch_info(self, symbol):
+        import yfinance as yf
+        return yf.Ticker(symbol).info
+
+
+class FixtureProvider(PriceProvider):
+    """Replays bars recorded with record_fixture() - works without network"""
+    name = "fixture"
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._frames = {}
+
+    def _path(self, symbol, suffix):
+        return os.path.join(self.directory, f"{symbol.upper()}{suffix}")
+
+    def _load(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        if key not in self._frames:
+            suffix = ".csv" if interval == "1d" else f".{interval}.csv"
+            path = self._path(symbol, suffix)
+            if os.path.exists(path):
+                frame = pd.read_csv(path, index_col=0, parse_dates=True)
+            else:
+                frame = None
+            self._frames[key] = _normalize_frame(frame)
+        return self._frames[key]
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        data = self._load(symbol, interval)
+        return data[(data.index >= pd.Timestamp(start)) & (data.index < pd.Timestamp(end))]
+
+    def fetch_info(self, symbol):
+        path = self._path(symbol, ".info.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def record_fixture(provider, symbol, start, end, directory, interval="1d"):
+    """Record bars (and info) from a provider so FixtureProvider can replay them"""
+    os.makedirs(directory, exist_ok=True)
+    symbol = symbol.upper()
+    suffix = ".csv" if interval == "1d" else f".{interval}.csv"
+    data = _normalize_frame(provider.fetch(symbol, start, end, interval=interval))
+    data.to_csv(os.path.join(directory, f"{symbol}{suffix}"))
+
+    try:
+        info = provider.fetch_info(symbol)
+    except Exception as e:
+        print(f"Warning: Could not record info for {symbol}: {e}")
+        info = {}
+    # Only keep JSON-friendly scalars, yfinance info has the odd nested object
+    info = {k: v for k, v in info.items() if isinstance(v, (str, int, float, bool)) or v is None}
+    with open(os.path.join(directory, f"{symbol}.info.json"), "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    return len(data)
+
+
+def make_provider(spec=None):
+    """
+    Build a provider from a spec string: "yfinance" or "fixture:<directory>".
+    Falls back to the STOCK_ANALYZER_PROVIDER environment variable.
+    """
+    spec = spec or os.environ.get(PROVIDER_ENV_VAR, "yfinance")
+    if spec.startswith("fixture:"):
+        return FixtureProvider(spec.split(":", 1)[1])
+    if spec == "yfinance":
+        return YFinanceProvider()
+    raise ValueError(f"Unknown price provider: {spec}")
+
+
+class PriceCache:
+    """SQLite-backed OHLCV store with incremental refresh from a provider"""
+
+    def __init__(self, provider=None, path=DEFAULT_CACHE_PATH, refresh_interval=300, info_ttl=86400):
+        self.provider = provider or make_provider()
+        self.path = path
+        self.refresh_interval = refresh_interval  # seconds before re-checking for new bars
+        self.info_ttl = info_ttl
+        self._lock = threading.Lock()
+        self._symbol_locks = {}
+        self._local = threading.local()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # One connection per thread, reused - opening SQLite per query dominates cache hits
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (symbol, interval, ts)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    covered_from TEXT NOT NULL,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (symbol, interval)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS info (
+                    symbol TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+
+    def _symbol_lock(self, symbol, interval):
+        # One lock per series so concurrent analyses of the same symbol fetch once
+        with self._lock:
+            return self._symbol_locks.setdefault((symbol, interval), threading.Lock())
+
+    def get_history(self, symbol, start, end=None, interval="1d"):
+        """Return bars for [start, end), fetching only what the cache is missing"""
+        symbol = symbol.upper()
+        end = end or datetime.now()
+
+        with self._symbol_lock(symbol, interval):
+            self._refresh(symbol, pd.Timestamp(start), pd.Timestamp(end), interval)
+            return self._load(symbol, start, end, interval)
+
+    def _refresh(self, symbol, start, end, interval):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT covered_from, checked_at FROM coverage WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ).fetchone()
+            last = conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ).fetchone()[0]
+
+        now = time.time()
+        if row is None or last is None:
+            # Nothing cached yet - one full fetch
+            self._store(symbol, interval, self.provider.fetch(symbol, start, end, interval=interval))
+            self._mark(symbol, interval, start, now)
+            return
+
+        covered_from = pd.Timestamp(row[0])
+        if start < covered_from:
+            # Window grew backwards: fetch only the leading gap
+            self._store(symbol, interval, self.provider.fetch(symbol, start, covered_from, interval=interval))
+            covered_from = start
+
+        if now - row[1] >= self.refresh_interval:
+            # Re-fetch from the last stored bar so a partial (in-session) bar gets replaced
+            last_ts = pd.Timestamp(last)
+            if last_ts < end:
+                self._store(symbol, interval, self.provider.fetch(symbol, last_ts, end, interval=interval))
+            self._mark(symbol, interval, covered_from, now)
+        elif covered_from != pd.Timestamp(row[0]):
+            self._mark(symbol, interval, covered_from, row[1])
+
+    def _mark(self, symbol, interval, covered_from, checked_at):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (symbol, interval, covered_from, checked_at) VALUES (?, ?, ?, ?)",
+                (symbol, interval, pd.Timestamp(covered_from).strftime(TS_FORMAT), checked_at)
+            )
+
+    def _store(self, symbol, interval, data):
+        data = _normalize_frame(data)
+        if data.empty:
+            return 0
+        rows = zip(
+            [symbol] * len(data),
+            [interval] * len(data),
+            data.index.strftime(TS_FORMAT),
+            *(data[col].astype(float).tolist() for col in COLUMNS)
+        )
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, interval, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(data)
+
+    def _load(self, symbol, start, end, interval):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ts, open, high, low, close, volume FROM bars "
+                "WHERE symbol = ? AND interval = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (symbol, interval, pd.Timestamp(start).strftime(TS_FORMAT), pd.Timestamp(end).strftime(TS_FORMAT))
+            ).fetchall()
+
+        data = pd.DataFrame(rows, columns=["Date"] + COLUMNS)
+        data.index = pd.DatetimeIndex(pd.to_datetime(data.pop("Date")), name="Date")
+        data["Volume"] = data["Volume"].fillna(0).astype("int64")
+        return data
+
+    def poll(self, symbol, since, interval="1d"):
+        """
+        Fetch bars from `since` onwards straight from the provider (ignoring
+        refresh_interval), store them and return them.  Used by live mode.
+        """
+        symbol = symbol.upper()
+        end = datetime.now() + timedelta(days=1)
+        with self._symbol_lock(symbol, interval):
+            self._store(symbol, interval, self.provider.fetch(symbol, since, end, interval=interval))
+            return self._load(symbol, since, end, interval)
+
+    def get_info(self, symbol):
+        """Return the cached fundamentals dict, re-fetching once it is older than info_ttl"""
+        symbol = symbol.upper()
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload, fetched_at FROM info WHERE symbol = ?", (symbol,)).fetchone()
+        if row and time.time() - row[1] < self.info_ttl:
+            return json.loads(row[0])
+
+        try:
+            info = self.provider.fetch_info(symbol) or {}
+        except Exception as e:
+            print(f"Warning: Could not fetch full info: {e}")
+            return json.loads(row[0]) if row else {}
+
+        info = {k: v for k, v in info.items() if isinstance(v, (str, int, float, bool)) or v is None}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO info (symbol, payload, fetched_at) VALUES (?, ?, ?)",
+                (symbol, json.dumps(info), time.time())
+            )
+        return info
+
+    def invalidate(self, symbol=None):
+        """Drop cached bars for one symbol, or everything"""
+        with self._connect() as conn:
+            for table in ("bars", "coverage", "info"):
+                if symbol:
+                    conn.execute(f"DELETE FROM {table} WHERE symbol = ?", (symbol.upper(),))
+                else:
+                    conn.execute(f"DELETE FROM {table}")
+
+
+def main():
+    """Record fixtures for offline use: python stock_cache.py record AAPL MSFT --dir fixtures"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stock price cache utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record provider data to CSV fixtures")
+    rec.add_argument("symbols", nargs="+")
+    rec.add_argument("--dir", default="fixtures")
+    rec.add_argument("--days", type=int, default=180)
+    args = parser.parse_args()
+
+    end = datetime.now()
+    start = end - timedelta(days=args.days)
+    provider = YFinanceProvider()
+    for symbol in args.symbols:
+        count = record_fixture(provider, symbol, start, end, args.dir)
+        print(f"Recorded {count} bars for {symbol.upper()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Fast price chart rendering for the AI Stock Analyzer.
+
+The Line2D artists are created once and only their data is swapped. Long
+series are downsampled with LTTB (Largest-Triangle-Three-Buckets) to about
+one point per horizontal pixel. Live updates blit just the lines over a
+cached background instead of redrawing the whole figure.
+"""
+import matplotlib.dates as mdates
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the points LTTB keeps when reducing (x, y) to `threshold` points.
+    The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # threshold - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x = x[next_lo:next_hi].mean()
+            avg_y = np.nanmean(y[next_lo:next_hi]) if np.isfinite(y[next_lo:next_hi]).any() else y[a]
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Pick the point in this bucket forming the largest triangle with a and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+    return keep
+
+
+class PriceChart:
+    """Price + SMA lines on an existing axes, redrawn by updating artists in place"""
+
+    SERIES = (
+        ("close", "Price", "#00d4ff", 2, 1.0),
+        ("sma20", "SMA 20", "#00ff88", 1.5, 0.7),
+        ("sma50", "SMA 50", "#ffa500", 1.5, 0.7),
+    )
+
+    def __init__(self, fig, ax, canvas):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.background = None
+
+        # Artists live for the whole session; animated lines are skipped by normal draws and blitted instead
+        self.lines = {}
+        for key, label, color, width, alpha in self.SERIES:
+            line, = ax.plot([], [], label=label, color=color, linewidth=width, alpha=alpha, animated=True)
+            self.lines[key] = line
+
+        ax.xaxis_date()
+        ax.set_xlabel("Date", color="#8892b0", fontsize=10)
+        ax.set_ylabel("Price ($)", color="#8892b0", fontsize=10)
+        ax.legend(loc='upper left', framealpha=0.9, facecolor="#1a1f3a", edgecolor="#8892b0", labelcolor="#ffffff")
+        fig.autofmt_xdate()
+
+        # Full series (matplotlib date numbers) and the downsampled view being shown.
+        # x and data are views of the first n slots of buffers with spare capacity
+        self.n = 0
+        self.x_buffer = np.empty(0)
+        self.buffers = {key: np.empty(0) for key in self.lines}
+        self.x = self.x_buffer[:0]
+        self.data = {key: buffer[:0] for key, buffer in self.buffers.items()}
+        self.shown = 0
+
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _load(self, x, data, spare=1024):
+        """Copy a full series into fresh buffers, with room for live bars"""
+        self.n = len(x)
+        capacity = self.n + max(self.n // 4, spare)
+        self.x_buffer = np.empty(capacity)
+        self.x_buffer[:self.n] = x
+        for key in self.lines:
+            self.buffers[key] = np.empty(capacity)
+            self.buffers[key][:self.n] = data[key]
+        self._views()
+
+    def _views(self):
+        self.x = self.x_buffer[:self.n]
+        self.data = {key: buffer[:self.n] for key, buffer in self.buffers.items()}
+
+    def _append(self, x, values):
+        """Add one bar in place; capacity doubles when full, so appends are amortized O(1)"""
+        if self.n == len(self.x_buffer):
+            capacity = max(2 * self.n, 1024)
+            self.x_buffer = self._grown(self.x_buffer, capacity)
+            self.buffers = {key: self._grown(buffer, capacity) for key, buffer in self.buffers.items()}
+        self.x_buffer[self.n] = x
+        for key in self.lines:
+            self.buffers[key][self.n] = values[key]
+        self.n += 1
+        self._views()
+
+    def _grown(self, buffer, capacity):
+        grown = np.empty(capacity)
+        grown[:self.n] = buffer[:self.n]
+        return grown
+
+    def _target_points(self):
+        # About one point per horizontal pixel of the axes
+        return max(int(self.ax.bbox.width), 100)
+
+    def _on_draw(self, event):
+        # A full draw happened (new data, resize...): cache the background and put the lines back
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+        self.canvas.blit(self.fig.bbox)
+
+    def _apply(self):
+        """Downsample the full series into the line artists"""
+        keep = lttb(self.x, self.data["close"], self._target_points())
+        for key, line in self.lines.items():
+            line.set_data(self.x[keep], self.data[key][keep])
+        self.shown = len(keep)
+
+    def _rescale(self):
+        """Fit the limits to the data"""
+        if not len(self.x):
+            return
+        values = np.concatenate([v[np.isfinite(v)] for v in self.data.values()])
+        lo, hi = values.min(), values.max()
+        pad = (hi - lo) * 0.05 or 1.0
+        x_pad = (self.x[-1] - self.x[0]) * 0.02 or 1.0
+        self.ax.set_xlim(self.x[0] - x_pad, self.x[-1] + x_pad)
+        self.ax.set_ylim(lo - pad, hi + pad)
+
+    def show(self, indicators, symbol, title=None):
+        """Replace the chart contents with one symbol from an IndicatorResult"""
+        self._load(mdates.date2num(indicators.index),
+                   {key: np.asarray(indicators.series(key, symbol), dtype=float) for key in self.lines})
+        self._apply()
+        self._rescale()
+        self.ax.set_title(title or f"{symbol} - Price Chart", color="#ffffff", fontsize=14, pad=15)
+        # Limits/title changed, so one full draw; draw_event re-caches the background
+        self.canvas.draw()
+
+    def update_last(self, ts, values, append):
+        """
+        Live update: append a new bar or revise the last one.
+        `values` maps close/sma20/sma50 to the new numbers.
+        """
+        x = mdates.date2num(ts)
+        if append:
+            self._append(x, values)
+        else:
+            for key in self.lines:
+                self.data[key][-1] = values[key]
+
+        if self.shown >= 2 * self._target_points():
+            self._apply()
+        else:
+            # Cheap path: the tail of the shown data mirrors the full series
+            for key, line in self.lines.items():
+                xs, ys = line.get_data()
+                if append:
+                    xs = np.append(xs, x)
+                    ys = np.append(ys, values[key])
+                    self.shown += key == "close"
+                else:
+                    ys = np.array(ys, dtype=float)
+                    ys[-1] = values[key]
+                line.set_data(xs, ys)
+
+        # Blit while the new point fits the current limits, otherwise rescale with one full draw
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        inside = xlim[0] <= x <= xlim[1] and all(
+            ylim[0] <= v <= ylim[1] for v in values.values() if np.isfinite(v)
+        )
+        if inside:
+            self._blit()
+        else:
+            self._rescale()
+            self.canvas.draw()
@@ -0,0 +1,305 @@
+"""
+Vectorized technical indicator engine for the AI Stock Analyzer.
+
+Indicators are computed once over a 2-D array of prices shaped
+(n_symbols, n_bars) and returned in an IndicatorResult that the chart,
+the text report, the scanner and the backtester all read from.
+Symbols with shorter histories are padded with NaN on the left.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# Indicator name -> parameters.  Drop a key to skip that indicator.
+DEFAULT_INDICATORS = {
+    "sma": (20, 50),
+    "ema": (12, 26),
+    "rsi": (14,),
+    "atr": (14,),
+    "macd": (12, 26, 9),
+    "bollinger": (20, 2.0),
+}
+
+
+def rolling_mean(x, window):
+    """Trailing mean over `window` bars along the last axis (NaN until the window is full)"""
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    valid = np.isfinite(x)
+
+    if valid.all():
+        # Fast path: no gaps, a single cumsum difference
+        csum = np.cumsum(x, axis=-1)
+        out[..., window - 1] = csum[..., window - 1]
+        out[..., window:] = csum[..., window:] - csum[..., :-window]
+        out[..., window - 1:] /= window
+        return out
+
+    csum = np.cumsum(np.where(valid, x, 0.0), axis=-1)
+    ccount = np.cumsum(valid, axis=-1)
+    csum[..., window:] = csum[..., window:] - csum[..., :-window]
+    ccount[..., window:] = ccount[..., window:] - ccount[..., :-window]
+    full = ccount >= window
+    out[full] = csum[full] / window
+    return out
+
+
+def rolling_std(x, window, ddof=0):
+    """Trailing standard deviation over `window` bars along the last axis"""
+    x = np.asarray(x, dtype=float)
+    # Centre each row first so the sum-of-squares trick doesn't lose precision
+    with np.errstate(invalid="ignore"):
+        offset = np.nanmean(x, axis=-1, keepdims=True) if x.size else 0.0
+    centred = x - np.nan_to_num(offset)
+    mean = rolling_mean(centred, window)
+    mean_sq = rolling_mean(centred * centred, window)
+    var = np.maximum(mean_sq - mean * mean, 0.0) * window / (window - ddof)
+    return np.sqrt(var)
+
+
+def recursive_average(x, alpha, window):
+    """
+    Exponential smoothing y[t] = y[t-1] + alpha * (x[t] - y[t-1]), seeded with the
+    simple mean of the first `window` values of each row.  Wilder smoothing is
+    alpha = 1/window, a standard EMA is alpha = 2/(window+1).
+    The loop runs over time only; every step is vectorized across symbols.
+    """
+    x = np.asarray(x, dtype=float)
+    seed = rolling_mean(x, window)
+    # Time-major contiguous copies so each step touches one contiguous row
+    xs = np.ascontiguousarray(np.moveaxis(x, -1, 0))
+    seeds = np.ascontiguousarray(np.moveaxis(seed, -1, 0))
+    out = np.empty_like(xs)
+    if len(xs) == 0:
+        return np.moveaxis(out, 0, -1)
+
+    prev = out[0]
+    prev[...] = seeds[0]
+    # Once every row has been seeded and no gaps remain the update is just 3 ufuncs
+    seeded = np.isfinite(seeds).reshape(len(seeds), -1).all(axis=1)
+    first_full = int(np.argmax(seeded)) if seeded.any() else len(xs)
+    gap_free_from = first_full if not np.isnan(xs[first_full:]).any() else len(xs)
+
+    for t in range(1, len(xs)):
+        xt = xs[t]
+        cur = out[t]
+        np.subtract(xt, prev, out=cur)
+        cur *= alpha
+        cur += prev
+        if t <= gap_free_from:
+            # Missing bars carry the last value, rows that haven't started take the seed
+            np.copyto(cur, prev, where=np.isnan(xt))
+            np.copyto(cur, seeds[t], where=np.isnan(prev))
+        prev = cur
+    return np.moveaxis(out, 0, -1)
+
+
+def ema(x, span):
+    return recursive_average(x, 2.0 / (span + 1), span)
+
+
+def wilder_rsi(close, window=14):
+    """RSI with Wilder's smoothing of average gains and losses"""
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    gain = np.where(delta > 0, delta, np.where(np.isfinite(delta), 0.0, np.nan))
+    loss = np.where(delta < 0, -delta, np.where(np.isfinite(delta), 0.0, np.nan))
+
+    avg_gain = recursive_average(gain, 1.0 / window, window)
+    avg_loss = recursive_average(loss, 1.0 / window, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    # No losses at all in the window -> RSI pinned at 100
+    return np.where((avg_loss == 0) & np.isfinite(avg_gain), 100.0, rsi)
+
+
+def true_range(high, low, close):
+    prev_close = np.roll(close, 1, axis=-1)
+    prev_close[..., 0] = np.nan
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    with np.errstate(invalid="ignore"):
+        tr = np.nanmax(np.where(np.isfinite(ranges), ranges, -np.inf), axis=0)
+    tr[~np.isfinite(high - low)] = np.nan
+    tr[np.isinf(tr)] = np.nan
+    return tr
+
+
+def simple_returns(close):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.diff(close, axis=-1, prepend=np.nan) / np.roll(close, 1, axis=-1)
+
+
+def annualized_volatility(returns):
+    """Annualized volatility in percent over every available return of each row"""
+    counts = np.isfinite(returns).sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol = np.nanstd(returns, axis=-1, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+    return np.where(counts > 1, vol, np.nan)
+
+
+def score_recommendation(price, sma20, sma50, rsi, volatility, rsi_low=30, rsi_high=70, max_volatility=30):
+    """
+    The AI RECOMMENDATION score (0-4): one point each for price above SMA 20,
+    price above SMA 50, RSI inside the neutral band and volatility below the cap.
+    Works on scalars or arrays of any matching shape.
+    """
+    with np.errstate(invalid="ignore"):
+        return (
+            (np.asarray(price > sma20, dtype=int))
+            + (np.asarray(price > sma50, dtype=int))
+            + (np.asarray((rsi > rsi_low) & (rsi < rsi_high), dtype=int))
+            + (np.asarray(volatility < max_volatility, dtype=int))
+        )
+
+
+def signal_label(score):
+    if score >= 3:
+        return "BULLISH"
+    if score == 2:
+        return "NEUTRAL"
+    return "BEARISH"
+
+
+class IndicatorResult:
+    """Indicator arrays for a block of symbols - every 2-D array is (n_symbols, n_bars)"""
+
+    def __init__(self, symbols, index, close, values, volatility):
+        self.symbols = list(symbols)
+        self.index = index
+        self.close = close
+        self.values = values
+        self.volatility = volatility
+        self._rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def row(self, symbol):
+        return symbol if isinstance(symbol, int) else self._rows[symbol]
+
+    def series(self, name, symbol=0):
+        """One indicator for one symbol as a pandas Series (handy for plotting)"""
+        source = self.close if name == "close" else self.values[name]
+        return pd.Series(source[self.row(symbol)], index=self.index, name=name)
+
+    def latest(self, name, symbol=0):
+        source = self.close if name == "close" else self.values[name]
+        return float(source[self.row(symbol), -1])
+
+    def scores(self):
+        """Latest recommendation score for every symbol"""
+        return score_recommendation(
+            self.close[:, -1], self.values["sma20"][:, -1], self.values["sma50"][:, -1],
+            self.values["rsi14"][:, -1], self.volatility
+        )
+
+    def summary(self, symbol=0):
+        """Headline numbers for one symbol - what the scanner and report show"""
+        row = self.row(symbol)
+        close = self.close[row]
+        price = close[-1]
+        prev = close[-2] if len(close) > 1 and np.isfinite(close[-2]) else price
+        summary = {
+            "price": float(price),
+            "change_pct": float((price - prev) / prev * 100),
+            "sma20": self.latest("sma20", row),
+            "sma50": self.latest("sma50", row),
+            "rsi": self.latest("rsi14", row),
+            "volatility": float(self.volatility[row]),
+        }
+        summary["score"] = int(score_recommendation(
+            summary["price"], summary["sma20"], summary["sma50"], summary["rsi"], summary["volatility"]
+        ))
+        summary["signal"] = signal_label(summary["score"])
+        return summary
+
+
+def stack_frames(frames):
+    """
+    Align {symbol: OHLCV DataFrame} on the union of their dates.
+    Returns (symbols, index, close, high, low) with (n_symbols, n_bars) arrays.
+    """
+    symbols = list(frames)
+    index = pd.DatetimeIndex([])
+    for data in frames.values():
+        index = index.union(data.index)
+
+    def column(name):
+        out = np.full((len(symbols), len(index)), np.nan)
+        for i, symbol in enumerate(symbols):
+            data = frames[symbol]
+            out[i, index.get_indexer(data.index)] = data[name].to_numpy(dtype=float)
+        return out
+
+    return symbols, index, column("Close"), column("High"), column("Low")
+
+
+class IndicatorEngine:
+    """Computes a configurable set of indicators over many symbols at once"""
+
+    def __init__(self, indicators=None):
+        self.indicators = dict(DEFAULT_INDICATORS if indicators is None else indicators)
+        # The recommendation score always needs these
+        self.indicators["sma"] = tuple(sorted(set(self.indicators.get("sma", ())) | {20, 50}))
+        self.indicators["rsi"] = tuple(sorted(set(self.indicators.get("rsi", ())) | {14}))
+
+    def compute(self, close, high=None, low=None, symbols=None, index=None):
+        close = np.atleast_2d(np.asarray(close, dtype=float))
+        symbols = symbols if symbols is not None else list(range(close.shape[0]))
+        values = {}
+
+        for window in self.indicators.get("sma", ()):
+            values[f"sma{window}"] = rolling_mean(close, window)
+        for span in self.indicators.get("ema", ()):
+            values[f"ema{span}"] = ema(close, span)
+        for window in self.indicators.get("rsi", ()):
+            values[f"rsi{window}"] = wilder_rsi(close, window)
+
+        if "macd" in self.indicators:
+            fast, slow, signal = self.indicators["macd"]
+            fast_ema = values.get(f"ema{fast}")
+            slow_ema = values.get(f"ema{slow}")
+            macd = (ema(close, fast) if fast_ema is None else fast_ema) - (ema(close, slow) if slow_ema is None else slow_ema)
+            values["macd"] = macd
+            values["macd_signal"] = ema(macd, signal)
+            values["macd_hist"] = macd - values["macd_signal"]
+
+        if "bollinger" in self.indicators:
+            window, width = self.indicators["bollinger"]
+            mid = values.get(f"sma{window}")
+            mid = rolling_mean(close, window) if mid is None else mid
+            band = width * rolling_std(close, window)
+            values["bb_mid"] = mid
+            values["bb_upper"] = mid + band
+            values["bb_lower"] = mid - band
+
+        if high is not None and low is not None:
+            high = np.atleast_2d(np.asarray(high, dtype=float))
+            low = np.atleast_2d(np.asarray(low, dtype=float))
+            tr = true_range(high, low, close)
+            for window in self.indicators.get("atr", ()):
+                values[f"atr{window}"] = recursive_average(tr, 1.0 / window, window)
+
+        values["returns"] = simple_returns(close)
+        volatility = annualized_volatility(values["returns"])
+        return IndicatorResult(symbols, index, close, values, volatility)
+
+    def compute_frame(self, data, symbol=0):
+        """Indicators for a single OHLCV DataFrame"""
+        return self.compute(
+            data["Close"].to_numpy(dtype=float),
+            data["High"].to_numpy(dtype=float) if "High" in data else None,
+            data["Low"].to_numpy(dtype=float) if "Low" in data else None,
+            symbols=[symbol],
+            index=data.index
+        )
+
+    def compute_frames(self, frames):
+        """Indicators for {symbol: DataFrame}, aligned on a common date index"""
+        symbols, index, close, high, low = stack_frames(frames)
+        return self.compute(close, high, low, symbols=symbols, index=index)
@@ -0,0 +1,227 @@
+"""
+Parameter sweep for the AI recommendation score.
+
+Grid or random search over the SMA windows, RSI window/bands and the
+volatility cap used by perform_technical_analysis. Combinations are
+evaluated on a multiprocessing pool. The price matrix sits in one
+shared-memory block that every worker maps instead of receiving a pickled
+copy. Workers memoize indicators by window, so combinations that share a
+window reuse it.
+
+    python stock_optimizer.py AAPL MSFT NVDA --years 10 --search random --samples 2000
+    python stock_optimizer.py --synthetic 200 --years 5
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from stock_backtest import performance, rolling_volatility, load_frames
+from stock_indicators import rolling_mean, simple_returns, stack_frames, wilder_rsi, score_recommendation
+
+# perform_technical_analysis hard-codes 20/50, RSI 14 with 30/70 bands and a 30% volatility
+# cap (BASELINE); the grid brackets each of them.
+DEFAULT_GRID = {
+    "sma_fast": (10, 15, 20, 25, 30),
+    "sma_slow": (40, 50, 75, 100, 150),
+    "rsi_window": (7, 14, 21),
+    "rsi_low": (20, 25, 30, 35),
+    "rsi_high": (65, 70, 75, 80),
+    "max_volatility": (20, 30, 40, 60),
+    "min_score": (3, 4),
+}
+BASELINE = {"sma_fast": 20, "sma_slow": 50, "rsi_window": 14, "rsi_low": 30, "rsi_high": 70,
+            "max_volatility": 30, "min_score": 3}
+
+# Groups the sweep so consecutive combinations share windows (better worker cache hits)
+WINDOW_KEYS = ("sma_fast", "sma_slow", "rsi_window")
+METRICS = ("sharpe", "cagr", "total_return", "max_drawdown", "hit_rate", "turnover", "exposure")
+
+
+def grid_combinations(grid):
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(zip(keys, values))
+        if params["sma_fast"] < params["sma_slow"] and params["rsi_low"] < params["rsi_high"]:
+            yield params
+
+
+def random_combinations(grid, samples, seed=0):
+    rng = random.Random(seed)
+    seen = set()
+    combos = list(grid_combinations(grid))
+    rng.shuffle(combos)
+    for params in combos[:samples]:
+        key = tuple(params.values())
+        if key not in seen:
+            seen.add(key)
+            yield params
+
+
+# --- Worker side ---
+
+_worker = {}
+
+
+def _init_worker(shm_name, shape, dtype, cost_bps, vol_window):
+    # Map the shared block; keep the SharedMemory object alive for the worker's lifetime
+    shm = SharedMemory(name=shm_name)
+    close = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    returns = simple_returns(close)
+    _worker.update(
+        shm=shm,
+        close=close,
+        returns=returns,
+        volatility=rolling_volatility(returns, vol_window),
+        cost_bps=cost_bps,
+        cache={}
+    )
+
+
+def _memo(key, compute):
+    cache = _worker["cache"]
+    if key not in cache:
+        if len(cache) > 32:
+            cache.clear()
+        cache[key] = compute()
+    return cache[key]
+
+
+def _evaluate(params):
+    close = _worker["close"]
+    sma_fast = _memo(("sma", params["sma_fast"]), lambda: rolling_mean(close, params["sma_fast"]))
+    sma_slow = _memo(("sma", params["sma_slow"]), lambda: rolling_mean(close, params["sma_slow"]))
+    rsi = _memo(("rsi", params["rsi_window"]), lambda: wilder_rsi(close, params["rsi_window"]))
+    volatility = _worker["volatility"]
+
+    scores = score_recommendation(
+        close, sma_fast, sma_slow, rsi, volatility,
+        rsi_low=params["rsi_low"], rsi_high=params["rsi_high"], max_volatility=params["max_volatility"]
+    )
+    ready = np.isfinite(sma_slow) & np.isfinite(rsi) & np.isfinite(volatility)
+    positions = ((scores >= params["min_score"]) & ready).astype(float)
+
+    metrics = performance(positions, _worker["returns"], _worker["cost_bps"])
+    row = dict(params)
+    row.update({name: metrics[name] for name in METRICS})
+    return row
+
+
+# --- Driver ---
+
+def sweep(close, combinations, workers=None, cost_bps=5.0, vol_window=125, on_progress=None):
+    """Evaluate every parameter dict against close (n_symbols, n_bars); returns result rows"""
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    combinations = sorted(combinations, key=lambda p: tuple(p[k] for k in WINDOW_KEYS))
+    workers = workers or os.cpu_count()
+
+    shm = SharedMemory(create=True, size=max(close.nbytes, 1))
+    try:
+        np.ndarray(close.shape, dtype=close.dtype, buffer=shm.buf)[:] = close
+        rows = []
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(shm.name, close.shape, close.dtype.str, cost_bps, vol_window)) as pool:
+            chunksize = max(1, len(combinations) // (workers * 8))
+            for row in pool.imap_unordered(_evaluate, combinations, chunksize=chunksize):
+                rows.append(row)
+                if on_progress:
+                    on_progress(len(rows), len(combinations))
+        return rows
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def rank(rows, metric="sharpe"):
+    """Best first; NaN metrics sink to the bottom.  Drawdown ranks closest to zero first."""
+    def key(row):
+        value = row[metric]
+        return float("-inf") if value != value else value
+    return sorted(rows, key=key, reverse=True)
+
+
+def format_table(rows, top=20):
+    headers = list(DEFAULT_GRID) + ["sharpe", "cagr", "max_dd", "hit", "turnover"]
+    lines = [" ".join(f"{h:>9}" for h in headers)]
+    for row in rows[:top]:
+        values = [f"{row[k]:>9}" for k in DEFAULT_GRID] + [
+            f"{row['sharpe']:>9.2f}",
+            f"{row['cagr'] * 100:>8.2f}%",
+            f"{row['max_drawdown'] * 100:>8.2f}%",
+            f"{row['hit_rate'] * 100:>8.1f}%",
+            f"{row['turnover']:>9.1f}",
+        ]
+        lines.append(" ".join(values))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter sweep for the AI recommendation score")
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=1000, help="Combinations for random search")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--metric", choices=METRICS, default="sharpe")
+    parser.add_argument("--cost-bps", type=float, default=5.0)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--csv", help="Write every ranked row to this CSV file")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Use N random-walk symbols instead of real data")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stock_benchmark import random_walk
+        from stock_indicators import TRADING_DAYS
+        close = random_walk(args.synthetic, args.years * TRADING_DAYS)[0]
+    elif args.symbols:
+        from stock_cache import PriceCache
+        end = datetime.now()
+        frames = load_frames(PriceCache(), args.symbols, end - timedelta(days=365 * args.years), end)
+        if not frames:
+            parser.error("no data for any symbol")
+        close = stack_frames(frames)[2]
+    else:
+        parser.error("give symbols or --synthetic N")
+
+    if args.search == "grid":
+        combinations = list(grid_combinations(DEFAULT_GRID))
+    else:
+        combinations = list(random_combinations(DEFAULT_GRID, args.samples))
+
+    print(f"Evaluating {len(combinations)} combinations over {close.shape[0]} symbols x {close.shape[1]} bars")
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            sys.stderr.write(f"\r  {done}/{total}")
+            sys.stderr.flush()
+
+    rows = rank(sweep(close, combinations, args.workers, args.cost_bps, on_progress=progress), args.metric)
+    elapsed = time.perf_counter() - start
+    sys.stderr.write("\n")
+    print(f"Done in {elapsed:.1f}s ({len(rows) / elapsed:,.0f} combinations/s)\n")
+    print(format_table(rows, args.top))
+
+    baseline = next((r for r in rows if all(r[k] == v for k, v in BASELINE.items())), None)
+    if baseline:
+        position = rows.index(baseline) + 1
+        print(f"\nCurrent settings (20/50, RSI 14 30/70, vol < 30%) rank {position} of {len(rows)} "
+              f"with {args.metric} {baseline[args.metric]:.3f}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(DEFAULT_GRID) + list(METRICS))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
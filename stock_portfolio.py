@@ -0,0 +1,127 @@
+"""
+Watchlist portfolio risk for the AI Stock Analyzer.
+
+Keeps an aligned daily-return matrix for the watchlist symbols. The running
+cross-product matrix X @ X.T and the pairwise observation counts are
+maintained incrementally. Adding a symbol costs one matrix-vector product
+(O(N*T)); removing one drops a row and column. The N^2 pairs are never
+recomputed from scratch.
+
+Each series is demeaned once with its own mean. Covariances use pairwise
+observation counts, so symbols with short or gappy histories still line up.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_indicators import TRADING_DAYS
+
+
+class PortfolioRisk:
+    """Incremental covariance / correlation over a fixed window of business days"""
+
+    def __init__(self, days=365, end=None):
+        end = pd.Timestamp(end or datetime.now()).normalize()
+        self.index = pd.bdate_range(end - timedelta(days=days), end)
+        self.symbols = []
+        self.X = np.empty((0, len(self.index)))       # demeaned returns, 0 where missing
+        self.M = np.empty((0, len(self.index)))       # 1 where a return exists
+        self.cross = np.empty((0, 0))                 # X @ X.T
+        self.counts = np.empty((0, 0))                # M @ M.T
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def aligned_returns(self, data):
+        """Daily returns of an OHLCV frame placed on this window's business days"""
+        returns = data['Close'].pct_change()
+        returns.index = pd.DatetimeIndex(returns.index).normalize()
+        returns = returns[~returns.index.duplicated(keep="last")]
+        return returns.reindex(self.index).to_numpy(dtype=float)
+
+    def add(self, symbol, data):
+        """Add (or replace) a symbol from its OHLCV history"""
+        if symbol in self.symbols:
+            self.remove(symbol)
+
+        r = self.aligned_returns(data)
+        mask = np.isfinite(r)
+        x = np.where(mask, r - (r[mask].mean() if mask.any() else 0.0), 0.0)
+        m = mask.astype(float)
+
+        # Only the new row/column of the cross-product and count matrices is computed
+        cross_row = self.X @ x
+        count_row = self.M @ m
+        n = len(self.symbols)
+
+        cross = np.empty((n + 1, n + 1))
+        cross[:n, :n] = self.cross
+        cross[n, :n] = cross[:n, n] = cross_row
+        cross[n, n] = x @ x
+
+        counts = np.empty((n + 1, n + 1))
+        counts[:n, :n] = self.counts
+        counts[n, :n] = counts[:n, n] = count_row
+        counts[n, n] = m.sum()
+
+        self.cross, self.counts = cross, counts
+        self.X = np.vstack([self.X, x])
+        self.M = np.vstack([self.M, m])
+        self.symbols.append(symbol)
+
+    def remove(self, symbol):
+        if symbol not in self.symbols:
+            return
+        i = self.symbols.index(symbol)
+        self.symbols.pop(i)
+        self.X = np.delete(self.X, i, axis=0)
+        self.M = np.delete(self.M, i, axis=0)
+        self.cross = np.delete(np.delete(self.cross, i, axis=0), i, axis=1)
+        self.counts = np.delete(np.delete(self.counts, i, axis=0), i, axis=1)
+
+    def covariance(self, annualize=True):
+        """Pairwise covariance of daily returns (NaN where a pair has < 2 common days)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.cross / (self.counts - 1)
+        cov[self.counts < 2] = np.nan
+        return cov * TRADING_DAYS if annualize else cov
+
+    def correlation(self):
+        cov = self.covariance(annualize=False)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+    def volatilities(self):
+        """Annualized volatility of each symbol, in percent"""
+        return np.sqrt(np.diag(self.covariance())) * 100
+
+    def portfolio_volatility(self, weights=None):
+        """Annualized volatility (%) of the weighted portfolio - equal weight by default"""
+        n = len(self.symbols)
+        if n == 0:
+            return float("nan")
+        w = np.full(n, 1.0 / n) if weights is None else np.asarray(weights, dtype=float)
+        cov = np.nan_to_num(self.covariance())
+        return float(np.sqrt(max(w @ cov @ w, 0.0)) * 100)
+
+    def summary(self):
+        """Headline numbers for the portfolio panel"""
+        n = len(self.symbols)
+        corr = self.correlation()
+        off_diag = corr[~np.eye(n, dtype=bool)] if n > 1 else np.array([])
+        vols = self.volatilities()
+        return {
+            "symbols": n,
+            "portfolio_volatility": self.portfolio_volatility(),
+            "average_volatility": float(np.nanmean(vols)) if n else float("nan"),
+            "average_correlation": float(np.nanmean(off_diag)) if off_diag.size else float("nan"),
+            # Volatility saved by holding them together instead of the average single name
+            "diversification_ratio": float(np.nanmean(vols) / self.portfolio_volatility()) if n else float("nan"),
+        }
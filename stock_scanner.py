@@ -0,0 +1,134 @@
+"""
+Concurrent watchlist scanner for the AI Stock Analyzer.
+
+Symbols are fetched through the price cache on a bounded thread pool.
+Provider calls are rate limited, every symbol gets its own timeout and
+results are handed to a callback as soon as each one completes.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+
+from stock_cache import PriceCache, PriceProvider
+from stock_indicators import IndicatorEngine
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` acquisitions per second"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+
+class RateLimitedProvider(PriceProvider):
+    """Wraps a provider so only real network fetches count against the limit"""
+
+    def __init__(self, provider, limiter):
+        self.provider = provider
+        self.limiter = limiter
+        self.name = provider.name
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        self.limiter.acquire()
+        return self.provider.fetch(symbol, start, end, interval=interval)
+
+    def fetch_info(self, symbol):
+        self.limiter.acquire()
+        return self.provider.fetch_info(symbol)
+
+
+class WatchlistScanner:
+    """Scores many symbols concurrently and streams results to a callback"""
+
+    def __init__(self, cache, max_workers=16, rate_limit=8, timeout=20, days=180):
+        # Private cache instance over the same database, with a rate limited provider
+        self.cache = PriceCache(
+            RateLimitedProvider(cache.provider, RateLimiter(rate_limit)),
+            path=cache.path,
+            refresh_interval=cache.refresh_interval
+        )
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.days = days
+        self.engine = IndicatorEngine({})
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _scan_one(self, symbol, start, end, started):
+        started[symbol] = time.monotonic()
+        if self._cancelled.is_set():
+            return {"symbol": symbol, "status": "cancelled"}
+        data = self.cache.get_history(symbol, start, end)
+        if data.empty:
+            return {"symbol": symbol, "status": "no data"}
+        result = self.engine.compute_frame(data, symbol).summary()
+        result.update(symbol=symbol, status="ok")
+        return result
+
+    def scan(self, symbols, on_result=None):
+        """
+        Scan symbols and return the list of result dicts.
+        on_result(result) is called from the scanning thread as each symbol finishes.
+        """
+        self._cancelled.clear()
+        end = datetime.now()
+        start = end - timedelta(days=self.days)
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        results = []
+        started = {}
+
+        def emit(result):
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scan")
+        try:
+            pending = {pool.submit(self._scan_one, s, start, end, started): s for s in symbols}
+            while pending:
+                done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"symbol": symbol, "status": "error", "error": str(e)}
+                    emit(result)
+
+                # Per-symbol timeout counts from when the worker picked the symbol up
+                now = time.monotonic()
+                for future, symbol in list(pending.items()):
+                    if symbol in started and now - started[symbol] > self.timeout:
+                        future.cancel()
+                        pending.pop(future)
+                        emit({"symbol": symbol, "status": "timeout"})
+
+                if self._cancelled.is_set():
+                    for future, symbol in list(pending.items()):
+                        future.cancel()
+                        emit({"symbol": symbol, "status": "cancelled"})
+                    pending.clear()
+        finally:
+            # Don't block on stragglers that already timed out
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return results
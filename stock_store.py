@@ -0,0 +1,183 @@
+"""
+Persistent workspace for the AI Stock Analyzer.
+
+The watchlist, the last symbol on screen and a per-symbol snapshot of the
+last analysis are kept in the same SQLite file as the price cache. A
+snapshot holds the info dict, the headline summary and the indicator arrays,
+stored as float32 in one compressed blob. On startup the GUI renders a
+snapshot without touching the network and refreshes stale symbols in the
+background.
+"""
+import io
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from stock_cache import DEFAULT_CACHE_PATH
+from stock_indicators import IndicatorResult
+
+# Snapshots older than this are re-analyzed in the background on startup
+SNAPSHOT_MAX_AGE = 15 * 60
+
+
+def _pack(index, close, volume, values, volatility):
+    """One symbol's arrays -> compressed bytes"""
+    buffer = io.BytesIO()
+    arrays = {f"v_{name}": np.asarray(series, dtype=np.float32) for name, series in values.items()}
+    np.savez_compressed(
+        buffer,
+        index=pd.DatetimeIndex(index).asi8,
+        close=np.asarray(close, dtype=np.float32),
+        volume=np.asarray(volume, dtype=np.float64),
+        volatility=np.float64(volatility),
+        **arrays
+    )
+    return buffer.getvalue()
+
+
+def _unpack(blob):
+    with np.load(io.BytesIO(blob)) as arrays:
+        values = {name[2:]: arrays[name].astype(float) for name in arrays.files if name.startswith("v_")}
+        return (
+            pd.DatetimeIndex(arrays["index"].astype("datetime64[ns]"), name="Date"),
+            arrays["close"].astype(float),
+            arrays["volume"],
+            values,
+            float(arrays["volatility"]),
+        )
+
+
+class WorkspaceStore:
+    """Watchlist, UI state and analysis snapshots in SQLite"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # One connection per thread, same as PriceCache - snapshots are saved from worker threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS watchlist (
+                    symbol TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    symbol TEXT PRIMARY KEY,
+                    analyzed_at REAL NOT NULL,
+                    summary TEXT NOT NULL,
+                    info TEXT NOT NULL,
+                    arrays BLOB NOT NULL
+                )
+            """)
+
+    # --- Watchlist / UI state ---
+
+    def load_watchlist(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT symbol FROM watchlist ORDER BY position")]
+
+    def save_watchlist(self, symbols):
+        """Replace the stored watchlist (a few rows, so a rewrite is simplest)"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM watchlist")
+            conn.executemany(
+                "INSERT INTO watchlist (symbol, position) VALUES (?, ?)",
+                [(symbol, i) for i, symbol in enumerate(symbols)]
+            )
+
+    def get_state(self, key, default=None):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    # --- Snapshots ---
+
+    def save_snapshot(self, symbol, indicators, data, info):
+        """Store the latest analysis of one symbol from its IndicatorResult and OHLCV frame"""
+        row = indicators.row(symbol)
+        volume = data["Volume"].reindex(indicators.index).fillna(0).to_numpy()
+        blob = _pack(
+            indicators.index,
+            indicators.close[row],
+            volume,
+            {name: values[row] for name, values in indicators.values.items()},
+            indicators.volatility[row]
+        )
+        summary = indicators.summary(symbol)
+        # Only JSON-friendly scalars, same filter as the info cache
+        info = {k: v for k, v in (info or {}).items() if isinstance(v, (str, int, float, bool)) or v is None}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (symbol, analyzed_at, summary, info, arrays) VALUES (?, ?, ?, ?, ?)",
+                (symbol, time.time(), json.dumps(summary), json.dumps(info), sqlite3.Binary(blob))
+            )
+
+    def get_snapshot(self, symbol):
+        """
+        The stored analysis as a dict with analyzed_at, summary, info, an
+        IndicatorResult ("indicators") and a Close/Volume frame ("data"), or None.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT analyzed_at, summary, info, arrays FROM snapshots WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        index, close, volume, values, volatility = _unpack(row[3])
+        indicators = IndicatorResult(
+            [symbol], index, close[None, :],
+            {name: series[None, :] for name, series in values.items()},
+            np.array([volatility])
+        )
+        return {
+            "symbol": symbol,
+            "analyzed_at": row[0],
+            "summary": json.loads(row[1]),
+            "info": json.loads(row[2]),
+            "indicators": indicators,
+            "data": pd.DataFrame({"Close": close, "Volume": volume.astype("int64")}, index=index),
+        }
+
+    def stale_symbols(self, symbols, max_age=None):
+        """Symbols with no snapshot, or one older than max_age seconds"""
+        max_age = self.max_age if max_age is None else max_age
+        with self._connect() as conn:
+            analyzed = dict(conn.execute("SELECT symbol, analyzed_at FROM snapshots"))
+        now = time.time()
+        return [s for s in symbols if now - analyzed.get(s, 0) >= max_age]
+
+    def remove_snapshot(self, symbol):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM snapshots WHERE symbol = ?", (symbol,))
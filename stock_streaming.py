@@ -0,0 +1,263 @@
+"""
+Incremental (O(1) per bar) indicators for live updates in the AI Stock Analyzer.
+
+Every indicator supports two operations:
+    push(x)   - a new bar closed at x
+    amend(x)  - the most recent bar was revised to x (an in-progress bar ticked)
+
+Values match the batch IndicatorEngine, before and after live bars: simple
+moving averages, Wilder RSI and annualized volatility of every simple return
+so far (sample std, ddof=1). A rolling volatility window is available too.
+"""
+import math
+
+from stock_indicators import TRADING_DAYS, score_recommendation, signal_label
+
+
+class RingBuffer:
+    """Fixed-size FIFO of floats"""
+
+    def __init__(self, size):
+        self.size = size
+        self.data = [0.0] * size
+        self.count = 0
+        self.pos = 0  # next write position
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x):
+        """Add x, returning the value it evicted (None while filling up)"""
+        evicted = self.data[self.pos] if self.count == self.size else None
+        self.data[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        return evicted
+
+    def replace_last(self, x):
+        """Overwrite the newest value, returning the old one"""
+        last = (self.pos - 1) % self.size
+        old = self.data[last]
+        self.data[last] = x
+        return old
+
+    def values(self):
+        """Contents oldest first"""
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.pos:] + self.data[:self.pos]
+
+
+class RollingSum:
+    """Running sum and sum of squares over the last `window` values"""
+
+    def __init__(self, window):
+        self.buffer = RingBuffer(window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._pushes = 0
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def push(self, x):
+        evicted = self.buffer.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if evicted is not None:
+            self.total -= evicted
+            self.total_sq -= evicted * evicted
+        # Re-sum from the buffer every `window` pushes so float drift can't build up (amortized O(1))
+        self._pushes += 1
+        if self._pushes >= self.buffer.size:
+            self._pushes = 0
+            values = self.buffer.values()
+            self.total = math.fsum(values)
+            self.total_sq = math.fsum(v * v for v in values)
+
+    def amend(self, x):
+        old = self.buffer.replace_last(x)
+        self.total += x - old
+        self.total_sq += x * x - old * old
+
+
+class RollingSMA:
+    def __init__(self, window):
+        self.window = window
+        self.sums = RollingSum(window)
+
+    def push(self, x):
+        self.sums.push(x)
+
+    def amend(self, x):
+        self.sums.amend(x)
+
+    @property
+    def value(self):
+        if len(self.sums) < self.window:
+            return math.nan
+        return self.sums.total / self.window
+
+
+class WilderRSI:
+    """RSI with Wilder smoothing, seeded with the simple mean of the first `window` moves"""
+
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_close = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self._undo = None
+
+    def push(self, x):
+        self._undo = (self.prev_close, self.count, self.avg_gain, self.avg_loss)
+        if self.prev_close is None:
+            self.prev_close = x
+            return
+
+        delta = x - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.prev_close = x
+
+        if self.count < self.window:
+            # Warm-up: accumulate, then switch to averages once the window is full
+            self.avg_gain += gain
+            self.avg_loss += loss
+            self.count += 1
+            if self.count == self.window:
+                self.avg_gain /= self.window
+                self.avg_loss /= self.window
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.window
+            self.avg_loss += (loss - self.avg_loss) / self.window
+
+    def amend(self, x):
+        if self._undo is None:
+            return self.push(x)
+        self.prev_close, self.count, self.avg_gain, self.avg_loss = self._undo
+        self.push(x)
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return math.nan
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class RollingVolatility:
+    """Annualized volatility (%) of simple returns over the last `window` returns"""
+
+    def __init__(self, window):
+        self.sums = RollingSum(window)
+        self.prev_close = None
+        self.last_close = None
+
+    def push(self, x):
+        if self.last_close is not None:
+            self.sums.push(x / self.last_close - 1)
+        self.prev_close, self.last_close = self.last_close, x
+
+    def amend(self, x):
+        if self.prev_close is not None:
+            self.sums.amend(x / self.prev_close - 1)
+        self.last_close = x
+
+    @property
+    def value(self):
+        n = len(self.sums)
+        if n < 2:
+            return math.nan
+        mean = self.sums.total / n
+        var = max(self.sums.total_sq - n * mean * mean, 0.0) / (n - 1)
+        return math.sqrt(var) * math.sqrt(TRADING_DAYS) * 100
+
+
+class ExpandingVolatility:
+    """Annualized volatility (%) of every simple return so far - Welford's running mean and M2"""
+
+    def __init__(self):
+        self.prev_close = None
+        self.last_close = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._undo = None
+
+    def _add(self, r):
+        self._undo = (self.count, self.mean, self.m2)
+        self.count += 1
+        delta = r - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (r - self.mean)
+
+    def push(self, x):
+        if self.last_close is not None:
+            self._add(x / self.last_close - 1)
+        self.prev_close, self.last_close = self.last_close, x
+
+    def amend(self, x):
+        if self.prev_close is not None:
+            # Back out the last return and add the revised one
+            self.count, self.mean, self.m2 = self._undo
+            self._add(x / self.prev_close - 1)
+        self.last_close = x
+
+    @property
+    def value(self):
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1)) * math.sqrt(TRADING_DAYS) * 100
+
+
+class StreamingIndicators:
+    """The indicator set used by perform_technical_analysis, updated bar by bar"""
+
+    def __init__(self, vol_window=None, rsi_window=14):
+        self.sma20 = RollingSMA(20)
+        self.sma50 = RollingSMA(50)
+        self.rsi = WilderRSI(rsi_window)
+        # Like the batch engine, volatility covers all history unless a window is given
+        self.volatility = ExpandingVolatility() if vol_window is None else RollingVolatility(vol_window)
+        self.indicators = (self.sma20, self.sma50, self.rsi, self.volatility)
+        self.price = math.nan
+        self.prev_price = math.nan
+
+    @classmethod
+    def from_closes(cls, closes, **kwargs):
+        """Warm up from history"""
+        closes = [float(c) for c in closes if c == c]  # drop NaN padding
+        stream = cls(**kwargs)
+        for close in closes:
+            stream.push(close)
+        return stream
+
+    def push(self, close):
+        for indicator in self.indicators:
+            indicator.push(close)
+        self.prev_price, self.price = self.price, close
+
+    def amend(self, close):
+        for indicator in self.indicators:
+            indicator.amend(close)
+        self.price = close
+
+    def snapshot(self):
+        """Latest values in the same shape as IndicatorResult.summary()"""
+        prev = self.prev_price if self.prev_price == self.prev_price else self.price
+        summary = {
+            "price": self.price,
+            "change_pct": (self.price - prev) / prev * 100,
+            "sma20": self.sma20.value,
+            "sma50": self.sma50.value,
+            "rsi": self.rsi.value,
+            "volatility": self.volatility.value,
+        }
+        summary["score"] = int(score_recommendation(
+            summary["price"], summary["sma20"], summary["sma50"], summary["rsi"], summary["volatility"]
+        ))
+        summary["signal"] = signal_label(summary["score"])
+        return summary